@@ -8,8 +8,10 @@ pytest_plugins = [
     'pytest_plugins.disable_rp_params',
     'pytest_plugins.external_logging',
     'pytest_plugins.fixture_markers',
+    'pytest_plugins.hammer_telemetry',
     'pytest_plugins.infra_dependent_markers',
     'pytest_plugins.issue_handlers',
+    'pytest_plugins.lock_wait_metrics',
     'pytest_plugins.logging_hooks',
     'pytest_plugins.manual_skipped',
     'pytest_plugins.marker_deselection',
@@ -19,6 +21,8 @@ pytest_plugins = [
     'pytest_plugins.rerun_rp.rerun_rp',
     'pytest_plugins.fspath_plugins',
     'pytest_plugins.factory_collection',
+    'pytest_plugins.factory_lookahead',
+    'pytest_plugins.satellite_load',
     'pytest_plugins.requirements.update_requirements',
     'pytest_plugins.sanity_plugin',
     'pytest_plugins.video_cleanup',
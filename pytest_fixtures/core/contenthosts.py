@@ -5,11 +5,14 @@ The functions in this module are read in the pytest_plugins/fixture_markers.py m
 All functions in this module will be treated as fixtures that apply the contenthost mark
 """
 
+from contextlib import contextmanager
+
 from broker import Broker
 import pytest
 
 from robottelo import constants
 from robottelo.config import settings
+from robottelo.host_pool import ContentHostPool
 from robottelo.hosts import ContentHost, Satellite
 
 
@@ -41,12 +44,37 @@ def host_conf(request):
     return conf
 
 
+@contextmanager
+def pooled_contenthost(request, pool):
+    """Provide a content host from the pool when enabled, or checked out for the caller"""
+    if pool is None:
+        with Broker(**host_conf(request), host_class=ContentHost) as host:
+            yield host
+    else:
+        with pool.host(host_conf(request)) as host:
+            yield host
+
+
+@pytest.fixture(scope='session')
+def content_host_pool():
+    """A session-level fixture that provides the warm content host pool, None when disabled"""
+    if not settings.performance.host_pool.enabled:
+        yield None
+    else:
+        pool = ContentHostPool(
+            size=settings.performance.host_pool.size,
+            max_reuse=settings.performance.host_pool.max_reuse,
+        )
+        yield pool
+        pool.close()
+
+
 @pytest.fixture
-def rhel_contenthost(request):
+def rhel_contenthost(request, content_host_pool):
     """A function-level fixture that provides a content host object parametrized"""
     # Request should be parametrized through pytest_fixtures.fixture_markers
     # unpack params dict
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with pooled_contenthost(request, content_host_pool) as host:
         yield host
 
 
@@ -60,9 +88,9 @@ def module_rhel_contenthost(request):
 
 
 @pytest.fixture(params=[{'rhel_version': '7'}])
-def rhel7_contenthost(request):
+def rhel7_contenthost(request, content_host_pool):
     """A function-level fixture that provides a rhel7 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with pooled_contenthost(request, content_host_pool) as host:
         yield host
 
 
@@ -81,9 +109,9 @@ def rhel7_contenthost_module(request):
 
 
 @pytest.fixture(params=[{'rhel_version': '8'}])
-def rhel8_contenthost(request):
+def rhel8_contenthost(request, content_host_pool):
     """A fixture that provides a rhel8 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with pooled_contenthost(request, content_host_pool) as host:
         yield host
 
 
@@ -95,16 +123,16 @@ def rhel8_contenthost_module(request):
 
 
 @pytest.fixture(params=[{'rhel_version': 6}])
-def rhel6_contenthost(request):
+def rhel6_contenthost(request, content_host_pool):
     """A function-level fixture that provides a rhel6 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with pooled_contenthost(request, content_host_pool) as host:
         yield host
 
 
 @pytest.fixture(params=[{'rhel_version': '9'}])
-def rhel9_contenthost(request):
+def rhel9_contenthost(request, content_host_pool):
     """A fixture that provides a rhel9 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with pooled_contenthost(request, content_host_pool) as host:
         yield host
 
 
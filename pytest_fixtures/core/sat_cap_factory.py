@@ -67,31 +67,77 @@ def _target_capsule_host(request, capsule_factory):
         yield
 
 
-@pytest.fixture(scope='session')
-def satellite_factory():
-    if settings.server.get('deploy_arguments'):
-        logger.debug(f'Original deploy arguments for sat: {settings.server.deploy_arguments}')
-        resolved = resolve_deploy_args(settings.server.deploy_arguments)
-        settings.set('server.deploy_arguments', resolved)
-        logger.debug(f'Resolved deploy arguments for sat: {settings.server.deploy_arguments}')
-
-    def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
-        if settings.server.deploy_arguments:
-            broker_args.update(settings.server.deploy_arguments)
-            logger.debug(f'Updated broker args for sat: {broker_args}')
-
-        vmb = Broker(
-            host_class=Satellite,
-            workflow=workflow or settings.server.deploy_workflows.product,
-            **broker_args,
-        )
-        timeout = (1200 + delay) * retry_limit
-        sat = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
-        return sat.out
+def resolve_factory_deploy_args():
+    """Resolve the Satellite and Capsule deploy arguments of the settings"""
+    for name, short_name in (('server', 'sat'), ('capsule', 'cap')):
+        if settings[name].get('deploy_arguments'):
+            logger.debug(
+                f'Original deploy arguments for {short_name}: {settings[name].deploy_arguments}'
+            )
+            resolved = resolve_deploy_args(settings[name].deploy_arguments)
+            settings.set(f'{name}.deploy_arguments', resolved)
+            logger.debug(
+                f'Resolved deploy arguments for {short_name}: {settings[name].deploy_arguments}'
+            )
+
+
+def checkout_satellite(retry_limit=3, delay=300, workflow=None, **broker_args):
+    """Check out a Satellite, with the deploy arguments of the settings"""
+    if settings.server.deploy_arguments:
+        broker_args.update(settings.server.deploy_arguments)
+        logger.debug(f'Updated broker args for sat: {broker_args}')
+
+    vmb = Broker(
+        host_class=Satellite,
+        workflow=workflow or settings.server.deploy_workflows.product,
+        **broker_args,
+    )
+    timeout = (1200 + delay) * retry_limit
+    sat = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
+    return sat.out
+
+
+def checkout_capsule(retry_limit=3, delay=300, workflow=None, **broker_args):
+    """Check out a Capsule, with the deploy arguments of the settings"""
+    if settings.capsule.deploy_arguments:
+        broker_args.update(settings.capsule.deploy_arguments)
+    vmb = Broker(
+        host_class=Capsule,
+        workflow=workflow or settings.capsule.deploy_workflows.product,
+        **broker_args,
+    )
+    timeout = (1200 + delay) * retry_limit
+    cap = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
+    return cap.out
+
+
+# the checkout of the factories, registered to the look-ahead provisioner once
+# the tests are collected
+FACTORY_CHECKOUTS = {'satellite': checkout_satellite, 'capsule': checkout_capsule}
+
+
+def _lookahead_factory(request, kind, checkout):
+    """Wrap ``checkout`` to hand out the hosts checked out ahead, when it gets no arguments
+
+    See pytest_plugins.factory_lookahead
+    """
+    if not (lookahead := getattr(request.config, 'factory_lookahead', None)):
+        return checkout
+
+    def factory(*args, **kwargs):
+        if not (args or kwargs) and (host := lookahead.take(kind)):
+            return host
+        return checkout(*args, **kwargs)
 
     return factory
 
 
+@pytest.fixture(scope='session')
+def satellite_factory(request):
+    resolve_factory_deploy_args()
+    return _lookahead_factory(request, 'satellite', checkout_satellite)
+
+
 @pytest.fixture
 def large_capsule_host(capsule_factory):
     """A fixture that provides a Capsule based on config settings"""
@@ -103,26 +149,9 @@ def large_capsule_host(capsule_factory):
 
 
 @pytest.fixture(scope='session')
-def capsule_factory():
-    if settings.capsule.get('deploy_arguments'):
-        logger.debug(f'Original deploy arguments for cap: {settings.capsule.deploy_arguments}')
-        resolved = resolve_deploy_args(settings.capsule.deploy_arguments)
-        settings.set('capsule.deploy_arguments', resolved)
-        logger.debug(f'Resolved deploy arguments for cap: {settings.capsule.deploy_arguments}')
-
-    def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
-        if settings.capsule.deploy_arguments:
-            broker_args.update(settings.capsule.deploy_arguments)
-        vmb = Broker(
-            host_class=Capsule,
-            workflow=workflow or settings.capsule.deploy_workflows.product,
-            **broker_args,
-        )
-        timeout = (1200 + delay) * retry_limit
-        cap = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
-        return cap.out
-
-    return factory
+def capsule_factory(request):
+    resolve_factory_deploy_args()
+    return _lookahead_factory(request, 'capsule', checkout_capsule)
 
 
 @pytest.fixture
@@ -1,13 +1,29 @@
 """Fixtures specific to or relating to pytest's xdist plugin"""
 
+from concurrent.futures import ThreadPoolExecutor
 import random
 
 from broker import Broker
 import pytest
 
+from pytest_plugins.satellite_load import load_run_id
 from robottelo.config import configure_airgun, configure_nailgun, settings
 from robottelo.hosts import Capsule, Satellite
 from robottelo.logging import logger
+from robottelo.utils.satellite_load import AssignmentLedger, satellite_load
+
+
+def _assign_least_loaded(config, worker_id):
+    """Return the least loaded Satellite of ``server.hostnames`` for the worker"""
+    with ThreadPoolExecutor(thread_name_prefix='satellite_load') as executor:
+        loads = dict(
+            zip(
+                settings.server.hostnames,
+                executor.map(satellite_load, map(Satellite, settings.server.hostnames)),
+                strict=True,
+            )
+        )
+    return AssignmentLedger(load_run_id(config)).assign(worker_id, loads)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -51,6 +67,13 @@ def align_to_satellite(request, worker_id, satellite_factory):
         # attempt to align a worker to a satellite
         if settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
             settings.set("server.hostname", settings.server.hostnames[0])
+        elif settings.server.xdist_behavior == 'least-loaded' and settings.server.hostnames:
+            # fallback to balance behavior if no Satellite load could be probed
+            settings.set(
+                "server.hostname",
+                _assign_least_loaded(request.config, worker_id)
+                or random.choice(settings.server.hostnames),
+            )
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
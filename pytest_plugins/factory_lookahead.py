@@ -0,0 +1,111 @@
+"""Check out the Satellites and Capsules of the collected tests ahead of need
+
+The tests getting a fresh Satellite or Capsule are counted once the collection
+is done, and a :class:`robottelo.host_lookahead.LookaheadProvisioner` is set on
+the config for ``satellite_factory`` and ``capsule_factory`` to take their hosts
+from. It starts checking out the hosts right away, before the first test needing
+one is set up. The tests are spread over the xdist workers at run time, so any worker may
+need all of them, and the workers share a budget of the hosts the whole test
+run needs, kept in the robottelo tmp dir.
+
+The look-ahead is enabled by ``performance.factory_lookahead.enabled``.
+"""
+
+from pathlib import Path
+import tempfile
+
+from pytest_fixtures.core.sat_cap_factory import FACTORY_CHECKOUTS, resolve_factory_deploy_args
+from pytest_plugins.satellite_load import load_run_id
+from robottelo.config import settings
+from robottelo.host_lookahead import LookaheadProvisioner, SharedBudget
+
+# fixtures getting a host from a factory with no arguments, by kind and scope
+SATELLITE_FIXTURES = {
+    'satellite_host': 'function',
+    'module_satellite_host': 'module',
+    'session_satellite_host': 'session',
+}
+# destructive tests get a fresh Satellite from these fixtures
+DESTRUCTIVE_SATELLITE_FIXTURES = {
+    'target_sat': 'function',
+    'class_target_sat': 'class',
+    'module_target_sat': 'module',
+    'session_target_sat': 'session',
+}
+CAPSULE_FIXTURES = {
+    'capsule_host': 'function',
+    'module_capsule_host': 'module',
+    'session_capsule_host': 'session',
+}
+
+
+def _scope_key(item, scope):
+    """Return what a fixture of ``scope`` used by ``item`` is shared by"""
+    if scope == 'session':
+        return scope
+    if scope == 'module':
+        return item.module.__name__
+    if scope == 'class' and getattr(item, 'cls', None):
+        return item.parent.nodeid
+    return item.nodeid
+
+
+def factory_demand(items, markexpr='', n_minus=False):
+    """Return the number of hosts the satellite and capsule factories give to ``items``"""
+    demand = {'satellite': set(), 'capsule': set()}
+    if 'sanity' in markexpr:
+        return dict.fromkeys(demand, 0)
+    for item in items:
+        fixtures = dict(SATELLITE_FIXTURES)
+        if item.get_closest_marker('destructive'):
+            fixtures.update(DESTRUCTIVE_SATELLITE_FIXTURES)
+        for name, scope in fixtures.items():
+            if name in item.fixturenames:
+                demand['satellite'].add((name, _scope_key(item, scope)))
+        if n_minus:
+            continue
+        for name, scope in CAPSULE_FIXTURES.items():
+            if name in item.fixturenames:
+                demand['capsule'].add((name, _scope_key(item, scope)))
+    return {kind: len(keys) for kind, keys in demand.items()}
+
+
+def _budget_path(config):
+    """Return the host budget shared by the xdist workers of the test run"""
+    return Path(
+        settings.robottelo.tmp_dir or tempfile.gettempdir(),
+        'factory_lookahead',
+        f'budget-{load_run_id(config)}.json',
+    )
+
+
+def pytest_collection_finish(session):
+    """Set the look-ahead provisioner of the process, with the demand of the test run"""
+    config = session.config
+    if not settings.performance.factory_lookahead.enabled or config.option.collectonly:
+        return
+    demand = factory_demand(
+        session.items, config.option.markexpr, getattr(config.option, 'n_minus', False)
+    )
+    workers = getattr(config, 'workerinput', {}).get('workercount', 1)
+    if settings.server.xdist_behavior == 'on-demand' and session.items:
+        # align_to_satellite may take one for every worker
+        demand['satellite'] += workers
+    budget = SharedBudget(_budget_path(config), demand) if workers > 1 else None
+    config.factory_lookahead = LookaheadProvisioner(
+        demand, max_ahead=settings.performance.factory_lookahead.max_ahead, budget=budget
+    )
+    resolve_factory_deploy_args()
+    for kind, checkout in FACTORY_CHECKOUTS.items():
+        config.factory_lookahead.register(kind, checkout)
+
+
+def pytest_sessionfinish(session):
+    if lookahead := getattr(session.config, 'factory_lookahead', None):
+        lookahead.close()
+
+
+def pytest_unconfigure(config):
+    """Remove the host budget of the test run, once its workers are done"""
+    if settings.performance.factory_lookahead.enabled and not hasattr(config, 'workerinput'):
+        SharedBudget(_budget_path(config), {}).clear()
@@ -0,0 +1,48 @@
+"""Record the timings of every hammer command and summarize them at the end of the session"""
+
+from pathlib import Path
+
+from robottelo.cli import telemetry
+from robottelo.config import settings
+from robottelo.logging import logger, robottelo_log_dir
+
+
+def _telemetry_dir():
+    directory = settings.performance.hammer_telemetry.directory
+    return Path(directory) if directory else robottelo_log_dir.joinpath('hammer_telemetry')
+
+
+def pytest_configure(config):
+    """Send the hammer records of this process to its own JSONL file"""
+    if not settings.performance.hammer_telemetry.enabled:
+        return
+    directory = _telemetry_dir()
+    if hasattr(config, 'workerinput'):
+        worker_id = config.workerinput['workerid']
+    else:
+        # workers are started after the controller is configured, drop the previous run
+        for stale in directory.glob('*.jsonl'):
+            stale.unlink()
+        worker_id = 'master'
+    telemetry.set_sink(telemetry.JSONLSink(directory.joinpath(f'{worker_id}.jsonl')))
+
+
+def pytest_unconfigure(config):
+    sink = telemetry.get_sink()
+    if isinstance(sink, telemetry.JSONLSink):
+        sink.close()
+        telemetry.set_sink(None)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report the slowest and most frequent hammer commands of all the workers"""
+    if not settings.performance.hammer_telemetry.enabled or hasattr(config, 'workerinput'):
+        return
+    records = telemetry.load(_telemetry_dir())
+    if not records:
+        return
+    lines = telemetry.summarize(records, top=settings.performance.hammer_telemetry.summary_size)
+    terminalreporter.write_sep('=', 'hammer telemetry')
+    for line in lines:
+        terminalreporter.write_line(line)
+    logger.info('Hammer telemetry summary:\n{}'.format('\n'.join(lines)))
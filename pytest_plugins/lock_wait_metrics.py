@@ -0,0 +1,65 @@
+"""Report the time the tests waited for the function locks
+
+The xdist workers hand the lock wait times of
+:func:`robottelo.utils.decorators.func_locker.get_lock_wait_metrics` to the
+controller, which sums them up with its own at the end of the test session.
+"""
+
+import pytest
+
+from robottelo.logging import logger
+from robottelo.utils.decorators.func_locker import get_lock_wait_metrics
+
+
+def _add_metrics(config, metrics):
+    """Sum up metrics, a list of ``lock``, ``mode``, ``count``, ``total`` and
+    ``max`` dicts, in the lock wait metrics of the session
+    """
+    if not hasattr(config, '_lock_wait_metrics'):
+        config._lock_wait_metrics = {}
+    for lock_metrics in metrics:
+        summed = config._lock_wait_metrics.setdefault(
+            (lock_metrics['lock'], lock_metrics['mode']), {'count': 0, 'total': 0.0, 'max': 0.0}
+        )
+        summed['count'] += lock_metrics['count']
+        summed['total'] += lock_metrics['total']
+        summed['max'] = max(summed['max'], lock_metrics['max'])
+
+
+def _process_metrics():
+    return [
+        {'lock': lock_file_path, 'mode': mode, **metrics}
+        for (lock_file_path, mode), metrics in get_lock_wait_metrics().items()
+    ]
+
+
+def pytest_sessionfinish(session):
+    """Hand the lock wait times of the xdist worker to the controller"""
+    if hasattr(session.config, 'workeroutput'):
+        session.config.workeroutput['lock_wait_metrics'] = _process_metrics()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Sum up the lock wait times of the xdist worker which finished"""
+    _add_metrics(node.config, getattr(node, 'workeroutput', {}).get('lock_wait_metrics', []))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report the lock wait times of the session, the longest first"""
+    if hasattr(config, 'workerinput'):
+        return
+    _add_metrics(config, _process_metrics())
+    lines = [
+        f'{metrics["total"]:.1f}s waited by {metrics["count"]} {mode} locks '
+        f'(max {metrics["max"]:.1f}s): {lock_file_path}'
+        for (lock_file_path, mode), metrics in sorted(
+            config._lock_wait_metrics.items(), key=lambda item: -item[1]['total']
+        )
+    ]
+    if not lines:
+        return
+    terminalreporter.write_sep('=', 'function lock waits')
+    for line in lines:
+        terminalreporter.write_line(line)
+    logger.info('Function lock waits:\n{}'.format('\n'.join(lines)))
@@ -2,6 +2,7 @@ import datetime
 import inspect
 import re
 
+from packaging.version import Version
 import pytest
 
 from robottelo.config import settings
@@ -51,6 +52,46 @@ def pytest_addoption(parser):
     )
 
 
+def _resolve_satellite_metadata(probe=True):
+    """Return the satellite metadata added to the test user_properties
+
+    The RHEL version is probed over ssh only when ``probe`` is set and an
+    existing Satellite is configured, settings are used otherwise.
+    """
+    if probe and settings.server.hostname:
+        rhel_version = get_sat_rhel_version().base_version
+    else:
+        rhel_version = Version(str(settings.server.version.rhel_version)).base_version
+    return {
+        'rhel_version': rhel_version,
+        'sat_version': settings.server.version.get('release'),
+        'snap_version': settings.server.version.get('snap', ''),
+        # Satellite Network Type on which tests are running on
+        'network_type': 'ipv6' if settings.server.is_ipv6 else 'ipv4',
+    }
+
+
+def satellite_metadata(config):
+    """Return the satellite metadata of the session, resolved once by the controller
+
+    xdist workers get it from the controller and never touch the network
+    during the collection.
+    """
+    if not hasattr(config, '_satellite_metadata'):
+        if hasattr(config, 'workerinput'):
+            metadata = config.workerinput.get('satellite_metadata')
+            config._satellite_metadata = metadata or _resolve_satellite_metadata(probe=False)
+        else:
+            config._satellite_metadata = _resolve_satellite_metadata()
+    return config._satellite_metadata
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the satellite metadata to the xdist worker being started"""
+    node.workerinput['satellite_metadata'] = satellite_metadata(node.config)
+
+
 def pytest_configure(config):
     """Register markers related to testimony tokens"""
     for marker in [
@@ -147,13 +188,7 @@ def pytest_collection_modifyitems(items, config):
     Control test collection for custom options related to testimony metadata
 
     """
-    # get RHEL version of the satellite
-    rhel_version = get_sat_rhel_version().base_version
-    sat_version = settings.server.version.get('release')
-    snap_version = settings.server.version.get('snap', '')
-
-    # Satellite Network Type on which tests are running on
-    satellite_network_type = 'ipv6' if settings.server.is_ipv6 else 'ipv4'
+    metadata = satellite_metadata(config)
 
     # split the option string and handle no option, single option, multiple
     # config.getoption(default) doesn't work like you think it does, hence or ''
@@ -223,12 +258,12 @@ def pytest_collection_modifyitems(items, config):
         item.user_properties.append(("markers", ", ".join(markers_prop_data)))
 
         # Version specific user properties
-        item.user_properties.append(("BaseOS", rhel_version))
-        item.user_properties.append(("SatelliteVersion", sat_version))
-        item.user_properties.append(("SnapVersion", snap_version))
+        item.user_properties.append(("BaseOS", metadata['rhel_version']))
+        item.user_properties.append(("SatelliteVersion", metadata['sat_version']))
+        item.user_properties.append(("SnapVersion", metadata['snap_version']))
 
         # Network Type user property
-        item.user_properties.append(("SatelliteNetworkType", satellite_network_type))
+        item.user_properties.append(("SatelliteNetworkType", metadata['network_type']))
 
         # exit early if no filters were passed
         if importance or component or team:
@@ -0,0 +1,50 @@
+"""Test run bookkeeping of the ``least-loaded`` ``server.xdist_behavior``
+
+The xdist controller hands its test run ID to the workers, which share the
+:class:`robottelo.utils.satellite_load.AssignmentLedger` of the run, and the
+controller reports the assignments and clears them once the run is done.
+"""
+
+import uuid
+
+import pytest
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.satellite_load import AssignmentLedger
+
+
+def load_run_id(config):
+    """Return the ID of the test run, shared by the xdist controller and its workers"""
+    if not hasattr(config, '_load_run_id'):
+        run_id = getattr(config, 'workerinput', {}).get('load_run_id')
+        config._load_run_id = run_id or uuid.uuid4().hex
+    return config._load_run_id
+
+
+def _is_least_loaded():
+    return settings.server.xdist_behavior == 'least-loaded'
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the test run ID to the xdist worker being started"""
+    node.workerinput['load_run_id'] = load_run_id(node.config)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report the Satellite assigned to every worker, with the load it was assigned on"""
+    if not _is_least_loaded() or hasattr(config, 'workerinput'):
+        return
+    if not (lines := AssignmentLedger(load_run_id(config)).report()):
+        return
+    terminalreporter.write_sep('=', 'satellite assignments')
+    for line in lines:
+        terminalreporter.write_line(line)
+    logger.info('Satellite assignments:\n{}'.format('\n'.join(lines)))
+
+
+def pytest_unconfigure(config):
+    """Remove the assignments of the test run, once the controller reported them"""
+    if _is_least_loaded() and not hasattr(config, 'workerinput'):
+        AssignmentLedger(load_run_id(config)).clear()
@@ -1,16 +1,194 @@
 """Generic base class for cli hammer commands."""
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import re
+import shlex
+import threading
+import uuid
 
+from broker.helpers import Result
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import cache, hammer, hammer_shell, rest, telemetry
 from robottelo.config import settings
-from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
+from robottelo.exceptions import (
+    CLIBaseError,
+    CLIDataBaseError,
+    CLIError,
+    CLIReturnCodeError,
+)
 from robottelo.logging import logger
 from robottelo.utils.ssh import get_client
 
+_batches = threading.local()
+
+
+class HammerBatchResult:
+    """Placeholder for the result of a hammer command queued in a :class:`HammerBatch`
+
+    The value is available through :attr:`result` once the batch was executed.
+    """
+
+    def __init__(self, cli_cls, command, output_format, ignore_stderr, return_raw_response):
+        self.cli_cls = cli_cls
+        self.command = command
+        self.output_format = output_format
+        self.ignore_stderr = ignore_stderr
+        self.return_raw_response = return_raw_response
+        self.response = None
+        self._callbacks = []
+        self._value = None
+        self._error = None
+
+    def then(self, callback):
+        """Register ``callback`` to post-process the value once it is available"""
+        self._callbacks.append(callback)
+        return self
+
+    def resolve(self, response):
+        """Store the value of ``response`` handled like :meth:`Base.execute` would"""
+        self.response = ssh.parse_output(response, self.output_format)
+        try:
+            if self.return_raw_response:
+                value = self.response
+            else:
+                value = self.cli_cls._handle_response(
+                    self.response, ignore_stderr=self.ignore_stderr
+                )
+            for callback in self._callbacks:
+                value = callback(value)
+        except (CLIBaseError, CLIError) as err:
+            self._error = err
+        else:
+            self._value = value
+
+    @property
+    def done(self):
+        return self.response is not None
+
+    @property
+    def result(self):
+        """Return the command value or raise the exception it finished with"""
+        if not self.done:
+            raise CLIError(f'Batched command "{self.command}" was not executed yet')
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class HammerBatch:
+    """Collect hammer commands and run them in one remote shell round-trip per host
+
+    Commands are executed sequentially in one script, each with its own
+    delimited stdout, stderr and exit status, so every command keeps the
+    :meth:`Base._handle_response` semantics of a standalone call.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.entries = []
+        self._token = f'@@robottelo-batch-{uuid.uuid4().hex}@@'
+
+    def add(self, hostname, cmd, placeholder):
+        self.entries.append((hostname, cmd, placeholder))
+        return placeholder
+
+    @property
+    def results(self):
+        """Return the placeholders of all queued commands, in order"""
+        return [placeholder for _, _, placeholder in self.entries]
+
+    def _script(self, commands):
+        lines = ['d=$(mktemp -d)']
+        for index, cmd in enumerate(commands):
+            lines.extend(
+                [
+                    f'( {cmd} ) >"$d/out" 2>"$d/err"; rc=$?',
+                    f"printf '%s %d %d\\n' {self._token} {index} $rc",
+                    'cat "$d/out"',
+                    f"printf '\\n%s\\n' {self._token}",
+                    'cat "$d/err"',
+                    f"printf '\\n%s\\n' {self._token}",
+                ]
+            )
+        lines.append('rm -rf "$d"')
+        return '\n'.join(lines)
+
+    def _parse(self, stdout):
+        """Return a dictionary mapping command index to its result"""
+        token = re.escape(self._token)
+        pattern = re.compile(
+            rf'{token} (\d+) (-?\d+)\n(.*?)\n{token}\n(.*?)\n{token}\n', re.DOTALL
+        )
+        return {
+            int(index): Result(stdout=out, stderr=err, status=int(status))
+            for index, status, out, err in pattern.findall(stdout)
+        }
+
+    def execute(self):
+        """Run the queued commands and resolve their placeholders"""
+        by_host = {}
+        for hostname, cmd, placeholder in self.entries:
+            by_host.setdefault(hostname, []).append((cmd, placeholder))
+        for hostname, entries in by_host.items():
+            script = self._script(cmd for cmd, _ in entries)
+            response = ssh.command(
+                f'bash -c {shlex.quote(script)}', hostname=hostname, timeout=self.timeout
+            )
+            results = self._parse(response.stdout or '')
+            for index, (cmd, placeholder) in enumerate(entries):
+                if index not in results:
+                    # the script was interrupted, e.g. by a timeout
+                    results[index] = Result(
+                        stdout='',
+                        stderr=f'Batched command did not run:\n{response.stderr}',
+                        status=response.status or -1,
+                    )
+                placeholder.resolve(results[index])
+                # a read run between queueing and running the write may be cached
+                placeholder.cli_cls._invalidate_read_cache(hostname)
+
+
+class HammerExecutor:
+    """Run hammer helpers of :class:`Base` classes concurrently in a thread pool
+
+    Every submitted call runs on its own subclass of the helper's class, so
+    concurrent calls do not overwrite each other's ``command_sub``. The returned
+    futures hold the same parsed results, or raise the same exceptions, as the
+    synchronous calls.
+    """
+
+    def __init__(self, max_workers=None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.performance.hammer_concurrency,
+            thread_name_prefix='hammer',
+        )
+
+    def submit(self, method, *args, **kwargs):
+        """Schedule the hammer helper ``method``, like ``Product.create``, to be run
+
+        :return: a ``concurrent.futures.Future`` of the helper result.
+        """
+        cli_cls = method.__self__
+        isolated = type(cli_cls.__name__, (cli_cls,), {})
+        return self._executor.submit(getattr(isolated, method.__name__), *args, **kwargs)
+
+    def map(self, method, *iterables):
+        """Run ``method`` concurrently on each set of arguments, return results in order"""
+        futures = [self.submit(method, *args) for args in zip(*iterables, strict=True)]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
 
 class Base:
     """Base class for hammer CLI interaction
@@ -24,6 +202,8 @@ class Base:
     command_end = None  # extending commands like for directory to pass
     command_requires_org = False  # True when command requires organization-id
     hostname = None  # Now used for Satellite class hammer execution
+    rest_bypass = False  # True to serve read-only helpers from the REST API
+    rest_resource = None  # apidoc resource name, when not the plural of command_base
     logger = logger
     _db_error_regex = re.compile(r'.*INSERT INTO|.*SELECT .*FROM|.*violates foreign key')
 
@@ -62,6 +242,84 @@ class Base:
             cls.logger.warning(f'stderr contains following message:\n{response.stderr}')
         return response.stdout
 
+    @classmethod
+    @contextmanager
+    def batch(cls, timeout=None):
+        """Context manager running the hammer commands issued inside it in one round-trip
+
+        While the context is active, every :meth:`execute` call is queued and
+        returns a :class:`HammerBatchResult` placeholder instead of its value.
+        All queued commands are shipped to their host in a single remote
+        script when the context exits, then each placeholder ``result`` holds
+        the value the standalone call would have returned, or raises the same
+        :class:`robottelo.exceptions.CLIReturnCodeError`.
+
+        Only independent commands can be batched; ``create`` returns the
+        output of the create command itself, without fetching the new entity.
+
+        Usage::
+
+            with target_sat.cli.Base.batch() as batch:
+                target_sat.cli.Product.delete({'id': 1})
+                target_sat.cli.Product.delete({'id': 2})
+            [result.result for result in batch.results]
+
+        :param timeout: Time to wait for the whole batch to finish.
+        """
+        if getattr(_batches, 'current', None) is not None:
+            raise CLIError('Hammer batches can not be nested')
+        _batches.current = batch = HammerBatch(timeout=timeout)
+        try:
+            yield batch
+        finally:
+            _batches.current = None
+        batch.execute()
+
+    @classmethod
+    def concurrent(cls, max_workers=None):
+        """Return a :class:`HammerExecutor` running independent hammer calls concurrently
+
+        Usage::
+
+            with target_sat.cli.Base.concurrent(max_workers=4) as executor:
+                futures = [
+                    executor.submit(target_sat.cli.Product.create, {'organization-id': org.id})
+                    for _ in range(4)
+                ]
+            products = [future.result() for future in futures]
+
+        :param max_workers: maximum number of concurrent hammer calls, defaults
+            to ``settings.performance.hammer_concurrency``.
+        """
+        return HammerExecutor(max_workers=max_workers)
+
+    @staticmethod
+    def _then(result, callback):
+        """Apply ``callback`` to ``result`` now, or once a batched command was executed"""
+        if isinstance(result, HammerBatchResult):
+            return result.then(callback)
+        return callback(result)
+
+    @classmethod
+    def _rest_call(cls, options):
+        """Serve the current read-only subcommand from the REST API when enabled
+
+        :return: the normalized API result, or None when hammer has to be used.
+        """
+        if not (cls.rest_bypass or settings.performance.rest_bypass):
+            return None
+        if cls.omitting_credentials or getattr(_batches, 'current', None) is not None:
+            return None
+        user, password = cls._get_username_password()
+        return rest.call(
+            cls,
+            cls.command_sub,
+            options,
+            cls.hostname or settings.server.hostname,
+            user,
+            password,
+        )
+
     @classmethod
     def add_operating_system(cls, options=None):
         """
@@ -94,6 +352,8 @@ class Base:
             options = {}
 
         result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
+        if isinstance(result, HammerBatchResult):
+            return result
 
         # Extract new object ID if it was successfully created
         if len(result) > 0 and 'id' in result[0]:
@@ -189,26 +449,76 @@ class Base:
             user, password = None, None
         else:
             user, password = cls._get_username_password(user, password)
-        time_hammer = settings.performance.time_hammer
-
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
+        cmd = 'LANG={} hammer -v {} {} {} {}'.format(
             settings.robottelo.locale,
-            'time -p' if time_hammer else '',
             f'-u {user}' if user else "--interactive no",
             f'-p {password}' if password else "",
             f'--output={output_format}' if output_format else "",
             command,
         )
-        response = ssh.command(
-            cmd,
-            hostname=hostname or cls.hostname or settings.server.hostname,
-            output_format=output_format,
-            timeout=timeout,
+        hostname = hostname or cls.hostname or settings.server.hostname
+        batch = getattr(_batches, 'current', None)
+        if batch is not None:
+            placeholder = HammerBatchResult(
+                type(cls.__name__, (cls,), {'command_sub': cls.command_sub}),
+                cmd,
+                output_format,
+                ignore_stderr,
+                return_raw_response,
+            )
+            placeholder.cli_cls._invalidate_read_cache(hostname)
+            return batch.add(hostname, cmd, placeholder)
+        read_cache = cache.get_cache(hostname) if settings.performance.read_cache.enabled else None
+        cacheable = (
+            read_cache is not None
+            and cls.command_sub in cache.CACHED_SUBCOMMANDS
+            and not return_raw_response
         )
+        if cacheable and (cached := read_cache.get(cls.command_base, cmd)) is not cache.MISSING:
+            return cached
+        with telemetry.hammer_call(cls.command_base, cls.command_sub, hostname) as record:
+            response = None
+            if (
+                settings.performance.hammer_shell.enabled
+                and cls.command_sub in hammer_shell.READ_ONLY_SUBCOMMANDS
+            ):
+                response = hammer_shell.execute(
+                    hostname,
+                    user,
+                    password,
+                    f'-v {f"--output={output_format}" if output_format else ""} {command}',
+                    locale=settings.robottelo.locale,
+                    timeout=settings.performance.hammer_shell.timeout,
+                )
+                if response is not None:
+                    if record is not None:
+                        record.backend = 'hammer-shell'
+                    response = ssh.parse_output(response, output_format)
+            if response is None:
+                response = ssh.command(
+                    cmd,
+                    hostname=hostname,
+                    output_format=output_format,
+                    timeout=timeout,
+                )
+        cls._invalidate_read_cache(hostname)
         if return_raw_response:
             return response
-        return cls._handle_response(response, ignore_stderr=ignore_stderr)
+        result = cls._handle_response(response, ignore_stderr=ignore_stderr)
+        if cacheable:
+            read_cache.put(cls.command_base, cmd, result)
+        return result
+
+    @classmethod
+    def _invalidate_read_cache(cls, hostname):
+        """Drop the cached outputs of the resource on ``hostname``, when the current
+        subcommand may change what info and list return
+        """
+        if (
+            settings.performance.read_cache.enabled
+            and cls.command_sub not in cache.READ_ONLY_SUBCOMMANDS
+        ):
+            cache.get_cache(hostname).invalidate(cls.command_base)
 
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
@@ -235,11 +545,7 @@ class Base:
         if search is not None and 'search' not in options:
             options.update({'search': f'{search[0]}=\\"{search[1]}\\"'})
 
-        result = cls.list(options)
-        if result:
-            result = result[0]
-
-        return result
+        return cls._then(cls.list(options), lambda result: result[0] if result else result)
 
     @classmethod
     def info(cls, options=None, output_format=None, return_raw_response=None):
@@ -252,13 +558,18 @@ class Base:
         if cls.command_requires_org and 'organization-id' not in options:
             raise CLIError(f'organization-id option is required for {cls.__name__}.info')
 
-        result = cls.execute(
-            command=cls._construct_command(options),
-            output_format=output_format,
-            return_raw_response=return_raw_response,
-        )
-        if not return_raw_response and output_format != 'json':
-            result = hammer.parse_info(result)
+        if not return_raw_response and (result := cls._rest_call(options)) is not None:
+            return result
+
+        with telemetry.extended():
+            result = cls.execute(
+                command=cls._construct_command(options),
+                output_format=output_format,
+                return_raw_response=return_raw_response,
+            )
+            if not return_raw_response and output_format != 'json':
+                with telemetry.phase('parse_time'):
+                    result = cls._then(result, hammer.parse_info)
         return result
 
     @classmethod
@@ -282,8 +593,87 @@ class Base:
         # if cls.command_requires_org and 'organization-id' not in options:
         #     raise CLIError(f'organization-id option is required for {cls.__name__}.list')
 
+        if (result := cls._rest_call(options)) is not None:
+            return result
+
         return cls.execute(cls._construct_command(options), output_format=output_format)
 
+    @classmethod
+    def iter_list(cls, options=None, per_page=True, output_format='csv'):
+        """Like :meth:`list`, but return an iterator yielding the rows one by one
+
+        Rows are parsed lazily from the hammer output, so callers can stop early
+        or aggregate results without holding all the parsed rows in memory.
+        """
+        parsers = {'csv': hammer.iter_csv, 'json': hammer.iter_json}
+        if output_format not in parsers:
+            raise CLIError(f'Unsupported output format for iter_list: {output_format}')
+
+        cls.command_sub = 'list'
+
+        if options is None:
+            options = {}
+
+        if 'per-page' not in options and per_page:
+            options['per-page'] = 10000
+
+        # request the output format ourselves, so the output is not parsed as a whole
+        result = cls.execute(f'--output={output_format} {cls._construct_command(options)}')
+        return cls._then(
+            result, lambda stdout: parsers[output_format](stdout) if stdout else iter(())
+        )
+
+    @classmethod
+    def paginate(cls, options=None, per_page=1000, prefetch=False, output_format='csv'):
+        """Walk the ``list`` results page by page, yielding each page as a list of rows
+
+        Unlike :meth:`list`, which asks for one huge page, the results are fetched
+        in bounded ``--per-page`` chunks, keeping memory usage predictable and
+        letting the consumer process the first page right away.
+
+        :param options: the ``list`` options, ``page`` and ``per-page`` are managed here.
+        :param per_page: number of rows requested per page.
+        :param prefetch: fetch the next page in a background thread while the
+            current one is consumed.
+        """
+        if getattr(_batches, 'current', None) is not None:
+            raise CLIError('Paginated listing can not be used in a hammer batch')
+        options = {
+            key: value for key, value in (options or {}).items() if key not in ('page', 'per-page')
+        }
+        # isolate command_sub from other calls made on cls while a page is prefetched
+        lister = type(cls.__name__, (cls,), {})
+
+        def fetch(page):
+            rows = lister.list(
+                {**options, 'page': page, 'per-page': per_page},
+                per_page=False,
+                output_format=output_format,
+            )
+            return rows or []
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = 1
+            pending = executor.submit(fetch, page) if prefetch else None
+            while True:
+                rows = pending.result() if prefetch else fetch(page)
+                last_page = len(rows) < per_page
+                if prefetch and not last_page:
+                    pending = executor.submit(fetch, page + 1)
+                if rows:
+                    yield rows
+                if last_page:
+                    break
+                page += 1
+
+    @classmethod
+    def iter_all(cls, options=None, per_page=1000, prefetch=False, output_format='csv'):
+        """Yield every ``list`` row, fetching the pages lazily, see :meth:`paginate`"""
+        for rows in cls.paginate(
+            options, per_page=per_page, prefetch=prefetch, output_format=output_format
+        ):
+            yield from rows
+
     @classmethod
     def puppetclasses(cls, options=None):
         """
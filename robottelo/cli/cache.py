@@ -0,0 +1,112 @@
+"""Per-host read cache of the idempotent hammer commands.
+
+The parsed output of ``info`` and ``list`` commands (and so of ``exists``) is
+kept for ``ttl`` seconds, keyed by the full hammer command line, which holds the
+command, its options, the output format and the credentials. Any other
+subcommand run on a host drops the cached entries of its hammer resource, for
+example ``content-view publish`` drops the cached ``content-view info`` and
+``content-view version list`` outputs.
+
+Changes made outside of hammer (API, UI, other processes) are not seen by the
+cache, which is why it is opt-in.
+"""
+
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+CACHED_SUBCOMMANDS = frozenset(('info', 'list'))
+# the subcommands not dropping the cached outputs of their resource
+READ_ONLY_SUBCOMMANDS = frozenset(('dump', 'info', 'list', 'ping', 'puppet-classes', 'sc-params'))
+
+_caches = {}
+_caches_lock = threading.Lock()
+MISSING = object()
+
+
+def _resource(command_base):
+    """Return the top level hammer resource of ``command_base``, the invalidation group"""
+    return (command_base or '').split(' ', 1)[0]
+
+
+class HammerReadCache:
+    """TTL bounded LRU cache of the hammer outputs of one host"""
+
+    def __init__(self, maxsize=256, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    @property
+    def stats(self):
+        """Return a copy of the cache counters"""
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+    def get(self, command_base, cmd):
+        """Return a copy of the cached output of ``cmd``, or ``MISSING``"""
+        key = (_resource(command_base), cmd)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self._stats['misses'] += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def put(self, command_base, cmd, value):
+        key = (_resource(command_base), cmd)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, command_base):
+        """Drop the cached outputs of the hammer resource of ``command_base``"""
+        resource = _resource(command_base)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == resource]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_cache(hostname):
+    """Return the read cache of ``hostname``, created from the performance settings"""
+    from robottelo.config import settings
+
+    with _caches_lock:
+        if hostname not in _caches:
+            _caches[hostname] = HammerReadCache(
+                maxsize=settings.performance.read_cache.maxsize,
+                ttl=settings.performance.read_cache.ttl,
+            )
+        return _caches[hostname]
+
+
+def stats():
+    """Return the counters of the read cache of every host"""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {hostname: read_cache.stats for hostname, read_cache in caches.items()}
+
+
+def clear():
+    """Drop the cached outputs of all the hosts"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for read_cache in caches:
+        read_cache.clear()
@@ -1,17 +1,47 @@
 """Helpers to interact with hammer command line utility."""
 
 import csv
+from functools import lru_cache
+import io
 import json
 import re
 
 from robottelo.logging import logger
 
 
+@lru_cache(maxsize=1024)
 def _normalize(header):
     """Replace empty spaces with '-' and lower all chars"""
     return header.replace(' ', '-').lower()
 
 
+@lru_cache(maxsize=256)
+def _normalize_headers(header):
+    """Return the normalized column names of a CSV ``header`` line"""
+    return tuple(_normalize(column) for column in next(csv.reader([header])))
+
+
+def _iter_lines(output):
+    """Yield the lines of ``output`` without their line terminators
+
+    :param output: the whole output string, or an iterable of text chunks as they
+        are read from the remote host.
+    """
+    if isinstance(output, str):
+        output = io.StringIO(output, newline='')
+        for line in output:
+            yield line.rstrip('\r\n')
+        return
+    pending = ''
+    for chunk in output:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line.rstrip('\r')
+    if pending:
+        yield pending.rstrip('\r')
+
+
 def parse_json(stdout):
     """Parse JSON output from Hammer CLI and convert it to python dictionary
     while normalizing keys.
@@ -23,6 +53,65 @@ def parse_json(stdout):
     return _normalize_obj(parsed)
 
 
+def iter_json(output):
+    """Yield the normalized items of a JSON list output from Hammer CLI one by one
+
+    Items are decoded as soon as they are complete, so the whole list is never
+    held in memory. A JSON object output yields a single normalized item.
+
+    :param output: the whole output string, or an iterable of text chunks.
+    """
+    chunks = iter([output] if isinstance(output, str) else output)
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+
+    def skip(chars):
+        """Move ``position`` past ``chars``, return False when the output is exhausted"""
+        nonlocal buffer, position
+        while True:
+            while position < len(buffer) and buffer[position] in chars:
+                position += 1
+            if position < len(buffer):
+                return True
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            buffer, position = chunk, 0
+
+    def decode():
+        """Decode the item starting at ``position``, reading more chunks when needed"""
+        nonlocal buffer, position
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                item = end = None
+            # a number that is not followed by a delimiter could be truncated
+            if end is not None and end < len(buffer) and buffer[end] in ' \t\r\n,]}':
+                break
+            chunk = next(chunks, None)
+            if chunk is None:
+                if end is None:
+                    decoder.raw_decode(buffer, position)
+                break
+            buffer, position = buffer[position:] + chunk, 0
+        position = end
+        return item
+
+    if not skip(' \t\r\n'):
+        return
+    while buffer[position] != '[':
+        item = decode()
+        if not skip(' \t\r\n'):
+            yield _normalize_obj(item)
+            return
+        # only the last object of a multiple objects output is relevant
+    position += 1
+    while skip(' \t\r\n,') and buffer[position] != ']':
+        yield _normalize_obj(decode())
+
+
 def _normalize_obj(obj):
     """Normalize all dict's keys replacing empty spaces with "-" and lowering
     chars
@@ -39,12 +128,21 @@ def _normalize_obj(obj):
 
 def parse_csv(output):
     """Parse CSV output from Hammer CLI and return a Python dictionary."""
-    output = output.splitlines()
+    return list(iter_csv(output))
+
+
+def iter_csv(output):
+    """Yield each row of a CSV output from Hammer CLI as a dictionary
 
-    # Normalize the column names to use when generating the dictionary
+    :param output: the whole output string, or an iterable of text chunks.
+    """
+    lines = _iter_lines(output)
     try:
-        keys = [_normalize(header) for header in next(csv.reader(output))]
-        return [value for value in csv.DictReader(output[1:], fieldnames=keys)]
+        header = next(lines, None)
+        if header is None:
+            return
+        # Normalize the column names to use when generating the dictionary
+        yield from csv.DictReader(lines, fieldnames=_normalize_headers(header))
     except csv.Error as err:
         logger.error(f'Exception while parsing CSV output {output}: {err}')
         raise
@@ -169,6 +267,19 @@ def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
     return spaces // indentation_spaces + (1 if spaces % indentation_spaces > 0 else 0)
 
 
+_INFO_NUMBERED_VALUE = re.compile(r'\d+\)\s+(.+)$')
+_INFO_NUMBERED_KEY = re.compile(r'(\d+)\)')
+
+
+def _indentation_level(line):
+    """Inline equivalent of ``get_line_indentation_level`` with the default arguments"""
+    if len(line) < 4:
+        return 0
+    indent = line[: len(line) - len(line.lstrip(' \t'))]
+    spaces = len(indent) + 3 * indent.count('\t')
+    return -(-spaces // 4)
+
+
 def parse_info(output):
     """Parse the info output and returns a dict mapping the values."""
     # info dictionary
@@ -181,111 +292,108 @@ def parse_info(output):
         # skip empty lines and dividers
         if line == '' or line == '---':
             continue
-        current_indent_level = get_line_indentation_level(line)
+        current_indent_level = _indentation_level(line)
         if current_indent_level <= 1:
             # we are entering or leaving a second level from lower/upper levels
             # clear the second level key
             second_level_key = None
-        if line.startswith(' '):  # sub-properties are indented
-            # values are separated by ':' or '=>', but not by '::' which can be
-            # entity name like 'test::params::keys'
-            if line.find(':') != -1 and line.find('::') == -1:
-                key, value = line.lstrip().split(":", 1)
-            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
-                key, value = line.lstrip().split(" =>", 1)
-            else:
-                key = value = None
-
-            if key is None and value is None:
-                # Parse single attribute collection properties
-                # Template
-                #  1) template1
-                #  2) template2
-                #
-                # or
-                # Template
-                #  template1
-                #  template2
-                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
-
-                if match is None:
-                    match = re.match(r'(.*)$', line.lstrip())
-
-                value = match.group(1)
-
-                # adding list to 1 level, for example:
-                # {'template': ['template1', 'template2']}
-                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
-                    contents[sub_prop] = []
-                    contents[sub_prop].append(value)
-                elif isinstance(contents[sub_prop], list):
-                    contents[sub_prop].append(value)
-                else:
-                    # adding list to 2 level, for example:
-                    # {'subscription-information':
-                    #      {'registered-by-activation-keys': ['ak1', 'ak2']}
-                    #  }
-                    last_key = list(contents[sub_prop].keys())[-1]
-                    if not contents[sub_prop][last_key]:
-                        contents[sub_prop][last_key] = [value]
-                    else:
-                        contents[sub_prop][last_key].append(value)
-            else:
-                # some properties have many numbered values
-                # Example:
-                # Content:
-                #  1) Repo Name: repo1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                #  2) Repo Name: puppet1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                starts_with_number = re.match(r'(\d+)\)', key)
-                if starts_with_number:
-                    # if this is a numbered list on level 2, do nothing - this script doesn't support it
-                    if current_indent_level >= 2:
-                        continue
-                    sub_num = int(starts_with_number.group(1))
-                    # no. 1) we need to change dict() to list()
-                    if sub_num == 1:
-                        contents[sub_prop] = []
-                    # remove number from key
-                    key = re.sub(r'\d+\)', '', key)
-                    # append empty dict to array
-                    contents[sub_prop].append({})
-
-                key = key.lstrip().replace(' ', '-').lower()
-                value = value.lstrip()
-                # add value to dictionary
-                if sub_num is not None:
-                    contents[sub_prop][-1][key] = value
-                else:
-                    # a third level is always represented as a dictionary and
-                    # we need to detect if we are at third level
-                    # example:
-                    # Content Information:
-                    #     Content View:
-                    #         ID:   10
-                    #         Name: Default Organization View
-                    # the "ID" and "Name" are located at third indent level
-                    # "content view" is located at second indent level
-                    if current_indent_level == 2 and second_level_key:
-                        # we are at third level indentation
-                        if not contents[sub_prop][second_level_key]:
-                            contents[sub_prop][second_level_key] = {}
-                        contents[sub_prop][second_level_key][key] = value
-                    else:
-                        contents[sub_prop][key] = value
-                    if current_indent_level == 1 and not value:
-                        # always set the last possible second level key
-                        # that can form a third level
-                        second_level_key = key
-        else:
+        if line[0] != ' ':
             sub_num = None  # new property implies no sub property
-            key, value = line.lstrip().split(":", 1)
+            key, value = line.lstrip().split(':', 1)
             key = key.lstrip().replace(' ', '-').lower()
-            if value.lstrip() == '':  # 'key:' no value, new sub-property
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
                 sub_prop = key
                 contents[sub_prop] = {}
             else:  # 'key: value' line
-                contents[key] = value.lstrip()
+                contents[key] = value
+            continue
+
+        # sub-properties are indented
+        stripped = line.lstrip()
+        # values are separated by ':' or '=>', but not by '::' which can be
+        # entity name like 'test::params::keys'
+        if ':' in line and '::' not in line:
+            key, value = stripped.split(':', 1)
+        elif '=>' in line and ' =>' in stripped:
+            key, value = stripped.split(' =>', 1)
+        else:
+            # Parse single attribute collection properties
+            # Template
+            #  1) template1
+            #  2) template2
+            #
+            # or
+            # Template
+            #  template1
+            #  template2
+            match = _INFO_NUMBERED_VALUE.match(stripped)
+            value = stripped if match is None else match.group(1)
+            sub_contents = contents[sub_prop]
+            # adding list to 1 level, for example:
+            # {'template': ['template1', 'template2']}
+            if isinstance(sub_contents, dict) and not sub_contents:
+                contents[sub_prop] = [value]
+            elif isinstance(sub_contents, list):
+                sub_contents.append(value)
+            else:
+                # adding list to 2 level, for example:
+                # {'subscription-information':
+                #      {'registered-by-activation-keys': ['ak1', 'ak2']}
+                #  }
+                last_key = next(reversed(sub_contents.keys()))
+                if not sub_contents[last_key]:
+                    sub_contents[last_key] = [value]
+                else:
+                    sub_contents[last_key].append(value)
+            continue
+
+        # some properties have many numbered values
+        # Example:
+        # Content:
+        #  1) Repo Name: repo1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        #  2) Repo Name: puppet1
+        #     URL:       /custom/4f84fc90-9ffa-...
+        starts_with_number = _INFO_NUMBERED_KEY.match(key)
+        if starts_with_number:
+            # if this is a numbered list on level 2, do nothing - this script doesn't support it
+            if current_indent_level >= 2:
+                continue
+            sub_num = int(starts_with_number.group(1))
+            # no. 1) we need to change dict() to list()
+            if sub_num == 1:
+                contents[sub_prop] = []
+            # remove number from key
+            key = _INFO_NUMBERED_KEY.sub('', key)
+            # append empty dict to array
+            contents[sub_prop].append({})
+
+        key = key.lstrip().replace(' ', '-').lower()
+        value = value.lstrip()
+        # add value to dictionary
+        if sub_num is not None:
+            contents[sub_prop][-1][key] = value
+        else:
+            # a third level is always represented as a dictionary and
+            # we need to detect if we are at third level
+            # example:
+            # Content Information:
+            #     Content View:
+            #         ID:   10
+            #         Name: Default Organization View
+            # the "ID" and "Name" are located at third indent level
+            # "content view" is located at second indent level
+            if current_indent_level == 2 and second_level_key:
+                # we are at third level indentation
+                if not contents[sub_prop][second_level_key]:
+                    contents[sub_prop][second_level_key] = {}
+                contents[sub_prop][second_level_key][key] = value
+            else:
+                contents[sub_prop][key] = value
+            if current_indent_level == 1 and not value:
+                # always set the last possible second level key
+                # that can form a third level
+                second_level_key = key
 
     return contents
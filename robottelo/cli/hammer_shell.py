@@ -0,0 +1,166 @@
+"""Persistent ``hammer shell`` sessions, saving the hammer startup time on every command.
+
+``hammer shell`` does not report the exit status of the commands it runs, so
+only read-only subcommands are sent to it. Any stderr output or protocol
+problem makes the caller fall back to a plain ``hammer`` exec, which gives the
+authoritative status and error message.
+"""
+
+from contextlib import suppress
+import os
+import threading
+import time
+
+from broker.helpers import Result
+
+from robottelo.cli import telemetry
+from robottelo.logging import logger
+
+PROMPT = b'hammer> '
+# not ping, nor dump, whose failure may be reported by the exit status alone
+READ_ONLY_SUBCOMMANDS = frozenset(('info', 'list', 'puppet-classes', 'sc-params'))
+POLL_INTERVAL = 0.01
+
+_shells = {}
+_unsupported = set()
+_shells_lock = threading.Lock()
+# held while the shell of a host and credentials is opened, not to block the others
+_opening_locks = {}
+_shells_pid = os.getpid()
+
+
+class HammerShellError(Exception):
+    """Raised when the hammer shell session can not be used anymore"""
+
+
+class HammerShell:
+    """A ``hammer shell`` process kept open on a host, fed with commands over stdin"""
+
+    def __init__(self, client, credentials='', locale='en_US.UTF-8', timeout=600):
+        self.client = client
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # broker's Session wraps the ssh2 session we need to open a raw channel
+        self._session = client.session.session
+        self._channel = self._session.open_session()
+        self._channel.execute(f'LANG={locale} hammer {credentials} shell')
+        self._session.set_blocking(False)
+        # discard the welcome banner printed before the first prompt
+        self._read_until_prompt(self.timeout)
+
+    def _read_until_prompt(self, timeout):
+        """Read the channel until the shell prompt shows up, return ``(stdout, stderr)``"""
+        stdout, stderr = [], []
+        tail = b''
+        deadline = time.monotonic() + timeout
+        while True:
+            out_size, out_data = self._channel.read()
+            err_size, err_data = self._channel.read_stderr()
+            if err_size > 0:
+                stderr.append(err_data)
+            if out_size > 0:
+                stdout.append(out_data)
+                tail = (tail + out_data)[-len(PROMPT) :]
+                if tail == PROMPT:
+                    output = b''.join(stdout)[: -len(PROMPT)]
+                    return output.decode(), b''.join(stderr).decode()
+            elif err_size <= 0:
+                if self._channel.eof():
+                    raise HammerShellError('hammer shell exited')
+                if time.monotonic() > deadline:
+                    raise HammerShellError(f'No hammer shell prompt after {timeout} seconds')
+                time.sleep(POLL_INTERVAL)
+
+    def run(self, line, timeout=None):
+        """Run the hammer command ``line`` and return its result"""
+        with self._lock:
+            self._channel.write(f'{line}\n')
+            stdout, stderr = self._read_until_prompt(timeout or self.timeout)
+        return Result(stdout=stdout, stderr=stderr, status=0)
+
+    def close(self):
+        with suppress(Exception):
+            self._channel.close()
+        with suppress(Exception):
+            self.client.close()
+
+
+def _get_shell(hostname, user, password, locale, timeout):
+    """Return the shell opened for ``hostname`` and credentials, opening it when needed"""
+    from robottelo.ssh import get_client
+
+    global _shells_pid
+    key = (hostname, user, password)
+    with _shells_lock:
+        # a forked process must not reuse the channels of its parent
+        if _shells_pid != os.getpid():
+            _shells.clear()
+            _unsupported.clear()
+            _opening_locks.clear()
+            _shells_pid = os.getpid()
+        if key in _unsupported:
+            return None
+        if key in _shells:
+            return _shells[key]
+        opening_lock = _opening_locks.setdefault(key, threading.Lock())
+    with opening_lock:
+        with _shells_lock:
+            # opened, or failed to, while waiting
+            if key in _unsupported:
+                return None
+            if key in _shells:
+                return _shells[key]
+        credentials = f'-u {user}' if user else '--interactive no'
+        if password:
+            credentials += f' -p {password}'
+        try:
+            shell = HammerShell(
+                get_client(hostname=hostname), credentials, locale=locale, timeout=timeout
+            )
+        except Exception as err:
+            logger.warning(f'Unable to open a hammer shell on {hostname}: {err!r}')
+            with _shells_lock:
+                _unsupported.add(key)
+            return None
+        with _shells_lock:
+            _shells[key] = shell
+        return shell
+
+
+def _drop_shell(hostname, user, password):
+    with _shells_lock:
+        shell = _shells.pop((hostname, user, password), None)
+    if shell:
+        shell.close()
+
+
+def execute(hostname, user, password, line, locale='en_US.UTF-8', timeout=600):
+    """Run the hammer command ``line`` in the persistent shell of ``hostname``
+
+    :return: a result object, or None when the caller has to fall back to a
+        plain hammer exec.
+    """
+    with telemetry.phase('ssh_latency'):
+        shell = _get_shell(hostname, user, password, locale, timeout)
+    if shell is None:
+        return None
+    try:
+        with telemetry.phase('runtime'):
+            result = shell.run(line, timeout)
+    except Exception as err:
+        logger.warning(f'hammer shell on {hostname} failed, falling back to exec: {err!r}')
+        _drop_shell(hostname, user, password)
+        return None
+    if result.stderr:
+        # the command status is unknown, let the exec path report it
+        return None
+    return result
+
+
+def close_all():
+    """Close all the hammer shells opened by this process"""
+    with _shells_lock:
+        shells = list(_shells.values())
+        _shells.clear()
+    for shell in shells:
+        shell.close()
@@ -0,0 +1,60 @@
+"""Registry of the robottelo CLI classes, bound lazily to the hosts using them."""
+
+from functools import cache
+import importlib
+from pathlib import Path
+
+from robottelo.cli.base import Base
+
+
+@cache
+def cli_classes(prefix=''):
+    """Return the :class:`Base` subclasses of the robottelo CLI modules starting with ``prefix``
+
+    The modules are imported once per process, every following call is a dict
+    lookup.
+    """
+    classes = {}
+    for path in sorted(Path(__file__).parent.glob(f'{prefix}*.py')):
+        if path.name.startswith('_'):
+            continue
+        cli_module = importlib.import_module(f'robottelo.cli.{path.stem}')
+        for name, obj in vars(cli_module).items():
+            if isinstance(obj, type) and issubclass(obj, Base):
+                # prefer the module defining the class over the modules importing it
+                if name not in classes or obj.__module__ == cli_module.__name__:
+                    classes[name] = obj
+    return classes
+
+
+class CLINamespace:
+    """The CLI classes of one host, each subclassed with the host attributes on first access
+
+    :param prefix: only expose the classes of the CLI modules starting with it.
+    :param attributes: class attributes set on each host class, like ``hostname``.
+    """
+
+    def __init__(self, prefix='', **attributes):
+        self._prefix = prefix
+        self._attributes = attributes
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            cli_cls = cli_classes(self._prefix)[name]
+        except KeyError:
+            raise AttributeError(f'{name!r} is not a robottelo CLI class') from None
+        # cache the class in the instance, the next lookups do not reach __getattr__
+        return vars(self).setdefault(name, type(name, (cli_cls,), dict(self._attributes)))
+
+    def __dir__(self):
+        return sorted(cli_classes(self._prefix))
+
+    def set_attributes(self, **attributes):
+        """Set class attributes on the host classes, the ones already created included"""
+        self._attributes.update(attributes)
+        for obj in vars(self).values():
+            if isinstance(obj, type):
+                for name, value in attributes.items():
+                    setattr(obj, name, value)
@@ -0,0 +1,188 @@
+"""Serve read-only hammer helpers straight from the Satellite REST API.
+
+The hammer subcommand is mapped to an apidoc resource action (``list`` to
+``index``, ``info`` to ``show``), the hammer options are translated to API
+parameters and the JSON response is reshaped into the fields hammer prints,
+listed for every resource action in :data:`FIELDS`, normalized the way the
+hammer output parsers do. Whenever a call can not be mapped, the resource
+action having no fields listed included, ``None`` is returned and the caller
+goes through hammer as usual.
+"""
+
+from datetime import datetime
+import threading
+
+import apypie
+from requests.exceptions import HTTPError
+
+from robottelo.cli import hammer
+from robottelo.exceptions import CLIReturnCodeError
+
+SUBCOMMAND_ACTIONS = {'info': 'show', 'list': 'index'}
+
+
+def _names(key='name'):
+    """Return a formatter of a list of API objects as the list of their ``key``"""
+    return lambda values: [value[key] for value in values]
+
+
+def _enabled(value):
+    return 'Enabled' if value else 'Disabled'
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S %Z').strftime('%Y/%m/%d %H:%M:%S')
+
+
+def _subnets(values):
+    return [f"{value['name']} ({value['network_address']})" for value in values]
+
+
+def _parameters(values):
+    return {value['name']: value['value'] for value in values}
+
+
+# the fields hammer prints, by apidoc resource and action: the hammer field name,
+# the API key of its value and the function formatting it as hammer does
+FIELDS = {
+    'organizations': {
+        'index': (
+            ('Id', 'id', None),
+            ('Title', 'title', None),
+            ('Name', 'name', None),
+            ('Description', 'description', None),
+            ('Label', 'label', None),
+        ),
+        'show': (
+            ('Id', 'id', None),
+            ('Title', 'title', None),
+            ('Name', 'name', None),
+            ('Description', 'description', None),
+            ('Label', 'label', None),
+            ('Simple Content Access', 'simple_content_access', _enabled),
+            ('Service Levels', 'service_levels', None),
+            ('Users', 'users', _names('login')),
+            ('Smart proxies', 'smart_proxies', _names()),
+            ('Subnets', 'subnets', _subnets),
+            ('Compute resources', 'compute_resources', _names()),
+            ('Installation media', 'media', _names()),
+            ('Templates', 'provisioning_templates', _names()),
+            ('Partition tables', 'ptables', _names()),
+            ('Domains', 'domains', _names()),
+            ('Realms', 'realms', _names()),
+            ('Environments', 'environments', _names()),
+            ('Hostgroups', 'hostgroups', _names('title')),
+            ('Parameters', 'parameters', _parameters),
+            ('Locations', 'locations', _names('title')),
+            ('Created', 'created_at', _date),
+            ('Updated', 'updated_at', _date),
+        ),
+    },
+}
+
+_apis = {}
+_apis_lock = threading.Lock()
+
+
+def get_api(hostname, username, password):
+    """Return the ``apypie.Api`` of ``hostname``, created once per process and credentials"""
+    from robottelo.config import settings
+
+    key = (hostname, username, password)
+    with _apis_lock:
+        if key not in _apis:
+            _apis[key] = apypie.Api(
+                uri=f'https://{hostname}',
+                username=username,
+                password=password,
+                api_version=2,
+                verify_ssl=settings.server.verify_ca,
+            )
+        return _apis[key]
+
+
+def resource_name(cli_cls):
+    """Return the apidoc resource name of a hammer command class
+
+    Classes can set ``rest_resource`` when the name is not the plural of their
+    ``command_base``.
+    """
+    if cli_cls.rest_resource:
+        return cli_cls.rest_resource
+    name = cli_cls.command_base.replace('-', '_')
+    if name.endswith('y'):
+        return f'{name[:-1]}ies'
+    if name.endswith('s'):
+        return f'{name}es'
+    return f'{name}s'
+
+
+def _params(action, options):
+    """Translate hammer ``options`` to the API parameters of ``action``
+
+    :return: the parameters, or None when an option has no API counterpart.
+    """
+    known = {param.name for param in action.params}
+    params = {}
+    for key, value in options.items():
+        if value is None or value is False:
+            continue
+        name = key.replace('-', '_')
+        if name not in known:
+            return None
+        if isinstance(value, str):
+            # undo the shell escaping used to build hammer search queries
+            value = value.replace('\\"', '"')
+        params[name] = value
+    return params
+
+
+def call(cli_cls, subcommand, options, hostname, username, password):
+    """Run the hammer ``subcommand`` of ``cli_cls`` through the REST API
+
+    :return: the normalized result, or None when the call can not be mapped.
+    :raises robottelo.exceptions.CLIReturnCodeError: If the API call fails.
+    """
+    action_name = SUBCOMMAND_ACTIONS.get(subcommand)
+    if action_name is None or not cli_cls.command_base:
+        return None
+    name = resource_name(cli_cls)
+    if action_name not in FIELDS.get(name, {}):
+        return None
+    api = get_api(hostname, username, password)
+    if name not in api.resources:
+        return None
+    resource = api.resource(name)
+    if action_name not in resource.actions:
+        return None
+    params = _params(resource.action(action_name), options)
+    if params is None or (action_name == 'show' and 'id' not in params):
+        return None
+    try:
+        response = resource.call(action_name, params)
+    except HTTPError as err:
+        msg = (
+            f'Command "{cli_cls.command_base} {subcommand}" '
+            f'finished with status {err.response.status_code}\n'
+            f'stderr contains:\n{err.response.text}'
+        )
+        raise CLIReturnCodeError(err.response.status_code, err.response.text, msg) from err
+    if action_name == 'index':
+        return [hammer_fields(name, action_name, result) for result in response['results']]
+    return hammer_fields(name, action_name, response)
+
+
+def hammer_fields(name, action_name, result):
+    """Return the fields hammer prints for the API ``result`` of a resource action
+
+    The empty values are returned as the hammer parsers return them, ``{}`` for
+    ``info`` and ``''`` for the CSV of ``list``.
+    """
+    empty = {} if action_name == 'show' else ''
+    fields = {}
+    for field, key, formatter in FIELDS[name][action_name]:
+        value = result.get(key)
+        if value not in (None, '', [], {}) and formatter is not None:
+            value = formatter(value)
+        fields[field] = empty if value in (None, '', [], {}) else value
+    return hammer._normalize_obj(fields)
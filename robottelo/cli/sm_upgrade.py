@@ -15,6 +15,8 @@ Options:
 """
 
 from robottelo.cli.base import Base
+from robottelo.config import settings
+from robottelo.utils import host_facts
 
 
 class Upgrade(Base):
@@ -34,4 +36,7 @@ class Upgrade(Base):
         """Build satellite-maintain upgrade run"""
         cls.command_sub = 'run'
         options = options or {}
-        return cls.sm_execute(cls._construct_command(options), env_var=env_var)
+        result = cls.sm_execute(cls._construct_command(options), env_var=env_var)
+        # the upgrade changes the versions probed on the host
+        host_facts.invalidate(cls.hostname or settings.server.hostname)
+        return result
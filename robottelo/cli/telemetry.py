@@ -0,0 +1,193 @@
+"""Structured timing telemetry of the hammer commands.
+
+Every :meth:`robottelo.cli.base.Base.execute` call run while a sink is set
+produces one :class:`HammerCallRecord`. The ssh and hammer shell layers add
+the time spent in each phase of the call to the record of the current thread:
+
+* ``ssh_latency``: time to get an authenticated ssh session (zero for pooled
+  sessions that are reused),
+* ``runtime``: time from sending the command to receiving its exit status,
+* ``parse_time``: time to parse the csv or json output, and the info output
+  when it is parsed inside :func:`extended`.
+
+A sink is any object with an ``emit(record)`` method, see :class:`JSONLSink`.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import threading
+import time
+
+_current = threading.local()
+_sink = None
+
+
+@dataclass
+class HammerCallRecord:
+    """Timings and outcome of one hammer command"""
+
+    command_base: str
+    command_sub: str
+    hostname: str
+    backend: str = 'ssh'
+    worker: str = field(default_factory=lambda: os.environ.get('PYTEST_XDIST_WORKER', 'master'))
+    started: float = field(default_factory=time.time)
+    ssh_latency: float = 0.0
+    runtime: float = 0.0
+    parse_time: float = 0.0
+    stdout_bytes: int = 0
+    status: int | None = None
+    error: str | None = None
+
+    @property
+    def command(self):
+        return f'{self.command_base} {self.command_sub}'
+
+
+class JSONLSink:
+    """Append every record as a JSON line to ``path``"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = self.path.open('a')
+
+    def emit(self, record):
+        line = json.dumps(asdict(record))
+        with self._lock:
+            self._file.write(f'{line}\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def set_sink(sink):
+    """Send the records of the next hammer calls to ``sink``, None disables the telemetry"""
+    global _sink
+    _sink = sink
+
+
+def get_sink():
+    return _sink
+
+
+def current():
+    """Return the record of the hammer call running in this thread, if any"""
+    return getattr(_current, 'record', None)
+
+
+@contextmanager
+def hammer_call(command_base, command_sub, hostname, backend='ssh'):
+    """Record the hammer call run inside the context, yield None when no sink is set"""
+    sink = _sink
+    if sink is None:
+        yield None
+        return
+    record = HammerCallRecord(command_base, command_sub, hostname, backend=backend)
+    _current.record = record
+    try:
+        yield record
+    except Exception as err:
+        record.error = type(err).__name__
+        raise
+    finally:
+        if not getattr(_current, 'extended', False):
+            _current.record = None
+            sink.emit(record)
+
+
+@contextmanager
+def extended():
+    """Keep the record of the hammer call run inside the context current until it exits
+
+    The caller can then add the time it spends parsing the output to the record,
+    which is emitted when the context exits.
+    """
+    sink = _sink
+    if sink is None or getattr(_current, 'extended', False):
+        yield
+        return
+    _current.extended = True
+    try:
+        yield
+    except Exception as err:
+        if (record := current()) is not None and record.error is None:
+            record.error = type(err).__name__
+        raise
+    finally:
+        _current.extended = False
+        record = current()
+        _current.record = None
+        if record is not None:
+            sink.emit(record)
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent inside the context to the ``name`` timing of the current record"""
+    record = current()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(record, name, getattr(record, name) + time.perf_counter() - start)
+
+
+def observe_result(result):
+    """Store the status and stdout size of the ssh ``result`` in the current record"""
+    record = current()
+    if record is None:
+        return
+    record.status = result.status
+    stdout = result.stdout
+    if isinstance(stdout, str):
+        stdout = stdout.encode()
+    record.stdout_bytes = len(stdout or b'')
+
+
+def load(directory):
+    """Read the records written by the JSONL sinks of all workers in ``directory``"""
+    records = []
+    for path in sorted(Path(directory).glob('*.jsonl')):
+        with path.open() as jsonl:
+            records.extend(HammerCallRecord(**json.loads(line)) for line in jsonl if line.strip())
+    return records
+
+
+def summarize(records, top=10):
+    """Return the report lines of the slowest and most frequent hammer commands"""
+    per_command = defaultdict(list)
+    for record in records:
+        per_command[record.command].append(record)
+    total = sum(r.ssh_latency + r.runtime + r.parse_time for r in records)
+    lines = [
+        f'{len(records)} hammer calls, {total:.1f}s in total '
+        f'({sum(r.ssh_latency for r in records):.1f}s ssh latency, '
+        f'{sum(r.parse_time for r in records):.1f}s parsing), '
+        f'{sum(1 for r in records if r.status != 0)} failed'
+    ]
+    lines.append(f'Slowest hammer calls (top {top}):')
+    slowest = sorted(records, key=lambda r: r.runtime, reverse=True)[:top]
+    lines.extend(
+        f'  {r.runtime:8.2f}s  {r.command} on {r.hostname} ({r.worker}, status {r.status})'
+        for r in slowest
+    )
+    lines.append(f'Most frequent hammer commands (top {top}):')
+    frequent = sorted(per_command.items(), key=lambda item: len(item[1]), reverse=True)[:top]
+    for command, calls in frequent:
+        runtime = sum(r.runtime for r in calls)
+        lines.append(
+            f'  {len(calls):6d} calls  {runtime:8.2f}s total  '
+            f'{runtime / len(calls):6.2f}s avg  {command}'
+        )
+    return lines
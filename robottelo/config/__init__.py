@@ -1,4 +1,8 @@
 import builtins
+from contextlib import suppress
+import hashlib
+from importlib.metadata import version
+import json
 import logging
 import os
 from pathlib import Path
@@ -6,7 +10,6 @@ from urllib.parse import urlunsplit
 
 from dynaconf import LazySettings
 from dynaconf.validator import ValidationError
-from nailgun.config import ServerConfig
 
 from robottelo.config.validators import VALIDATORS
 from robottelo.logging import logger, robottelo_root_dir
@@ -15,16 +18,119 @@ if not os.getenv('ROBOTTELO_DIR'):
     # dynaconf robottelo file uses ROBOTELLO_DIR for screenshots
     os.environ['ROBOTTELO_DIR'] = str(robottelo_root_dir)
 
+SETTINGS_SNAPSHOT_DIR = robottelo_root_dir.joinpath('.settings_snapshot')
+# Everything the validated settings are built from, relative to the robottelo root dir
+SETTINGS_SOURCES = [
+    'settings.yaml',
+    'conf/*.yaml',
+    'settings.local.yaml',
+    '.secrets.yaml',
+    '.secrets_*.yaml',
+    '.env',
+    'conf/dynaconf_hooks.py',
+    'conf/migrations.py',
+    'robottelo/config/validators.py',
+]
+
+
+def settings_snapshot_key():
+    """Return the hash of everything the settings are built from
+
+    That is the dynaconf version, the settings sources, the settings cache files
+    of the dynaconf hook and the environment variables read by dynaconf.
+    """
+    digest = hashlib.sha256(version('dynaconf').encode())
+    paths = [path for pattern in SETTINGS_SOURCES for path in robottelo_root_dir.glob(pattern)]
+    paths += Path().glob('settings_cache-*.json')
+    for path in sorted(set(paths)):
+        digest.update(str(path).encode())
+        digest.update(path.read_bytes())
+    for name, value in sorted(os.environ.items()):
+        if name.startswith('ROBOTTELO_') or name.endswith('_FOR_DYNACONF'):
+            digest.update(f'{name}={value}'.encode())
+    return digest.hexdigest()
+
+
+def _snapshot_value(value):
+    """Serialize the lazy values of the settings back to their dynaconf notation"""
+    from dynaconf.utils.parse_conf import Lazy
+
+    if isinstance(value, Lazy) and value.casting is None:
+        return f'@{value.formatter.token} {value.value}'
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def load_settings_snapshot(key):
+    """Return the settings stored in the snapshot ``key``, or None if there is none
+
+    The snapshot holds settings which were already validated, so neither the
+    settings files nor the dynaconf hooks are loaded, and the validators are
+    registered but not run.
+    """
+    path = SETTINGS_SNAPSHOT_DIR.joinpath(f'{key}.json')
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    settings = LazySettings(
+        envvar_prefix="ROBOTTELO",
+        core_loaders=[],
+        root_path=str(robottelo_root_dir),
+        envless_mode=True,
+        lowercase_read=True,
+        load_dotenv=False,
+    )
+    settings.update(data)
+    settings.validators.register(**VALIDATORS)
+    logger.debug(f'Loaded settings from snapshot {path}')
+    return settings
+
+
+def save_settings_snapshot(settings, key):
+    """Store the validated ``settings`` as the snapshot ``key``, when enabled
+
+    Settings fetched fresh on every load and settings read from vault are never stored.
+    """
+    fetched_fresh = settings.robottelo.settings.get('get_fresh', True) and (
+        settings.server.version.get('source') != 'nightly'
+    )
+    vault_enabled = os.environ.get('VAULT_ENABLED_FOR_DYNACONF', '').lower() in ('1', 'true')
+    if not settings.robottelo.settings.get('snapshot') or fetched_fresh or vault_enabled:
+        return
+    try:
+        text = json.dumps(settings.as_dict(), default=_snapshot_value)
+    except TypeError as err:
+        logger.debug(f'Settings snapshot not stored: {err}')
+        return
+    path = SETTINGS_SNAPSHOT_DIR.joinpath(f'{key}.json')
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with suppress(OSError):
+        SETTINGS_SNAPSHOT_DIR.mkdir(mode=0o700, exist_ok=True)
+        # the snapshot holds the credentials of the settings
+        tmp_path.touch(mode=0o600)
+        tmp_path.write_text(text)
+        tmp_path.replace(path)
+        for stale in SETTINGS_SNAPSHOT_DIR.glob('*.json'):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        logger.debug(f'Stored settings snapshot {path}')
+
 
 def get_settings():
     """Return Lazy settings object after validating
 
+    The validated settings are reused from a snapshot when ``robottelo.settings.snapshot``
+    is enabled and none of their sources changed since it was stored.
+
     :return: A validated Lazy settings object
     """
     try:
         if builtins.__sphinx_build__:
             settings = None
     except AttributeError:
+        snapshot_key = settings_snapshot_key()
+        if (settings := load_settings_snapshot(snapshot_key)) is not None:
+            return settings
         settings = LazySettings(
             envvar_prefix="ROBOTTELO",
             core_loaders=["YAML"],
@@ -44,6 +150,7 @@ def get_settings():
                 logger.warning(f'Dynaconf validation failed with\n{err}')
             else:
                 raise err
+        save_settings_snapshot(settings, snapshot_key)
         return settings
 
 
@@ -96,6 +203,8 @@ def admin_nailgun_config():
     :return: ``nailgun.config.ServerConfig`` object, populated from admin user credentials.
 
     """
+    from nailgun.config import ServerConfig
+
     return ServerConfig(get_url(), get_credentials(), verify=settings.server.verify_ca)
 
 
@@ -109,6 +218,8 @@ def user_nailgun_config(username=None, password=None):
         with values from ``robottelo.config.settings``
 
     """
+    from nailgun.config import ServerConfig
+
     creds = (username, password)
     return ServerConfig(get_url(), creds, verify=settings.server.verify_ca)
 
@@ -135,6 +246,9 @@ def setting_is_set(option):
     return isinstance(opt_inst, DynaBox)
 
 
+_configured = set()
+
+
 def configure_nailgun():
     """Configure NailGun's entity classes.
 
@@ -156,6 +270,8 @@ def configure_nailgun():
     entity_mixins.DEFAULT_SERVER_CONFIG = ServerConfig(
         get_url(), get_credentials(), verify=settings.server.verify_ca
     )
+    if 'nailgun' in _configured:
+        return
     gpgkey_init = entities.GPGKey.__init__
 
     def patched_gpgkey_init(self, server_config=None, **kwargs):
@@ -166,9 +282,7 @@ def configure_nailgun():
         )
 
     entities.GPGKey.__init__ = patched_gpgkey_init
-
-
-configure_nailgun()
+    _configured.add('nailgun')
 
 
 def configure_airgun():
@@ -195,6 +309,15 @@ def configure_airgun():
             'webkaifuku': {'config': settings.ui.webkaifuku},
         }
     )
+    _configured.add('airgun')
+
 
+def ensure_configured(*libraries):
+    """Configure the given libraries, ``nailgun`` and ``airgun``, unless already done
 
-configure_airgun()
+    They are configured on first use rather than when importing this module.
+    """
+    configure = {'nailgun': configure_nailgun, 'airgun': configure_airgun}
+    for library in libraries:
+        if library not in _configured:
+            configure[library]()
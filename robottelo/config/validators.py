@@ -16,7 +16,9 @@ VALIDATORS = dict(
         Validator('server.version.source', default='internal', is_in=['internal', 'ga', 'nightly']),
         Validator('server.version.rhel_version', must_exist=True, cast=str),
         Validator(
-            'server.xdist_behavior', must_exist=True, is_in=['run-on-one', 'balance', 'on-demand']
+            'server.xdist_behavior',
+            must_exist=True,
+            is_in=['run-on-one', 'balance', 'on-demand', 'least-loaded'],
         ),
         Validator('server.auto_checkin', default=False, is_type_of=bool),
         (
@@ -246,7 +248,29 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.hammer_telemetry.enabled', is_type_of=bool, default=False),
+        Validator('performance.hammer_telemetry.directory', default=None),
+        Validator('performance.hammer_telemetry.summary_size', gte=1, default=10),
+        Validator('performance.ssh_pool.enabled', is_type_of=bool, default=True),
+        Validator('performance.ssh_pool.max_channels', gte=1, default=4),
+        Validator('performance.ssh_pool.idle_timeout', gte=0, default=300),
+        Validator('performance.hammer_shell.enabled', is_type_of=bool, default=False),
+        Validator('performance.hammer_shell.timeout', gt=0, default=600),
+        Validator('performance.rest_bypass', is_type_of=bool, default=False),
+        Validator('performance.hammer_concurrency', gte=1, default=4),
+        Validator('performance.http_pool.enabled', is_type_of=bool, default=True),
+        Validator('performance.http_pool.maxsize', gte=1, default=10),
+        Validator('performance.host_facts.enabled', is_type_of=bool, default=True),
+        Validator('performance.read_cache.enabled', is_type_of=bool, default=False),
+        Validator('performance.read_cache.ttl', gt=0, default=60),
+        Validator('performance.read_cache.maxsize', gte=1, default=256),
+        Validator('performance.host_pool.enabled', is_type_of=bool, default=False),
+        Validator('performance.host_pool.size', gte=1, default=2),
+        Validator('performance.host_pool.max_reuse', gte=1, default=5),
+        Validator('performance.factory_lookahead.enabled', is_type_of=bool, default=False),
+        Validator('performance.factory_lookahead.max_ahead', gte=1, default=1),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -322,7 +346,9 @@ VALIDATORS = dict(
     ],
     robottelo=[
         Validator('robottelo.settings.ignore_validation_errors', is_type_of=bool, default=False),
+        Validator('robottelo.settings.snapshot', is_type_of=bool, default=False),
         Validator('robottelo.rhel_source', default='ga', is_in=['ga', 'internal']),
+        Validator('robottelo.lock_storage', default='file', is_in=['file', 'sqlite']),
         Validator(
             'robottelo.sat_non_ga_versions',
             is_type_of=list,
@@ -331,15 +357,18 @@ VALIDATORS = dict(
         ),
     ],
     shared_function=[
-        Validator('shared_function.storage', is_in=('file', 'redis'), default='file'),
+        Validator('shared_function.storage', is_in=('file', 'redis', 'sqlite'), default='file'),
         Validator('shared_function.share_timeout', lte=86400, default=86400),
         Validator('shared_function.scope', default=None),
         Validator('shared_function.enabled', default=False),
         Validator('shared_function.lock_timeout', default=7200),
+        Validator('shared_function.gc_interval', gte=0, default=600),
+        Validator('shared_function.max_key_files', gte=1, default=1000),
         Validator('shared_function.redis_host', default='localhost'),
         Validator('shared_function.redis_port', default=6379),
         Validator('shared_function.redis_db', default=0),
         Validator('shared_function.call_retries', default=2),
+        Validator('shared_function.satellite_scope_ttl', gte=0, default=60),
         Validator('shared_function.redis_password', default=None),
     ],
     upgrade=[
@@ -18,6 +18,7 @@ from robottelo.constants import (
     REPO_TYPE,
 )
 from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+from robottelo.host_helpers.task_waiter import TaskWaiter
 
 
 class APIFactory:
@@ -394,11 +395,10 @@ class APIFactory:
         :param int from_when: Epoch Time (seconds in UTC) to limit number of returned tasks to investigate.
         :param int search_rate: Delay between searches.
         :param int max_tries: How many times search should be executed.
-        :param int poll_rate: Delay between the end of one task check-up and
-                the start of the next check-up. Parameter for
-                ``nailgun.entities.ForemanTask.poll()`` method.
+        :param int poll_rate: Initial delay between two check-ups of the tasks.
+                Parameter for :class:`robottelo.host_helpers.task_waiter.TaskWaiter`.
         :param int poll_timeout: Maximum number of seconds to wait until timing out.
-                Parameter for ``nailgun.entities.ForemanTask.poll()`` method.
+                Parameter for :class:`robottelo.host_helpers.task_waiter.TaskWaiter`.
         :return: Relevant errata applicability task.
         :raises: ``AssertionError``. If not tasks were found for given host until timeout.
         """
@@ -420,20 +420,24 @@ class APIFactory:
                 f' started_at >= "{long_format}" '
             )
             tasks = self._satellite.api.ForemanTask().search(query={'search': search_query})
-            tasks_finished = 0
-            for task in tasks:
+            host_tasks = [
+                task
+                for task in tasks
                 if (
                     task.label == 'Actions::Katello::Applicability::Hosts::BulkGenerate'
                     and 'host_ids' in task.input
                     and host_id in task.input['host_ids']
-                ) or (
+                )
+                or (
                     task.label == 'Actions::Katello::Host::UploadPackageProfile'
                     and 'host' in task.input
                     and host_id == task.input['host']['id']
-                ):
-                    task.poll(poll_rate=poll_rate, timeout=poll_timeout)
-                    tasks_finished += 1
-            if tasks_finished > 0:
+                )
+            ]
+            if host_tasks:
+                TaskWaiter(
+                    self._satellite, host_tasks, poll_rate=poll_rate, timeout=poll_timeout
+                ).wait()
                 break
             time.sleep(search_rate)
         else:
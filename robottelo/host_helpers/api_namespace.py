@@ -0,0 +1,120 @@
+"""Lazy namespace of the nailgun entities of a Satellite, and the HTTP sessions they share.
+
+nailgun sends every request with the module level functions of ``requests``,
+opening a new connection, and TLS handshake, per API call. When
+:func:`install_session_router` was called, the requests of ``nailgun.client``
+go through one keep-alive ``requests.Session`` per host instead.
+"""
+
+import functools
+from http import cookiejar
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_sessions_pid = os.getpid()
+
+
+class _NoCookiesPolicy(cookiejar.DefaultCookiePolicy):
+    """Do not keep the cookies set by the server, so requests are authenticated one by one"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+def get_session(url):
+    """Return the keep-alive session of the host of ``url``, created once per process"""
+    from robottelo.config import settings
+
+    global _sessions_pid
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        # a forked process must not reuse the connections of its parent
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        if key not in _sessions:
+            session = requests.Session()
+            session.cookies.set_policy(_NoCookiesPolicy())
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=settings.performance.http_pool.maxsize
+            )
+            session.mount(f'{parts.scheme}://', adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+class SessionRouter:
+    """Stand-in for the ``requests`` module sending each request through its host session"""
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def request(self, method, url, **kwargs):
+        return get_session(url).request(method, url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('get', url, params=params, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('head', url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request('post', url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request('put', url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request('patch', url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('delete', url, **kwargs)
+
+
+def install_session_router():
+    """Send the requests of ``nailgun.client`` through the per-host sessions"""
+    from nailgun import client
+
+    if not isinstance(client.requests, SessionRouter):
+        client.requests = SessionRouter()
+
+
+class APINamespace:
+    """The nailgun entities of one Satellite, subclassed with its server config on first access"""
+
+    def __init__(self, server_config):
+        self._server_config = server_config
+
+    @staticmethod
+    def _entities():
+        from nailgun import entities
+        from nailgun.entity_mixins import Entity
+
+        return {
+            name: obj
+            for name, obj in vars(entities).items()
+            if isinstance(obj, type) and issubclass(obj, Entity)
+        }
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        entity = self._entities().get(name)
+        if entity is None:
+            raise AttributeError(f'{name!r} is not a nailgun entity')
+        # inject our server config into the __init__ of a copy of the entity class
+        init = functools.partialmethod(entity.__init__, server_config=self._server_config)
+        new_cls = type(name, (entity,), {'__init__': init})
+        # cache the class in the instance, the next lookups do not reach __getattr__
+        return vars(self).setdefault(name, new_cls)
+
+    def __dir__(self):
+        return sorted(self._entities())
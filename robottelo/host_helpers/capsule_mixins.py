@@ -1,18 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import time
 
 from box import Box
 from dateutil.parser import parse
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
 
 from robottelo.constants import (
     PULP_ARTIFACT_DIR,
     PUPPET_CAPSULE_INSTALLER,
     PUPPET_COMMON_INSTALLER_OPTS,
 )
+from robottelo.host_helpers.task_waiter import TaskWaiter
 from robottelo.logging import logger
 from robottelo.utils.installer import InstallerCommand
 
 
+@dataclass
+class CapsuleSyncResult:
+    """The outcome and the timing of a capsule sync, see :meth:`CapsuleInfo.get_sync_result`
+
+    ``start_time`` and ``end_time`` are the UTC times the sync is verified against and the
+    capsule's last sync time, ``waited`` the seconds spent waiting for the sync.
+    """
+
+    hostname: str
+    start_time: str
+    end_time: str | None = None
+    waited: float | None = None
+    task_ids: list = field(default_factory=list)
+    failures: list = field(default_factory=list)
+    tasks: list = field(default_factory=list, repr=False)
+
+    @property
+    def succeeded(self):
+        return not self.failures
+
+    @property
+    def duration(self):
+        """Seconds from the start time to the capsule's last sync time, None if unknown"""
+        if self.end_time is None:
+            return None
+        return (parse(self.end_time) - parse(self.start_time)).total_seconds()
+
+    def finish(self, waited_from, tasks=()):
+        self.waited = time.monotonic() - waited_from
+        self.tasks = list(tasks)
+        return self
+
+    def as_record(self):
+        """Return the result as a JSON serializable dict, e.g. for a benchmark record"""
+        return {
+            'hostname': self.hostname,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'duration': self.duration,
+            'waited': self.waited,
+            'task_ids': self.task_ids,
+            'failures': self.failures,
+        }
+
+
+def wait_for_sync_many(capsules, start_time=None, timeout=600, must_succeed=True):
+    """Wait for the sync of several capsules at once.
+
+    Every capsule is verified like :meth:`CapsuleInfo.wait_for_sync` does, all of
+    them concurrently, so the total wait is the one of the slowest capsule.
+
+    :param capsules: the capsules to wait for.
+    :param start_time: (datetime): UTC time to compare against capsules' last_sync_time.
+        Default: None (current UTC).
+    :param timeout: (int) maximum seconds for active task(s) and queries to finish.
+    :param must_succeed: assert all the capsule syncs succeeded.
+    :return: dict of :class:`CapsuleSyncResult` by capsule hostname.
+    :raises: ``AssertionError``: If ``must_succeed`` and any capsule sync verification fails.
+    """
+    if start_time is None:
+        start_time = datetime.utcnow().replace(microsecond=0)
+    if not capsules:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(capsules), thread_name_prefix='sync') as executor:
+        futures = [
+            executor.submit(capsule.get_sync_result, start_time=start_time, timeout=timeout)
+            for capsule in capsules
+        ]
+        results = {
+            capsule.hostname: future.result()
+            for capsule, future in zip(capsules, futures, strict=True)
+        }
+    if must_succeed:
+        failures = [failure for result in results.values() for failure in result.failures]
+        assert not failures, '\n'.join(failures)
+    return results
+
+
 class EnablePluginsCapsule:
     """Miscellaneous settings helper methods"""
 
@@ -48,10 +130,10 @@ class CapsuleInfo:
         :param search_query: Search query that will be passed to API call.
         :param search_rate: Delay between searches.
         :param max_tries: How many times search should be executed.
-        :param poll_rate: Delay between the end of one task check-up and
-            the start of the next check-up. Parameter for ``sat.api.ForemanTask.poll()`` method.
+        :param poll_rate: Initial delay between two check-ups of the tasks.
+            Parameter for :class:`robottelo.host_helpers.task_waiter.TaskWaiter`.
         :param poll_timeout: Maximum number of seconds to wait until timing out.
-            Parameter for ``sat.api.ForemanTask.poll()`` method.
+            Parameter for :class:`robottelo.host_helpers.task_waiter.TaskWaiter`.
         :param must_succeed: Assert success result on finished task.
         :return: List of ``sat.api.ForemanTask`` entities.
         :raises: ``AssertionError``. If not tasks were found until timeout.
@@ -59,13 +141,13 @@ class CapsuleInfo:
         for _ in range(max_tries):
             tasks = self.satellite.api.ForemanTask().search(query={'search': search_query})
             if tasks:
-                for task in tasks:
-                    task.poll(poll_rate=poll_rate, timeout=poll_timeout, must_succeed=must_succeed)
-                break
+                waiter = TaskWaiter(
+                    self.satellite, tasks, poll_rate=poll_rate, timeout=poll_timeout
+                )
+                waiter.wait(must_succeed=must_succeed)
+                return waiter.tasks
             time.sleep(search_rate)
-        else:
-            raise AssertionError(f"No task was found using query '{search_query}'")
-        return tasks
+        raise AssertionError(f"No task was found using query '{search_query}'")
 
     def wait_for_sync(self, start_time=None, timeout=600):
         """Wait for capsule sync to finish and assert success.
@@ -83,10 +165,28 @@ class CapsuleInfo:
         :param timeout: (int) maximum seconds for active task(s) and queries to finish.
 
         :return:
-            list of polled finished tasks that were in-progress from `active_sync_tasks`.
+            list of polled finished ``ForemanTask`` entities that were in-progress
+            from `active_sync_tasks`.
+        """
+        result = self.get_sync_result(start_time=start_time, timeout=timeout)
+        assert result.succeeded, '\n'.join(result.failures)
+        # return any polled sync tasks, that were initially in-progress
+        return result.tasks
+
+    def get_sync_result(self, start_time=None, timeout=600):
+        """Wait for capsule sync to finish and return its outcome.
+        Same verifications as :meth:`wait_for_sync`, the ones failing are
+        recorded in the result instead of being asserted.
+
+        :param start_time: (datetime): UTC time to compare against capsule's last_sync_time.
+            Default: None (current UTC).
+        :param timeout: (int) maximum seconds for active task(s) and queries to finish.
+
+        :return: :class:`CapsuleSyncResult`
         """
         # Fetch initial capsule sync status
         logger.info(f"Waiting for capsule {self.hostname} sync to finish ...")
+        waited_from = time.monotonic()
         sync_status = self.nailgun_capsule.content_get_sync(timeout=timeout, synchronous=True)
         # Current UTC time for start_time, if not provided
         if start_time is None:
@@ -97,49 +197,71 @@ class CapsuleInfo:
             .replace(microsecond=0)
             .strftime('%Y-%m-%d %H:%M:%S UTC')
         )
-        # Assert presence of recent sync activity:
+        result = CapsuleSyncResult(
+            hostname=self.hostname,
+            start_time=start_time,
+            task_ids=[task['id'] for task in sync_status['active_sync_tasks']],
+        )
+        # Check presence of recent sync activity:
         #   one or more ongoing sync tasks for the capsule,
         #   Or, capsule's last_sync_time is on or after start_time
-        assert len(sync_status['active_sync_tasks']) or (
-            parse(sync_status['last_sync_time']) >= parse(start_time)
-        ), (
-            f"No active or recent sync found for capsule {self.hostname}."
-            f" `active_sync_tasks` was empty: {sync_status['active_sync_tasks']},"
-            f" and the `last_sync_time`: {sync_status['last_sync_time']},"
-            f" was prior to the `start_time`: {start_time}."
-        )
-        sync_tasks = []
+        if not (
+            len(sync_status['active_sync_tasks'])
+            or parse(sync_status['last_sync_time']) >= parse(start_time)
+        ):
+            result.failures.append(
+                f"No active or recent sync found for capsule {self.hostname}."
+                f" `active_sync_tasks` was empty: {sync_status['active_sync_tasks']},"
+                f" and the `last_sync_time`: {sync_status['last_sync_time']},"
+                f" was prior to the `start_time`: {start_time}."
+            )
+            return result.finish(waited_from)
         # Poll and verify succeeds, any active sync task from initial status.
         logger.info(f"Active tasks: {sync_status['active_sync_tasks']}")
-        for task in sync_status['active_sync_tasks']:
-            sync_tasks.append(self.satellite.api.ForemanTask(id=task['id']).poll(timeout=timeout))
-            logger.info(f"Active sync task :id {task['id']} succeeded.")
+        waiter = TaskWaiter(self.satellite, result.task_ids, timeout=timeout)
+        try:
+            waiter.wait()
+        except (TaskFailedError, TaskTimedOutError) as err:
+            result.failures.append(f"Sync task(s) of capsule {self.hostname} failed: {err}")
+            return result.finish(waited_from, waiter.tasks)
+        logger.info(f"Active sync tasks {result.task_ids} succeeded.")
 
         # Fetch updated capsule status (expect no ongoing sync)
         logger.info(f"Querying updated sync status from capsule {self.hostname}.")
         updated_status = self.nailgun_capsule.content_get_sync(timeout=timeout, synchronous=True)
+        result.end_time = updated_status['last_sync_time']
         # Last sync task end time is the same as capsule's last sync time.
-        assert parse(updated_status['last_sync_time']) == parse(
+        if parse(updated_status['last_sync_time']) != parse(
             updated_status['last_sync_task']['ended_at']
-        ), f"`last_sync_time` does not match final task's end time. Capsule: {self.hostname}"
+        ):
+            result.failures.append(
+                f"`last_sync_time` does not match final task's end time. Capsule: {self.hostname}"
+            )
 
         # Total time taken is not negative (sync prior to start_time),
         # and did not exceed timeout.
-        assert (
+        if not (
             timedelta(seconds=0)
             <= parse(updated_status['last_sync_time']) - parse(start_time)
             <= timedelta(seconds=timeout)
-        ), (
-            f"No recent sync task(s) were found for capsule: {self.hostname}, or task(s) timed out."
-            f" `last_sync_time`: ({updated_status['last_sync_time']}) was prior to `start_time`: ({start_time})"
-            f" or exceeded timeout ({timeout}s)."
-        )
+        ):
+            result.failures.append(
+                f"No recent sync task(s) were found for capsule: {self.hostname}, or task(s)"
+                f" timed out. `last_sync_time`: ({updated_status['last_sync_time']}) was prior"
+                f" to `start_time`: ({start_time}) or exceeded timeout ({timeout}s)."
+            )
         # No failed or active tasks remaining
-        assert len(updated_status['last_failed_sync_tasks']) == 0
-        assert len(updated_status['active_sync_tasks']) == 0
-
-        # return any polled sync tasks, that were initially in-progress
-        return sync_tasks
+        if updated_status['last_failed_sync_tasks']:
+            result.failures.append(
+                f"Capsule {self.hostname} has failed sync tasks:"
+                f" {[task['id'] for task in updated_status['last_failed_sync_tasks']]}"
+            )
+        if updated_status['active_sync_tasks']:
+            result.failures.append(
+                f"Capsule {self.hostname} has active sync tasks:"
+                f" {[task['id'] for task in updated_status['active_sync_tasks']]}"
+            )
+        return result.finish(waited_from, waiter.tasks)
 
     def get_published_repo_url(self, org, prod, repo, lce=None, cv=None):
         """Forms url of a repo or CV published on a Satellite or Capsule.
@@ -0,0 +1,158 @@
+"""Wait on many foreman tasks at once.
+
+Instead of polling every task on its own, like ``ForemanTask.poll`` does, a
+:class:`TaskWaiter` refreshes all the tasks it tracks with a single
+``id ^ (...)`` search per poll, backs off while nothing changes and returns as
+soon as all of them are stopped or paused.
+"""
+
+from dataclasses import dataclass, field
+import time
+
+from nailgun.entity_mixins import TASK_TIMEOUT, TaskFailedError, TaskTimedOutError
+
+from robottelo.logging import logger
+
+TERMINAL_STATES = ('paused', 'stopped')
+POLL_RATE = 1
+MAX_POLL_RATE = 15
+
+
+@dataclass
+class TaskOutcome:
+    """A tracked task, its last known state and how long it was waited for"""
+
+    id: str
+    task: object = None
+    polls: int = 0
+    tracked_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def state(self):
+        return getattr(self.task, 'state', None)
+
+    @property
+    def result(self):
+        return getattr(self.task, 'result', None)
+
+    @property
+    def done(self):
+        return self.state in TERMINAL_STATES
+
+    @property
+    def succeeded(self):
+        return self.done and self.result == 'success'
+
+    @property
+    def waited(self):
+        """Seconds from the start of the tracking until the task was seen finished"""
+        return (self.finished_at or time.monotonic()) - self.tracked_at
+
+    def update(self, task):
+        self.task = task
+        self.polls += 1
+        if self.done and self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+
+class TaskWaiter:
+    """Track a set of foreman tasks of a Satellite and wait for all of them to finish
+
+    :param satellite: the Satellite running the tasks.
+    :param tasks: ``ForemanTask`` entities or task IDs to track, see :meth:`add`.
+    :param poll_rate: initial delay between two searches, in seconds.
+    :param max_poll_rate: maximal delay between two searches, the delay is multiplied
+        by ``backoff`` after every search in which no task finished.
+    :param timeout: maximum number of seconds to wait for the tasks.
+    """
+
+    def __init__(
+        self,
+        satellite,
+        tasks=(),
+        poll_rate=None,
+        max_poll_rate=MAX_POLL_RATE,
+        backoff=1.5,
+        timeout=None,
+    ):
+        self.satellite = satellite
+        self.poll_rate = poll_rate or POLL_RATE
+        self.max_poll_rate = max(max_poll_rate, self.poll_rate)
+        self.backoff = backoff
+        self.timeout = timeout or TASK_TIMEOUT
+        self.searches = 0
+        self.outcomes = {}
+        self.add(*tasks)
+
+    def add(self, *tasks):
+        """Track ``tasks``, entities already searched are not searched again when finished"""
+        for task in tasks:
+            task_id = str(getattr(task, 'id', task))
+            outcome = self.outcomes.setdefault(task_id, TaskOutcome(task_id))
+            if not isinstance(task, str | int):
+                outcome.update(task)
+
+    @property
+    def pending(self):
+        """IDs of the tracked tasks which are not finished yet"""
+        return [outcome.id for outcome in self.outcomes.values() if not outcome.done]
+
+    @property
+    def tasks(self):
+        """The last known ``ForemanTask`` entities of the tracked tasks"""
+        return [outcome.task for outcome in self.outcomes.values()]
+
+    def refresh(self):
+        """Refresh all the pending tasks with a single search
+
+        :return: IDs of the tasks still pending.
+        """
+        if pending := self.pending:
+            tasks = self.satellite.api.ForemanTask().search(
+                query={'search': f'id ^ ({", ".join(pending)})', 'per_page': len(pending)}
+            )
+            self.searches += 1
+            for task in tasks:
+                if (outcome := self.outcomes.get(str(task.id))) and not outcome.done:
+                    outcome.update(task)
+        return self.pending
+
+    def wait(self, must_succeed=True):
+        """Wait until all the tracked tasks are finished
+
+        :param must_succeed: raise when any task did not succeed.
+        :return: dict of :class:`TaskOutcome` by task ID, in the order tasks were added.
+        :raises: ``nailgun.entity_mixins.TaskTimedOutError`` if tasks are still pending
+            after the timeout, ``nailgun.entity_mixins.TaskFailedError`` if a task did not
+            succeed and ``must_succeed`` is set.
+        """
+        deadline = time.monotonic() + self.timeout
+        delay = None
+        pending = self.pending
+        while pending:
+            finished = len(pending) - len(pending := self.refresh())
+            if not pending:
+                break
+            if (remaining := deadline - time.monotonic()) <= 0:
+                raise TaskTimedOutError(
+                    f'Timed out after {self.timeout}s polling tasks: {", ".join(pending)}',
+                    pending[0],
+                )
+            if delay is None or finished:
+                delay = self.poll_rate
+            else:
+                delay = min(delay * self.backoff, self.max_poll_rate)
+            time.sleep(min(delay, remaining))
+        logger.debug(
+            f'{len(self.outcomes)} task(s) finished after {self.searches} search(es): '
+            + ', '.join(f'{o.id} {o.result} in {o.waited:.1f}s' for o in self.outcomes.values())
+        )
+        failed = [outcome for outcome in self.outcomes.values() if not outcome.succeeded]
+        if must_succeed and failed:
+            raise TaskFailedError(
+                'Task(s) did not succeed: '
+                + ', '.join(f'{o.id} ({o.state}, {o.result})' for o in failed),
+                failed[0].id,
+            )
+        return self.outcomes
@@ -0,0 +1,133 @@
+"""Satellites and Capsules checked out ahead of the tests needing them.
+
+Deploying a Satellite or a Capsule takes long enough that tests getting a fresh
+one from ``satellite_factory`` or ``capsule_factory`` spend most of their time
+waiting for it. A :class:`LookaheadProvisioner` is told how many hosts of each
+kind the tests of the process are expected to take, and keeps up to
+``max_ahead`` of them being checked out in the background, so the deployment
+overlaps with the tests running before.
+
+The xdist workers of a test run do not know which of them will run the tests
+needing a host, so they share a :class:`SharedBudget` of the hosts the whole
+run needs, and no more than that are checked out, ahead or not.
+"""
+
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import json
+import os
+from pathlib import Path
+import threading
+
+from broker import Broker
+from broker.helpers import FileLock
+
+from robottelo.logging import logger
+
+
+class SharedBudget:
+    """The number of hosts of each kind the processes of a test run may check out
+
+    :param path: the file counting the hosts of each kind already counted.
+    :param totals: the number of hosts of each kind the whole test run needs.
+    """
+
+    def __init__(self, path, totals):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.totals = Counter(totals)
+
+    def _read(self):
+        try:
+            return Counter(json.loads(self.path.read_text()))
+        except (OSError, ValueError):
+            return Counter()
+
+    def take(self, kind):
+        """Count a host of ``kind``, return False if the test run needs no more of them"""
+        with FileLock(self.path):
+            taken = self._read()
+            if taken[kind] >= self.totals[kind]:
+                return False
+            taken[kind] += 1
+            tmp_path = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(taken))
+            tmp_path.replace(self.path)
+        return True
+
+    def clear(self):
+        """Remove the budget file, and its lock file"""
+        for path in self.path.parent.glob(f'{self.path.name}*'):
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+
+class LookaheadProvisioner:
+    """Check out hosts of each kind ahead of need
+
+    :param demand: number of hosts of each kind, e.g. ``satellite``, expected to be taken.
+    :param max_ahead: maximum number of hosts of a kind checked out ahead.
+    :param budget: a :class:`SharedBudget` of the test run, to not check out more
+        hosts than the other processes of the run leave to take.
+    """
+
+    def __init__(self, demand, max_ahead=1, budget=None):
+        self.demand = Counter(demand)
+        self.max_ahead = max_ahead
+        self.budget = budget
+        self._checkouts = {}
+        self._ahead = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(thread_name_prefix='lookahead')
+
+    def _fill(self, kind):
+        ahead = self._ahead.setdefault(kind, deque())
+        while len(ahead) < min(self.demand[kind], self.max_ahead):
+            if self.budget and not self.budget.take(kind):
+                # the other processes check out the rest
+                self.demand[kind] = len(ahead)
+                break
+            logger.info(f'Checking out a {kind} ahead of the tests needing it')
+            ahead.append(self._executor.submit(self._checkouts[kind]))
+
+    def register(self, kind, checkout):
+        """Start checking out hosts of ``kind`` ahead, with the ``checkout`` callable"""
+        with self._lock:
+            self._checkouts[kind] = checkout
+            self._fill(kind)
+
+    def take(self, kind):
+        """Return the next host of ``kind`` checked out ahead, None if there is none"""
+        with self._lock:
+            self.demand[kind] = max(self.demand[kind] - 1, 0)
+            ahead = self._ahead.get(kind)
+            future = ahead.popleft() if ahead else None
+            if future is None and self.budget:
+                # the caller checks a host out by itself
+                self.budget.take(kind)
+            if kind in self._checkouts:
+                self._fill(kind)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as err:
+            # the caller checks a host out by itself
+            logger.warning(f'Checking out a {kind} ahead failed: {err}')
+            return None
+
+    def close(self):
+        """Stop checking out hosts, and check in the ones checked out but not taken"""
+        with self._lock:
+            futures = [future for ahead in self._ahead.values() for future in ahead]
+            self._ahead.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        hosts = [
+            future.result()
+            for future in futures
+            if not future.cancelled() and future.exception() is None
+        ]
+        if hosts:
+            logger.info(f'Checking in {len(hosts)} unused host(s) checked out ahead')
+            Broker(hosts=hosts).checkin()
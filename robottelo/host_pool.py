@@ -0,0 +1,166 @@
+"""A warm pool of content hosts, reused by the tests of a pytest process.
+
+Content hosts are checked out by broker in the background, ahead of the tests
+requesting them, and are kept per deploy configuration, see
+:func:`pytest_fixtures.core.contenthosts.host_conf`. A host released by a test
+is reset, and handed to the next test with the same configuration until it was
+used ``max_reuse`` times, or its reset failed, then it is checked in.
+
+The pool is enabled by ``performance.host_pool.enabled``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import threading
+
+from broker import Broker
+
+from robottelo.hosts import ContentHost
+from robottelo.logging import logger
+
+REPOS_DIR = '/etc/yum.repos.d'
+
+
+def signature(conf):
+    """Return the hashable signature of a host deploy configuration"""
+    return tuple(sorted((key, repr(value)) for key, value in conf.items()))
+
+
+class ContentHostPool:
+    """Content hosts checked out ahead of need, grouped by deploy configuration
+
+    :param size: number of hosts kept ready, or being checked out, per configuration.
+    :param max_reuse: number of tests a host is handed to before it is checked in.
+    :param host_class: the class of the hosts checked out.
+    """
+
+    def __init__(self, size=2, max_reuse=5, host_class=ContentHost):
+        self.size = size
+        self.max_reuse = max_reuse
+        self.host_class = host_class
+        # reentrant, the callback of a future already done runs in the thread adding it
+        self._lock = threading.RLock()
+        self._idle = {}
+        self._pending = {}
+        self._uses = {}
+        self._repos = {}
+        self._executor = ThreadPoolExecutor(thread_name_prefix='host_pool')
+
+    def _checkout(self, conf):
+        host = Broker(**conf, host_class=self.host_class).checkout()
+        host.setup()
+        repos = host.execute(f'ls {REPOS_DIR}')
+        self._repos[host.hostname] = set(repos.stdout.split()) if repos.status == 0 else None
+        self._uses[host.hostname] = 0
+        return host
+
+    def _replenish(self, conf):
+        """Start checkouts until ``size`` hosts are idle or pending for ``conf``"""
+        key = signature(conf)
+        with self._lock:
+            # a future stays pending until _checked_out ran, even if already done
+            pending = self._pending.setdefault(key, [])
+            missing = self.size - len(self._idle.get(key, [])) - len(pending)
+            for _ in range(missing):
+                future = self._executor.submit(self._checkout, conf)
+                pending.append(future)
+                future.add_done_callback(lambda future, key=key: self._checked_out(key, future))
+
+    def _checked_out(self, key, future):
+        with self._lock:
+            if future not in self._pending.get(key, []):
+                # taken over by acquire
+                return
+            self._pending[key].remove(future)
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self._idle.setdefault(key, []).append(future.result())
+            else:
+                logger.warning(f'Content host pool checkout failed: {future.exception()}')
+
+    def acquire(self, conf):
+        """Return an idle host deployed with ``conf``, checked out now if none is idle"""
+        key = signature(conf)
+        with self._lock:
+            # the last released host first, the hosts checked out ahead stay fresh
+            host = self._idle[key].pop() if self._idle.get(key) else None
+            pending = next(iter(self._pending.get(key, [])), None)
+            if host is None and pending:
+                # take over the first pending checkout, its host is not made idle when done
+                self._pending[key].remove(pending)
+        if host is None and pending:
+            try:
+                host = pending.result()
+            except Exception as err:
+                logger.warning(f'Content host pool checkout failed: {err}')
+        if host is None:
+            host = self._checkout(conf)
+        self._replenish(conf)
+        self._uses[host.hostname] += 1
+        return host
+
+    def reset(self, host):
+        """Undo what a test usually does to a host, return False if it failed
+
+        The host is unregistered, its host record deleted, rhsm reset and the
+        repositories added since the checkout removed.
+        """
+        try:
+            host.teardown()
+            host.reset_rhsm()
+            if (repos := self._repos.get(host.hostname)) is None:
+                return False
+            added = set(host.execute(f'ls {REPOS_DIR}').stdout.split()) - repos
+            if added and host.execute(f'cd {REPOS_DIR} && rm -f {" ".join(added)}').status:
+                return False
+            host.execute('dnf clean all || yum clean all')
+            host.clean_cached_properties()
+        except Exception as err:
+            # whatever failed, the host is not reusable
+            logger.warning(f'Content host pool could not reset {host.hostname}: {err}')
+            return False
+        return True
+
+    def release(self, host, conf):
+        """Hand ``host`` back to the pool, it is checked in once worn out or not reusable"""
+        if getattr(host, '_skip_context_checkin', False):
+            # the test keeps the host, like broker does not check it in
+            self._uses.pop(host.hostname, None)
+            self._repos.pop(host.hostname, None)
+        elif self._uses[host.hostname] >= self.max_reuse:
+            self.checkin(host)
+        elif self.reset(host):
+            with self._lock:
+                self._idle.setdefault(signature(conf), []).append(host)
+        else:
+            self.checkin(host, teardown=False)
+
+    def checkin(self, host, teardown=True):
+        """Tear ``host`` down unless told otherwise, and check it in"""
+        self._uses.pop(host.hostname, None)
+        self._repos.pop(host.hostname, None)
+        try:
+            if teardown:
+                host.teardown()
+            Broker(hosts=[host]).checkin()
+        except Exception as err:
+            logger.warning(f'Content host pool could not check in {host.hostname}: {err}')
+
+    @contextmanager
+    def host(self, conf):
+        """Provide a host deployed with ``conf`` for the duration of the context"""
+        host = self.acquire(conf)
+        try:
+            yield host
+        finally:
+            self.release(host, conf)
+
+    def close(self):
+        """Wait for the pending checkouts, and check in all the idle hosts"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            hosts = [host for idle in self._idle.values() for host in idle]
+            self._idle.clear()
+        for host in hosts:
+            self.checkin(host)
@@ -3,7 +3,6 @@ import contextlib
 from contextlib import contextmanager
 from datetime import datetime
 from functools import cached_property, lru_cache
-import importlib
 import io
 import json
 from pathlib import Path, PurePath
@@ -13,7 +12,6 @@ from tempfile import NamedTemporaryFile
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
 
-import apypie
 from box import Box
 from broker import Broker
 from broker.hosts import Host
@@ -29,10 +27,12 @@ from wrapanapi.entities.vm import VmState
 import yaml
 
 from robottelo import constants
-from robottelo.cli.base import Base
+from robottelo.cli import rest
+from robottelo.cli.registry import CLINamespace
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
+    ensure_configured,
     robottelo_tmp_dir,
     settings,
 )
@@ -51,9 +51,11 @@ from robottelo.constants import (
 )
 from robottelo.exceptions import CLIFactoryError, DownloadFileError, HostPingFailed
 from robottelo.host_helpers import CapsuleMixins, ContentHostMixins, SatelliteMixins
+from robottelo.host_helpers.api_namespace import APINamespace, install_session_router
 from robottelo.logging import logger
-from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils import host_facts, validate_ssh_pub_key
 from robottelo.utils.datafactory import valid_emails_list
+from robottelo.utils.host_facts import cached_host_fact
 from robottelo.utils.installer import InstallerCommand
 
 POWER_OPERATIONS = {
@@ -149,6 +151,11 @@ class ContentHost(Host, ContentHostMixins):
         self.blank = kwargs.get('blank', False)
         super().__init__(hostname=hostname, **kwargs)
 
+    def connect(self, *args, **kwargs):
+        """Connect to the host, and read its boot ID again, it may have rebooted"""
+        host_facts.forget_boot_id(self)
+        return super().connect(*args, **kwargs)
+
     @classmethod
     def get_hosts_from_inventory(cls, filter):
         """Get an instance of a host from inventory using a filter"""
@@ -228,7 +235,7 @@ class ContentHost(Host, ContentHostMixins):
         ipv4, *ipv6 = self.execute('hostname -I').stdout.split()
         return ipv4
 
-    @cached_property
+    @cached_host_fact
     def arch(self):
         return self.get_facts().get('lscpu.architecture') or self.execute('uname -m').stdout.strip()
 
@@ -331,10 +338,14 @@ class ContentHost(Host, ContentHostMixins):
         return {name: getattr(self, name) for name in self.list_cached_properties()}
 
     def clean_cached_properties(self):
-        """Delete all cached properties for this class"""
+        """Delete all cached properties for this class, and the host facts shared with
+        the other processes
+        """
         for name in self.list_cached_properties():
             with contextlib.suppress(KeyError):  # ignore if property is not cached
                 del self.__dict__[name]
+        host_facts.forget_boot_id(self)
+        host_facts.invalidate(self.hostname)
 
     def setup(self):
         logger.debug('START: setting up host %s', self)
@@ -393,6 +404,9 @@ class ContentHost(Host, ContentHostMixins):
             == 'successful'
         )
 
+        # the host booted again, what was probed before may have changed
+        host_facts.forget_boot_id(self)
+        host_facts.invalidate(self.hostname)
         if ensure and state in [VmState.RUNNING, 'reboot']:
             try:
                 wait_for(
@@ -1712,28 +1726,9 @@ class Capsule(ContentHost, CapsuleMixins):
 
     @property
     def cli(self):
-        """Import only satellite-maintain robottelo cli entities and wrap them under self.cli"""
-        self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if (
-                file.suffix == '.py'
-                and not file.name.startswith('_')
-                and file.name.startswith('sm_')
-            ):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(name, (obj,), {'hostname': self.hostname})
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """satellite-maintain robottelo cli entities bound to this capsule, created on first use"""
+        if not getattr(self, '_cli', None):
+            self._cli = CLINamespace(prefix='sm_', hostname=self.hostname)
         return self._cli
 
     def enable_satellite_or_capsule_module_for_rhel8(self):
@@ -1766,8 +1761,8 @@ class Satellite(Capsule, SatelliteMixins):
         self.port = kwargs.get('port', settings.server.port)
         super().__init__(hostname=hostname, **kwargs)
         # create dummy classes for later population
-        self._api = type('api', (), {'_configured': False})
-        self._cli = type('cli', (), {'_configured': False})
+        self._api = None
+        self._cli = None
         self._apidoc = None
         self.record_property = None
 
@@ -1779,7 +1774,7 @@ class Satellite(Capsule, SatelliteMixins):
 
         pip_main(['uninstall', '-y', 'nailgun'])
         pip_main(['install', f'https://github.com/SatelliteQE/nailgun/archive/{new_version}.zip'])
-        self._api = type('api', (), {'_configured': False})
+        self._api = None
         to_clear = [k for k in sys.modules if 'nailgun' in k]
         [sys.modules.pop(k) for k in to_clear]
 
@@ -1835,84 +1830,38 @@ class Satellite(Capsule, SatelliteMixins):
 
     @property
     def api(self):
-        """Import all nailgun entities and wrap them under self.api"""
+        """All nailgun entities bound to this satellite, each created on first use"""
         if not self._api:
-            self._api = type('api', (), {'_configured': False})
-        if self._api._configured:
-            return self._api
-        from nailgun import entities as _entities  # use a private import
-        from nailgun.config import ServerConfig
-        from nailgun.entity_mixins import Entity
-
-        def inject_config(cls, server_config):
-            """inject a nailgun server config into the init of nailgun entity classes"""
-            import functools
-
-            class DecClass(cls):
-                __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
-
-            return DecClass
-
-        # set the server configuration to point to this satellite
-        self.nailgun_cfg = ServerConfig(
-            auth=(settings.server.admin_username, settings.server.admin_password),
-            url=f'{self.url}',
-            verify=settings.server.verify_ca,
-        )
-        # add each nailgun entity to self.api, injecting our server config
-        for name, obj in _entities.__dict__.items():
-            try:
-                if Entity in obj.mro():
-                    #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
-                    setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
-            except AttributeError:
-                # not everything has an mro method, we don't care about them
-                pass
-        self._api._configured = True
+            from nailgun.config import ServerConfig
+
+            ensure_configured('nailgun')
+            # set the server configuration to point to this satellite
+            self.nailgun_cfg = ServerConfig(
+                auth=(settings.server.admin_username, settings.server.admin_password),
+                url=f'{self.url}',
+                verify=settings.server.verify_ca,
+            )
+            if settings.performance.http_pool.enabled:
+                install_session_router()
+            self._api = APINamespace(self.nailgun_cfg)
         return self._api
 
     @property
     def apidoc(self):
-        """Provide Satellite's apidoc via apypie"""
+        """Provide Satellite's apidoc via apypie, shared with the CLI REST bypass"""
         if not self._apidoc:
-            self._apidoc = apypie.Api(
-                uri=self.url,
-                username=settings.server.admin_username,
-                password=settings.server.admin_password,
-                api_version=2,
-                verify_ssl=settings.server.verify_ca,
+            self._apidoc = rest.get_api(
+                self.hostname, settings.server.admin_username, settings.server.admin_password
             ).apidoc
         return self._apidoc
 
     @property
     def cli(self):
-        """Import all robottelo cli entities and wrap them under self.cli"""
+        """All robottelo cli entities bound to this satellite, each created on first use"""
         if not self._cli:
-            self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if file.suffix == '.py' and not file.name.startswith('_'):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(
-                                name,
-                                (obj,),
-                                {
-                                    'hostname': self.hostname,
-                                    'omitting_credentials': self.omitting_credentials,
-                                },
-                            )
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+            self._cli = CLINamespace(
+                hostname=self.hostname, omitting_credentials=self.omitting_credentials
+            )
         return self._cli
 
     @contextmanager
@@ -1921,23 +1870,13 @@ class Satellite(Capsule, SatelliteMixins):
         if change:
             self.omitting_credentials = True
             # if CLI is already created
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = True
+            if self._cli:
+                self._cli.set_attributes(omitting_credentials=True)
         yield
         if change:
             self.omitting_credentials = False
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = False
+            if self._cli:
+                self._cli.set_attributes(omitting_credentials=False)
 
     @contextmanager
     def ui_session(self, testname=None, user=None, password=None, url=None, login=True):
@@ -1945,6 +1884,8 @@ class Satellite(Capsule, SatelliteMixins):
 
         from airgun.session import Session
 
+        ensure_configured('airgun')
+
         def get_caller():
             import inspect
 
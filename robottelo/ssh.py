@@ -1,6 +1,152 @@
 """Utility module to handle the shared ssh connection."""
 
-from robottelo.cli import hammer
+from contextlib import suppress
+from functools import partial
+import os
+import threading
+import time
+
+from ssh2.exceptions import SSH2Error
+
+from robottelo.cli import hammer, telemetry
+from robottelo.logging import logger
+
+# errors raised by a session that was silently dropped by the remote end
+_STALE_SESSION_ERRORS = (EOFError, OSError, SSH2Error)
+
+_pool = None
+
+
+class SSHConnectionPool:
+    """Per-process pool of authenticated ssh clients.
+
+    Clients are keyed by ``(hostname, username, password, port, ipv6)`` and handed out
+    exclusively, so one ssh session is never shared by two threads at once.
+    Released clients are reused by the next call for the same key, clients that
+    stayed idle longer than ``idle_timeout`` seconds are reconnected, and no
+    more than ``max_channels`` clients per key are in use at the same time.
+    """
+
+    def __init__(self, max_channels=4, idle_timeout=300):
+        self.max_channels = max_channels
+        self.idle_timeout = idle_timeout
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+        self._stats = {'hits': 0, 'misses': 0, 'reconnects': 0, 'handshake_time': 0.0}
+
+    @property
+    def stats(self):
+        """Return a copy of the pool counters"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def _slot(self, key):
+        """Return the semaphore bounding the channels opened for ``key``"""
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_channels)
+            return self._slots[key]
+
+    def _connect(self, factory):
+        """Create a new client and force its ssh handshake"""
+        start = time.perf_counter()
+        with telemetry.phase('ssh_latency'):
+            client = _connect(factory)
+        self._count('handshake_time', time.perf_counter() - start)
+        return client
+
+    @staticmethod
+    def _close(client):
+        with suppress(Exception):
+            client.close()
+
+    def _checkout(self, key, factory):
+        """Return a ``(client, reused)`` tuple for ``key``"""
+        expired = []
+        client = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                candidate, released_at = idle.pop()
+                if time.monotonic() - released_at > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                client = candidate
+                self._stats['hits'] += 1
+                break
+            else:
+                self._stats['misses'] += 1
+        for stale in expired:
+            self._close(stale)
+        if client is not None:
+            return client, True
+        return self._connect(factory), False
+
+    def _checkin(self, key, client):
+        with self._lock:
+            self._idle.setdefault(key, []).append((client, time.monotonic()))
+
+    def execute(self, key, factory, cmd, timeout=None):
+        """Run ``cmd`` on a pooled client, creating one with ``factory`` when needed.
+
+        A reused session that turns out to be stale is closed and the command is
+        retried once on a freshly connected client.
+        """
+        with self._slot(key):
+            client, reused = self._checkout(key, factory)
+            try:
+                try:
+                    with telemetry.phase('runtime'):
+                        result = client.execute(cmd, timeout=timeout)
+                except _STALE_SESSION_ERRORS as err:
+                    if not reused:
+                        raise
+                    logger.debug(f'Reconnecting stale ssh session to {key[0]}: {err!r}')
+                    self._close(client)
+                    self._count('reconnects')
+                    client = self._connect(factory)
+                    with telemetry.phase('runtime'):
+                        result = client.execute(cmd, timeout=timeout)
+            except Exception:
+                self._close(client)
+                raise
+            self._checkin(key, client)
+        return result
+
+    def clear(self):
+        """Close and forget all the idle clients"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for clients in idle.values():
+            for client, _ in clients:
+                self._close(client)
+
+
+def _connect(factory):
+    """Create a new client with ``factory`` and force its ssh handshake"""
+    client = factory()
+    client.session  # noqa: B018 - broker connects lazily on first access
+    return client
+
+
+def get_pool():
+    """Return the ssh connection pool of the current process"""
+    from robottelo.config import settings
+
+    global _pool
+    # a forked process must not reuse the sessions of its parent
+    if _pool is None or _pool.pid != os.getpid():
+        _pool = SSHConnectionPool(
+            max_channels=settings.performance.ssh_pool.max_channels,
+            idle_timeout=settings.performance.ssh_pool.idle_timeout,
+        )
+    return _pool
 
 
 def get_client(
@@ -39,25 +185,53 @@ def command(
 ):
     """Executes SSH command(s) on remote hostname.
 
-    kwargs are passed through to get_connection
+    kwargs are passed through to get_connection. When ``performance.ssh_pool``
+    is enabled, the ssh session is taken from the per-process connection pool.
 
     :param str cmd: The command to run
     :param str output_format: json, csv or None
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
+    from robottelo.config import settings
+
+    hostname = hostname or settings.server.hostname
+    username = username or settings.server.ssh_username
+    port = port or settings.server.ssh_client.port
+    ipv6 = ipv6 or settings.server.is_ipv6
+    factory = partial(
+        get_client,
         hostname=hostname,
         username=username,
         password=password,
         port=port,
         ipv6=ipv6,
     )
-    result = client.execute(cmd, timeout=timeout)
+    if settings.performance.ssh_pool.enabled:
+        # the sessions authenticated with other credentials are not reused
+        key = (hostname, username, password, port, bool(ipv6))
+        result = get_pool().execute(key, factory, cmd, timeout=timeout)
+    else:
+        with telemetry.phase('ssh_latency'):
+            client = _connect(factory)
+        with telemetry.phase('runtime'):
+            result = client.execute(cmd, timeout=timeout)
+
+    return parse_output(result, output_format)
 
+
+def parse_output(result, output_format=None):
+    """Parse the stdout of a successful ``result`` according to ``output_format``
+
+    :param result: a result object, returned by the ssh client ``execute``.
+    :param str output_format: json, csv or None
+    :return: the same ``result`` object with its ``stdout`` parsed.
+    """
+    telemetry.observe_result(result)
     if output_format and result.status == 0:
-        if output_format == 'csv':
-            result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
-        if output_format == 'json':
-            result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
+        with telemetry.phase('parse_time'):
+            if output_format == 'csv':
+                result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
+            if output_format == 'json':
+                result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
     return result
@@ -1,4 +1,5 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using file locking, or
+the sqlite storage locks when ``robottelo.lock_storage`` is ``sqlite``
 
 Usage::
 
@@ -38,18 +39,45 @@ Usage::
        def test_that_conflict_with_test_to_lock(self)
             with locking_function(self.test_to_lock):
                 # do some operations that conflict with test_to_lock
+
+    # the tests only reading a resource can hold its lock together, while the
+    # ones changing it wait for them and hold it alone
+    @lock_function(mode=SHARED)
+    def test_read_setting(self):
+        pass
+
+    def test_update_setting(self):
+        with locking_function(self.test_read_setting, mode=EXCLUSIVE):
+            # update the setting
+
+    # up to slots holders at once
+    @lock_function(mode=SEMAPHORE, slots=3)
+    def test_sync_capsule(self):
+        pass
+
+The semaphore holders exclude the shared and exclusive holders, with both lock
+storages. The time waited for each lock is logged, and summed up by
+:func:`get_lock_wait_metrics`, which the ``lock_wait_metrics`` plugin reports
+at the end of the test session.
 """
 
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
+import fcntl
 import functools
 import inspect
 import os
 import tempfile
-
-from pytest_services.locks import file_lock
+import threading
+import time
 
 from robottelo.config import settings
 from robottelo.logging import logger
+from robottelo.utils.decorators.func_shared.sqlite_storage import (
+    EXCLUSIVE,
+    SEMAPHORE,
+    SHARED,
+    SQLiteStorageHandler,
+)
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_LOCK_DIR = 'lock_functions'
@@ -57,6 +85,20 @@ LOCK_DIR = None
 LOCK_DEFAULT_TIMEOUT = 1800  # 30 minutes
 LOCK_FILE_NAME_EXT = 'lock'
 LOCK_DEFAULT_SCOPE = None
+# the lock storage, file or sqlite, by default from settings
+LOCK_STORAGE = None
+
+LOCK_MODES = (EXCLUSIVE, SHARED, SEMAPHORE)
+# the file locks are polled with an exponential backoff
+# between
+LOCK_MIN_POLL_RATE = 0.01
+LOCK_MAX_POLL_RATE = 0.5
+
+# the locks held by the process, by process id, lock file path and mode
+_held_locks = {}
+# the lock wait times of the process, by lock file path and mode
+_lock_wait_metrics = {}
+_registry_lock = threading.Lock()
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
@@ -74,6 +116,19 @@ def set_default_scope(value):
     LOCK_DEFAULT_SCOPE = value
 
 
+def set_lock_storage(value):
+    """Set the lock storage, file or sqlite
+
+    :type value: str
+    """
+    global LOCK_STORAGE
+    LOCK_STORAGE = value
+
+
+def _is_sqlite_lock_storage():
+    return (LOCK_STORAGE or settings.robottelo.lock_storage) == 'sqlite'
+
+
 def _get_default_scope():
     # this is the default locking scope
     return LOCK_DEFAULT_SCOPE or str(os.getpid())
@@ -155,15 +210,47 @@ def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, s
     )
 
 
-def _check_deadlock(lock_file_path, process_id):
+def _get_held_locks(lock_file_path):
+    """Return the number of locks of lock_file_path held by the process, by mode"""
+    with _registry_lock:
+        return dict(_held_locks.get((os.getpid(), lock_file_path), {}))
+
+
+def _check_deadlock(lock_file_path, process_id, mode=EXCLUSIVE, slots=1):
     """To prevent process deadlock, raise exception if the file content is the
-    same as process_id
+    same as process_id, or if the process already holds the lock in a mode
+    which would block it
 
     note: this function is called before the lock
 
     :type lock_file_path: str
     :type process_id: str
+    :type mode: str
+    :type slots: int
     """
+    held = _get_held_locks(lock_file_path)
+    if (
+        (mode == EXCLUSIVE and any(held.values()))
+        or (mode == SHARED and (held.get(EXCLUSIVE) or held.get(SEMAPHORE)))
+        or (
+            mode == SEMAPHORE
+            and (held.get(EXCLUSIVE) or held.get(SHARED) or held.get(SEMAPHORE, 0) >= slots)
+        )
+    ):
+        raise FunctionLockerError(
+            f'recursion detected: the function file already locked by the same process {held}'
+        )
+    if mode == SEMAPHORE:
+        # the slots are not recorded as the process id of the lock
+        return
+
+    if _is_sqlite_lock_storage():
+        if str(SQLiteStorageHandler().lock_pid(lock_file_path)) == process_id:
+            raise FunctionLockerError(
+                'recursion detected: the function file already locked by the same process'
+            )
+        return
+
     if os.path.exists(lock_file_path):
         try:
             with open(lock_file_path) as lock_file_handler:
@@ -179,8 +266,160 @@ def _check_deadlock(lock_file_path, process_id):
             )
 
 
+def _get_slot_lock_path(lock_file_path, index):
+    """Return the path of the file to lock for a semaphore slot"""
+    root, ext = os.path.splitext(lock_file_path)
+    return f'{root}.{index}{ext}'
+
+
+def _is_locked(lock_file_path):
+    """Return whether an other file handler holds a lock of lock_file_path"""
+    with open(lock_file_path, 'a') as handler:
+        try:
+            fcntl.flock(handler, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        return False
+
+
+@contextmanager
+def _file_lock(lock_file_paths, operation, timeout, excluding_path=None):
+    """Lock the first free of lock_file_paths with the flock operation, once
+    no other file handler holds a lock of excluding_path, and yield its file
+    handler
+    """
+    handlers = [open(lock_file_path, 'a+') for lock_file_path in lock_file_paths]
+    try:
+        deadline = time.monotonic() + timeout
+        poll_rate = LOCK_MIN_POLL_RATE
+        while True:
+            for handler in handlers:
+                try:
+                    fcntl.flock(handler, operation | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                if excluding_path and _is_locked(excluding_path):
+                    fcntl.flock(handler, fcntl.LOCK_UN)
+                    break
+                try:
+                    yield handler
+                finally:
+                    fcntl.flock(handler, fcntl.LOCK_UN)
+                return
+            if time.monotonic() >= deadline:
+                raise FunctionLockerError(
+                    f'timeout: could not lock {lock_file_paths[0]} in {timeout} seconds'
+                )
+            time.sleep(poll_rate)
+            poll_rate = min(poll_rate * 2, LOCK_MAX_POLL_RATE)
+    finally:
+        for handler in handlers:
+            handler.close()
+
+
+@contextmanager
+def _acquire(lock_file_path, timeout, mode, slots):
+    """Lock the lock file path in mode, yield the file handler to write the
+    process id to, None if there is none
+    """
+    if _is_sqlite_lock_storage():
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(
+                    SQLiteStorageHandler().lock(
+                        lock_file_path, timeout=timeout, mode=mode, slots=slots
+                    )
+                )
+            except TimeoutError as err:
+                raise FunctionLockerError(f'timeout: {err}') from err
+            yield None
+        return
+    # the semaphore holders hold the semaphore lock file shared, which the
+    # exclusive and shared holders check is not held once they locked the lock
+    # file, while the semaphore holders lock it shared once they locked the
+    # lock file exclusively
+    semaphore_lock_path = _get_slot_lock_path(lock_file_path, SEMAPHORE)
+    if mode == EXCLUSIVE:
+        with _file_lock(
+            [lock_file_path], fcntl.LOCK_EX, timeout, excluding_path=semaphore_lock_path
+        ) as handler:
+            yield handler
+    elif mode == SHARED:
+        # the holders do not write their process id, which is the exclusive one
+        with _file_lock(
+            [lock_file_path], fcntl.LOCK_SH, timeout, excluding_path=semaphore_lock_path
+        ):
+            yield None
+    else:
+        deadline = time.monotonic() + timeout
+        slot_lock_paths = [_get_slot_lock_path(lock_file_path, index) for index in range(slots)]
+        with ExitStack() as stack:
+            with _file_lock([lock_file_path], fcntl.LOCK_EX, timeout):
+                stack.enter_context(
+                    _file_lock(
+                        [semaphore_lock_path],
+                        fcntl.LOCK_SH,
+                        max(deadline - time.monotonic(), 0),
+                    )
+                )
+            with _file_lock(
+                slot_lock_paths, fcntl.LOCK_EX, max(deadline - time.monotonic(), 0)
+            ) as handler:
+                yield handler
+
+
+def _record_wait(lock_file_path, mode, waited):
+    with _registry_lock:
+        metrics = _lock_wait_metrics.setdefault(
+            (lock_file_path, mode), {'count': 0, 'total': 0.0, 'max': 0.0}
+        )
+        metrics['count'] += 1
+        metrics['total'] += waited
+        metrics['max'] = max(metrics['max'], waited)
+
+
+def _register_held_lock(lock_file_path, mode, count):
+    with _registry_lock:
+        held = _held_locks.setdefault((os.getpid(), lock_file_path), {})
+        held[mode] = held.get(mode, 0) + count
+        if not any(held.values()):
+            del _held_locks[(os.getpid(), lock_file_path)]
+
+
+def get_lock_wait_metrics():
+    """Return the time the process waited for the locks, as a dict of
+    ``count``, ``total`` and ``max`` seconds by lock file path and mode
+    """
+    with _registry_lock:
+        return {key: dict(metrics) for key, metrics in _lock_wait_metrics.items()}
+
+
+@contextmanager
+def _lock(lock_file_path, timeout, mode=EXCLUSIVE, slots=1):
+    """Lock the lock file path in mode, yield the locked file handler, None
+    when there is none to write the process id to
+    """
+    if mode not in LOCK_MODES:
+        raise FunctionLockerError(f'lock mode: "{mode}" not supported')
+    if slots < 1:
+        raise FunctionLockerError(f'the number of semaphore slots must be positive, got {slots}')
+    start = time.monotonic()
+    with _acquire(lock_file_path, timeout, mode, slots) as handler:
+        waited = time.monotonic() - start
+        _record_wait(lock_file_path, mode, waited)
+        logger.info(f'process id: {os.getpid()} waited {waited:.3f}s for {mode} lock')
+        _register_held_lock(lock_file_path, mode, 1)
+        try:
+            yield handler
+        finally:
+            _register_held_lock(lock_file_path, mode, -1)
+
+
 def _write_content(handler, content):
     """write content to locked file"""
+    if handler is None:
+        # the sqlite storage keeps the process id of the lock
+        return
     handler.seek(0)
     handler.truncate()
     if content:
@@ -194,6 +433,8 @@ def lock_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    mode=EXCLUSIVE,
+    slots=1,
 ):
     """Generic function locker, lock any decorated function. Any parallel
      pytest xdist worker will wait for this function to finish
@@ -203,6 +444,8 @@ def lock_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type mode: str
+    :type slots: int
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
@@ -210,6 +453,8 @@ def lock_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :param mode: exclusive, shared with the other shared holders, or semaphore
+    :param slots: the number of holders of a semaphore lock at once
     """
     class_names = []
     class_name = None
@@ -236,9 +481,9 @@ def lock_function(
             process_id = str(os.getpid())
             # to prevent dead lock when recursively calling this function
             # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
+            _check_deadlock(lock_file_path, process_id, mode=mode, slots=slots)
 
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _lock(lock_file_path, timeout, mode=mode, slots=slots) as handler:
                 logger.info(
                     f'process id: {process_id} lock function using file path: {lock_file_path}'
                 )
@@ -270,6 +515,8 @@ def locking_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    mode=EXCLUSIVE,
+    slots=1,
 ):
     """Lock a function in combination with a scope and scope_context.
     Any parallel pytest xdist worker will wait for this function to finish.
@@ -279,6 +526,8 @@ def locking_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type mode: str
+    :type slots: int
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
@@ -286,6 +535,8 @@ def locking_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :param mode: exclusive, shared with the other shared holders, or semaphore
+    :param slots: the number of holders of a semaphore lock at once
     """
     if not getattr(function, '__function_locked__', False):
         raise FunctionLockerError('Cannot ensure locking when using a non locked function')
@@ -297,9 +548,9 @@ def locking_function(
     process_id = str(os.getpid())
     # to prevent dead lock when recursively calling this function
     # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
+    _check_deadlock(lock_file_path, process_id, mode=mode, slots=slots)
 
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _lock(lock_file_path, timeout, mode=mode, slots=slots) as handler:
         logger.info(
             f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
         )
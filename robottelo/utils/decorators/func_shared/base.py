@@ -22,6 +22,7 @@ class BaseStorageHandler:
         """Return the key value"""
         raise NotImplementedError
 
-    def set(self, key, value):
-        """Write the value of key to storage"""
+    def set(self, key, value, timeout=None):
+        """Write the value of key to storage, expiring after timeout seconds
+        if supplied"""
         raise NotImplementedError
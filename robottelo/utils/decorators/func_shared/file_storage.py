@@ -1,9 +1,14 @@
+from contextlib import contextmanager, suppress
+import fcntl
+import json
 import os
+import random
 import tempfile
-
-from pytest_services.locks import file_lock
+import threading
+import time
 
 from robottelo.config import settings
+from robottelo.logging import logger
 from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
 
 TEMP_ROOT_DIR = 'robottelo'
@@ -12,6 +17,24 @@ SHARED_DIR = None
 
 
 LOCK_TIMEOUT = 7200
+# the expired entries are collected at most every GC_INTERVAL seconds by each
+# process, 0 to not collect them in the background
+GC_INTERVAL = 600
+# above this number of key files the entries are compacted in the log file
+MAX_KEY_FILES = 1000
+# the key files not in the index, written before it existed, expire after
+DEFAULT_EXPIRY = 86400
+
+INDEX_FILE_NAME = '.index.json'
+JOURNAL_FILE_NAME = '.index.journal'
+LOG_FILE_PREFIX = '.shared.'
+LOG_FILE_SUFFIX = '.log'
+_MERGING_SUFFIX = '.merging'
+_LOCK_SUFFIX = '.lock'
+_TMP_SUFFIX = '.tmp'
+
+_last_collections = {}
+_last_collections_lock = threading.Lock()
 
 
 def get_temp_dir():
@@ -41,10 +64,93 @@ def _get_root_dir(create=True):
     return SHARED_DIR
 
 
+def _write_atomic(path, text):
+    """Write text to a temporary file renamed to path, the readers get the old
+    or the new content, never a partial one
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f'.{os.path.basename(path)}.', suffix=_TMP_SUFFIX
+    )
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(text, bytes) else 'w') as file_handler:
+            file_handler.write(text)
+            file_handler.flush()
+            os.fsync(file_handler.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _is_current(file_handler, path):
+    """Return whether the file of file_handler is still the one at path"""
+    try:
+        return os.fstat(file_handler.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+@contextmanager
+def _try_lock(path, operation=fcntl.LOCK_EX | fcntl.LOCK_NB):
+    """Lock the file at path with the flock operation, yield its file handler,
+    or None if an other process holds it and operation is not blocking.
+
+    The garbage collection removes the lock files it holds, the file at path is
+    locked again if the locked one was removed or replaced meanwhile.
+    """
+    while True:
+        with open(path, 'a') as file_handler:
+            try:
+                fcntl.flock(file_handler, operation)
+            except BlockingIOError:
+                yield None
+                return
+            if not _is_current(file_handler, path):
+                continue
+            try:
+                yield file_handler
+            finally:
+                fcntl.flock(file_handler, fcntl.LOCK_UN)
+            return
+
+
+@contextmanager
+def _file_lock(path, timeout):
+    """Lock the file at path, and yield its file handler
+
+    :raises TimeoutError: if the lock is not acquired after timeout seconds
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        with _try_lock(path) as file_handler:
+            if file_handler is not None:
+                yield file_handler
+                return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f'Could not lock {path} in {timeout} seconds')
+        time.sleep(random.random() * 0.1 + 0.05)
+
+
 class FileStorageHandler(BaseStorageHandler):
-    """Key value file storage handler."""
+    """Key value file storage handler.
 
-    def __init__(self, root_dir=None, create=True, lock_timeout=LOCK_TIMEOUT):
+    The values are written to a temporary file renamed to the key file, a killed
+    process can not leave a truncated value. The writers append the key expiry
+    to a journal, merged into the index of the keys by the garbage collection
+    running in a background thread, which removes the expired entries and above
+    ``max_key_files`` key files compacts the entries in a log file. The index and
+    the log files are replaced atomically, the readers do not lock them.
+    """
+
+    def __init__(
+        self,
+        root_dir=None,
+        create=True,
+        lock_timeout=LOCK_TIMEOUT,
+        gc_interval=None,
+        max_key_files=None,
+    ):
         if root_dir is None:
             root_dir = _get_root_dir()
 
@@ -53,18 +159,47 @@ class FileStorageHandler(BaseStorageHandler):
 
         self._lock_timeout = lock_timeout
         self._root_dir = root_dir
+        self._gc_interval = GC_INTERVAL if gc_interval is None else gc_interval
+        self._max_key_files = MAX_KEY_FILES if max_key_files is None else max_key_files
+        self._index_cache = (None, {})
 
     @property
     def root_dir(self):
-        return self.root_dir()
+        return self._root_dir
+
+    @property
+    def index_path(self):
+        return os.path.join(self._root_dir, INDEX_FILE_NAME)
+
+    @property
+    def journal_path(self):
+        return os.path.join(self._root_dir, JOURNAL_FILE_NAME)
 
     def get_key_file_path(self, key):
         return os.path.join(self._root_dir, key)
 
     def lock(self, key):
         """Return the storage locker context manager"""
-        lock_key = f'{key}.lock'
-        return file_lock(self.get_key_file_path(lock_key), remove=False, timeout=self._lock_timeout)
+        lock_key = f'{key}{_LOCK_SUFFIX}'
+        return _file_lock(self.get_key_file_path(lock_key), self._lock_timeout)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as file_handler:
+                return json.load(file_handler)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_index(self):
+        """Return the index, loaded again only once replaced, not to be modified"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return {}
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version != self._index_cache[0]:
+            self._index_cache = (version, self._load_index())
+        return self._index_cache[1]
 
     def when_lock_acquired(self, handler):
         """Write the process id to file handler"""
@@ -73,27 +208,203 @@ class FileStorageHandler(BaseStorageHandler):
         handler.write(str(os.getpid()))
         handler.flush()
 
+    def _read_compacted(self, entry):
+        """Return the raw value of an index entry from its log file"""
+        with open(self.get_key_file_path(entry['log']), 'rb') as file_handler:
+            file_handler.seek(entry['offset'])
+            return file_handler.read(entry['size'])
+
+    def _get_compacted(self, key):
+        """Return the raw value of key from the log file"""
+        # the log file of an index read just before a compaction can be removed
+        # since, the entry of the new index is then in the new log file
+        for _ in range(2):
+            entry = self._read_index().get(key)
+            if not entry or 'log' not in entry:
+                return None
+            with suppress(FileNotFoundError):
+                return self._read_compacted(entry).decode()
+        return None
+
     def get(self, key):
         """Return the key value
         :type key: str
         """
-        value = None
-        key_file_path = self.get_key_file_path(key)
-        if os.path.exists(key_file_path):
-            with open(key_file_path) as file_handler:
+        try:
+            with open(self.get_key_file_path(key)) as file_handler:
                 value = file_handler.read()
+        except FileNotFoundError:
+            value = self._get_compacted(key)
 
-        if value is not None:
-            value = self.decode(value)
-        return value
+        if value is None:
+            return None
+        try:
+            return self.decode(value)
+        except ValueError:
+            # a value truncated by a process killed while writing in place
+            logger.warning(f'shared function storage: ignoring the corrupted value of {key}')
+            return None
 
-    def set(self, key, value):
+    def set(self, key, value, timeout=None):
         """Write the value of key
 
         :type key: str
         :type value: object
+        :param timeout: the time in seconds after which the value can be
+            collected, None for never
+        """
+        _write_atomic(self.get_key_file_path(key), self.encode(value))
+        record = {'key': key, 'expiry': time.time() + timeout if timeout is not None else None}
+        # the appends of the processes do not exclude each other, only the
+        # journal rotation by the garbage collection
+        with _try_lock(self.journal_path, fcntl.LOCK_SH) as file_handler:
+            file_handler.write(f'{json.dumps(record)}\n')
+            file_handler.flush()
+        self._schedule_collection()
+
+    def _schedule_collection(self):
+        """Collect the garbage in a background thread, if not done recently"""
+        if not self._gc_interval:
+            return
+        with _last_collections_lock:
+            now = time.monotonic()
+            last_collection = _last_collections.get(self._root_dir)
+            if last_collection is not None and now - last_collection < self._gc_interval:
+                return
+            _last_collections[self._root_dir] = now
+        threading.Thread(
+            target=self.collect_garbage, name='shared-function-gc', daemon=True
+        ).start()
+
+    def collect_garbage(self):
+        """Remove the expired entries and the stale lock and temporary files,
+        and compact the entries if there are more than ``max_key_files`` key files.
+
+        Does nothing if an other process is already collecting.
+        """
+        with _try_lock(self.get_key_file_path(f'.gc{_LOCK_SUFFIX}')) as locked:
+            if not locked:
+                return
+            try:
+                self._collect_garbage()
+            except Exception as err:
+                logger.warning(f'shared function storage garbage collection failed: {err}')
+
+    def _is_stale(self, path):
+        """Return whether the file at path was not modified since the lock timeout"""
+        try:
+            return time.time() - os.stat(path).st_mtime > self._lock_timeout
+        except FileNotFoundError:
+            return False
+
+    def _merge_journal(self, index):
+        """Set the expiry of the keys written since the last collection, the
+        journal is renamed to be merged, and removed once the index is written
+        """
+        merging_path = f'{self.journal_path}{_MERGING_SUFFIX}'
+        if not os.path.exists(merging_path):
+            # a merging journal left by a failed collection is merged first
+            with _try_lock(self.journal_path, fcntl.LOCK_EX):
+                os.replace(self.journal_path, merging_path)
+        with open(merging_path) as file_handler:
+            for line in file_handler:
+                with suppress(ValueError):
+                    record = json.loads(line)
+                    index.setdefault(record['key'], {})['expiry'] = record['expiry']
+        return merging_path
+
+    def _collect_garbage(self):
+        now = time.time()
+        index = self._load_index()
+        merging_path = self._merge_journal(index)
+        key_files = []
+        lock_files = []
+        log_files = []
+        for entry in os.scandir(self._root_dir):
+            if entry.name.startswith('.'):
+                if entry.name.endswith(_TMP_SUFFIX) and self._is_stale(entry.path):
+                    # left by a process killed while writing
+                    with suppress(FileNotFoundError):
+                        os.unlink(entry.path)
+                elif entry.name.startswith(LOG_FILE_PREFIX) and entry.name.endswith(
+                    LOG_FILE_SUFFIX
+                ):
+                    log_files.append(entry.name)
+            elif entry.name.endswith(_LOCK_SUFFIX):
+                lock_files.append(entry.name.removesuffix(_LOCK_SUFFIX))
+            else:
+                key_files.append(entry.name)
+                if entry.name not in index:
+                    index[entry.name] = {'expiry': entry.stat().st_mtime + DEFAULT_EXPIRY}
+        for key, entry in list(index.items()):
+            if entry['expiry'] is None or entry['expiry'] > now:
+                continue
+            with _try_lock(self.get_key_file_path(f'{key}{_LOCK_SUFFIX}')) as locked:
+                if not locked:
+                    # in use
+                    continue
+                with suppress(FileNotFoundError):
+                    os.unlink(self.get_key_file_path(key))
+                del index[key]
+        key_files = [key for key in key_files if key in index]
+        compacted = {}
+        if len(key_files) > self._max_key_files:
+            compacted = self._compact(index, key_files)
+        _write_atomic(self.index_path, json.dumps(index))
+        os.unlink(merging_path)
+        for key, mtime in compacted.items():
+            self._remove_compacted(key, mtime)
+        # the log files replaced, the readers of the previous index look up the
+        # new one when they can not find its log file
+        used_log_files = {entry['log'] for entry in index.values() if 'log' in entry}
+        for log_file in set(log_files) - used_log_files:
+            with suppress(FileNotFoundError):
+                os.unlink(self.get_key_file_path(log_file))
+        # the lock files of the keys without key file, not used recently, the
+        # lockers lock the file again if it is removed once they locked it
+        key_files = set(key_files) - set(compacted)
+        for key in lock_files:
+            lock_path = self.get_key_file_path(f'{key}{_LOCK_SUFFIX}')
+            if key in key_files or not self._is_stale(lock_path):
+                continue
+            with _try_lock(lock_path) as locked:
+                if locked and self._is_stale(lock_path):
+                    os.unlink(lock_path)
+
+    def _compact(self, index, key_files):
+        """Write the values of the key files and of the entries already in a
+        log file to a new log file, and return the modification time of the key
+        files which can be removed
+        """
+        values = {}
+        for key, entry in index.items():
+            if key not in key_files and 'log' in entry:
+                values[key] = self._read_compacted(entry)
+        compacted = {}
+        for key in key_files:
+            key_file_path = self.get_key_file_path(key)
+            with suppress(FileNotFoundError):
+                mtime = os.stat(key_file_path).st_mtime_ns
+                with open(key_file_path, 'rb') as file_handler:
+                    values[key] = file_handler.read()
+                compacted[key] = mtime
+        log_file = f'{LOG_FILE_PREFIX}{time.time_ns()}{LOG_FILE_SUFFIX}'
+        offset = 0
+        for key, value in values.items():
+            index[key].update(log=log_file, offset=offset, size=len(value))
+            offset += len(value) + 1
+        _write_atomic(self.get_key_file_path(log_file), b'\n'.join(values.values()))
+        logger.info(f'shared function storage: compacted {len(values)} entries in the log file')
+        return compacted
+
+    def _remove_compacted(self, key, mtime):
+        """Remove the key file of an entry written to the log file, if not
+        modified since
         """
-        value = self.encode(value)
         key_file_path = self.get_key_file_path(key)
-        with open(key_file_path, 'w') as file_handler:
-            file_handler.write(value)
+        with _try_lock(self.get_key_file_path(f'{key}{_LOCK_SUFFIX}')) as locked:
+            if not locked:
+                return
+            with suppress(FileNotFoundError):
+                if os.stat(key_file_path).st_mtime_ns == mtime:
+                    os.unlink(key_file_path)
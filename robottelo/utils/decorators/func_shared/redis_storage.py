@@ -53,11 +53,13 @@ class RedisStorageHandler(BaseStorageHandler):
             value = self.decode(value)
         return value
 
-    def set(self, key, value):
+    def set(self, key, value, timeout=None):
         """Write the value of key
 
         :type key: str
         :type value: object
+        :param timeout: the time in seconds after which the value expire,
+            None for never
         """
         value = self.encode(value)
-        self.client.set(key, value)
+        self.client.set(key, value, ex=timeout)
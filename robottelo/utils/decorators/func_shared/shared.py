@@ -83,6 +83,35 @@ Usage::
             # create a virtual machine
 
             return dict(org=cls.org, repo=cls.repo}
+
+To reuse the results across test sessions run against a long lived Satellite,
+scope them to the Satellite and validate them before they are returned::
+
+    from robottelo.utils.decorators.func_shared.shared import (
+        bump_satellite_generation,
+        entities_exist,
+        satellite_scope,
+        shared,
+    )
+
+    @shared(
+        scope=satellite_scope,
+        timeout=None,
+        validate=entities_exist(org='Organization', repo='Repository'),
+    )
+    def synced_repo():
+        org = make_org()
+        # upload manifest
+        repo = make_repository()
+        return dict(org=org, repo=repo)
+
+    # the Satellite scope changes with the Satellite version, and when the
+    # Satellite generation is bumped, e.g. after its content was wiped
+    bump_satellite_generation(target_sat)
+
+The Satellite scope is kept by each process for ``satellite_scope_ttl``
+seconds, an upgrade or a generation bump done by an other process takes effect
+in the process after that time.
 """
 
 import datetime
@@ -92,6 +121,7 @@ from importlib import import_module
 import inspect
 import os
 import sys
+import time
 import traceback
 import uuid
 
@@ -99,11 +129,16 @@ from nailgun.entities import Entity
 
 from robottelo.config import setting_is_set, settings
 from robottelo.logging import logger
-from robottelo.utils.decorators.func_shared import file_storage, redis_storage
+from robottelo.utils.decorators.func_shared import file_storage, redis_storage, sqlite_storage
 from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
 from robottelo.utils.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
-_storage_handlers = {'file': FileStorageHandler, 'redis': RedisStorageHandler}
+_storage_handlers = {
+    'file': FileStorageHandler,
+    'redis': RedisStorageHandler,
+    'sqlite': SQLiteStorageHandler,
+}
 
 DEFAULT_STORAGE_HANDLER = 'file'
 # by default using the shared data is disabled
@@ -125,6 +160,14 @@ _DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
 _SERVER_CERT_MD5 = None
 
+# marker stored on the Satellite, changing it invalidates the results shared in
+# the Satellite scope
+SATELLITE_GENERATION_FILE = '/var/lib/robottelo/generation'
+# the Satellite scopes are computed again after this time in seconds
+SATELLITE_SCOPE_TTL = 60
+# the Satellite scopes computed by the process, by hostname, with their expiry
+_satellite_scopes = {}
+
 
 def _set_configured(value):
     global _configured
@@ -138,14 +181,19 @@ def _check_config():
     global NAMESPACE_SCOPE
     global SHARE_DEFAULT_TIMEOUT
     global DEFAULT_CALL_RETRIES
+    global SATELLITE_SCOPE_TTL
     if not _configured and setting_is_set('shared_function'):
         DEFAULT_STORAGE_HANDLER = settings.shared_function.storage
         ENABLED = settings.shared_function.enabled
         NAMESPACE_SCOPE = settings.shared_function.scope
         SHARE_DEFAULT_TIMEOUT = settings.shared_function.share_timeout
         DEFAULT_CALL_RETRIES = settings.shared_function.call_retries
+        SATELLITE_SCOPE_TTL = settings.shared_function.satellite_scope_ttl
         file_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        file_storage.GC_INTERVAL = settings.shared_function.gc_interval
+        file_storage.MAX_KEY_FILES = settings.shared_function.max_key_files
         redis_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        sqlite_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
         redis_storage.REDIS_HOST = settings.shared_function.redis_host
         redis_storage.REDIS_PORT = settings.shared_function.redis_port
         redis_storage.REDIS_DB = settings.shared_function.redis_db
@@ -187,6 +235,96 @@ def _get_default_storage_handler():
     return _storage_handlers.get(DEFAULT_STORAGE_HANDLER)()
 
 
+def get_satellite_generation(satellite):
+    """Return the generation marker of ``satellite``, creating it if missing"""
+    # with noclobber only the first process creating the marker writes it
+    result = satellite.execute(
+        f'mkdir -p {os.path.dirname(SATELLITE_GENERATION_FILE)} && '
+        f'(set -C; uuidgen > {SATELLITE_GENERATION_FILE}) 2>/dev/null; '
+        f'cat {SATELLITE_GENERATION_FILE}'
+    )
+    if result.status != 0 or not result.stdout.strip():
+        raise SharedFunctionError(
+            f'Could not read the generation of {satellite.hostname}: {result.stderr}'
+        )
+    return result.stdout.strip()
+
+
+def bump_satellite_generation(satellite):
+    """Set a new generation marker on ``satellite``, the results shared in its
+    previous scope are not used anymore
+
+    :return: the new generation marker
+    """
+    generation = uuid.uuid4().hex
+    result = satellite.execute(
+        f'mkdir -p {os.path.dirname(SATELLITE_GENERATION_FILE)} '
+        f'&& echo {generation} > {SATELLITE_GENERATION_FILE}'
+    )
+    if result.status != 0:
+        raise SharedFunctionError(
+            f'Could not bump the generation of {satellite.hostname}: {result.stderr}'
+        )
+    _satellite_scopes.pop(satellite.hostname, None)
+    return generation
+
+
+def satellite_scope(satellite=None):
+    """Return a scope bound to the Satellite hostname, version and generation
+
+    To be used as the ``scope`` of a shared function, for its results to be
+    reused by the next test sessions run against the same Satellite. The scope
+    is computed again after ``SATELLITE_SCOPE_TTL`` seconds, or once the
+    process bumped the Satellite generation.
+
+    :param satellite: a ``robottelo.hosts.Satellite``, the default Satellite if
+        not supplied.
+    """
+    _check_config()
+    hostname = satellite.hostname if satellite is not None else settings.server.hostname
+    cached = _satellite_scopes.get(hostname)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    if satellite is None:
+        from robottelo.hosts import Satellite
+
+        satellite = Satellite()
+    text = '|'.join(
+        [satellite.hostname, str(satellite.version), get_satellite_generation(satellite)]
+    )
+    digest = hashlib.sha256(text.encode()).hexdigest()[:16]
+    scope = f'{satellite.hostname}.{digest}'
+    _satellite_scopes[hostname] = (time.monotonic() + SATELLITE_SCOPE_TTL, scope)
+    return scope
+
+
+def entities_exist(satellite=None, **entity_names):
+    """Return a shared function ``validate`` callable, checking that the
+    entities of the result still exist on the Satellite
+
+    :param satellite: a ``robottelo.hosts.Satellite``, the default Satellite if
+        not supplied.
+    :param entity_names: the nailgun entity name of each result key, the result
+        value being an entity json dict, a list of them, or an entity id.
+    """
+
+    def validate(result):
+        target = satellite
+        if target is None:
+            from robottelo.hosts import Satellite
+
+            target = Satellite()
+        for key, entity_name in entity_names.items():
+            values = result[key] if isinstance(result[key], list) else [result[key]]
+            for value in values:
+                entity_id = value['id'] if isinstance(value, dict) else value
+                # raise if the entity does not exist anymore
+                getattr(target.api, entity_name)(id=entity_id).read_json()
+        return True
+
+    return validate
+
+
 class SharedFunctionError(Exception):
     """Shared function related exception"""
 
@@ -213,6 +351,7 @@ class _SharedFunction:
         timeout=SHARE_DEFAULT_TIMEOUT,
         inject=False,
         injected_kw='_inject',
+        validate=None,
     ):
         if storage_handler is None:
             storage_handler = _get_default_storage_handler()
@@ -235,6 +374,7 @@ class _SharedFunction:
         self._max_retries = retries
         self._transaction = uuid.uuid4().hex
         self._share_timeout = timeout
+        self._validate = validate
 
     @property
     def storage(self):
@@ -284,9 +424,20 @@ class _SharedFunction:
         return result, exp, traceback_text
 
     def _has_result_expired(self, creation_datetime):
+        if self._share_timeout is None:
+            return False
         expire_datetime = creation_datetime + datetime.timedelta(seconds=self._share_timeout)
         return datetime.datetime.utcnow() >= expire_datetime
 
+    def _is_result_valid(self, result):
+        if self._validate is None:
+            return True
+        try:
+            return bool(self._validate(result))
+        except Exception as err:
+            logger.info(f'shared function: {self._function_key} result not valid: {err}')
+            return False
+
     def __call__(self):
         # this lock prevent any other process to run the function,
         # and if an other process is running the function, I should wait it
@@ -318,7 +469,8 @@ class _SharedFunction:
                 if state in [_STATE_READY, _STATE_FAILED] and not self._has_result_expired(
                     creation_datetime
                 ):
-                    call_function = False
+                    # a failed call is not validated, to not call it again
+                    call_function = state == _STATE_READY and not self._is_result_valid(result)
                 else:
                     call_function = True
 
@@ -349,7 +501,7 @@ class _SharedFunction:
                         pid=os.getpid(),
                         creation_datetime=creation_datetime,
                     )
-                self.storage.set(self.key, value)
+                self.storage.set(self.key, value, timeout=self._share_timeout)
 
         if call_function and exp:
             # i'am in the first launched process
@@ -473,6 +625,7 @@ def shared(
     function_kw=None,
     inject=False,
     injected_kw='_injected',
+    validate=None,
 ):
     r"""Generic function sharing, share the results of any decorated function.
     Any parallel pytest xdist worker will wait for this function to finish
@@ -486,13 +639,15 @@ def shared(
     :type function_kw: list
     :type inject: bool
     :type injected_kw: str
+    :type validate: callable
 
     :param function_: the function that is intended to be shared
     :param scope: this parameter will define the namespace of data sharing
     :param scope_context: an added context string if applicable, of a concrete
            sharing in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
-    :param timeout: the time in seconds to wait for waiting the shared function
+    :param timeout: the time in seconds to wait for waiting the shared function,
+        None for the stored results to never expire
     :param retries: if the shared function call fail, how much time should
         retry before setting the call with in failure state
     :param function_kw: The function kwargs to use as an additional scope,
@@ -503,6 +658,9 @@ def shared(
         \**kwargs
     :param injected_kw: the kw arg to set to True to inform the function that
         the kwargs was injected from a saved storage
+    :param validate: a callable receiving the stored result before it is
+        reused, when it returns False or raises the function is called again,
+        see :func:`entities_exist`
     """
     _check_config()
     class_names = []
@@ -541,6 +699,7 @@ def shared(
                 retries=retries,
                 inject=inject,
                 injected_kw=injected_kw,
+                validate=validate,
             )
 
             return shared_object()
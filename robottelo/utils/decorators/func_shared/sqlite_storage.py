@@ -0,0 +1,208 @@
+"""SQLite key value storage handler
+
+The values and the advisory locks are kept in a single SQLite database in WAL
+mode, shared by all the processes of the host. Every update is done in a
+``BEGIN IMMEDIATE`` transaction, which takes the database write lock at once,
+and the locks held by a process which died are released.
+
+A lock is held exclusively, shared by many holders, or by up to a number of
+holders as a semaphore.
+"""
+
+from contextlib import contextmanager
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.decorators.func_shared.file_storage import TEMP_ROOT_DIR, get_temp_dir
+
+DB_FILE_NAME = 'coordination.db'
+LOCK_TIMEOUT = 7200
+# the lock acquisition is retried with an exponential backoff between
+LOCK_MIN_POLL_RATE = 0.001
+LOCK_MAX_POLL_RATE = 0.05
+# the time in seconds to wait for the database write lock
+BUSY_TIMEOUT = 60
+
+# the lock modes
+EXCLUSIVE = 'exclusive'
+SHARED = 'shared'
+SEMAPHORE = 'semaphore'
+
+# bumped when the schema changes, the lock tables are then recreated
+SCHEMA_VERSION = 1
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expiry REAL)',
+    'CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expiry)',
+    'CREATE TABLE IF NOT EXISTS lock_holders (name TEXT NOT NULL, owner TEXT NOT NULL, '
+    'pid INTEGER NOT NULL, mode TEXT NOT NULL, acquired REAL NOT NULL, '
+    'PRIMARY KEY (name, owner))',
+)
+
+# the connections of the thread by database path, the handlers are created for
+# every shared function call
+_local = threading.local()
+
+
+def get_db_path():
+    return os.path.join(get_temp_dir(), TEMP_ROOT_DIR, DB_FILE_NAME)
+
+
+def _is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SQLiteStorageHandler(BaseStorageHandler):
+    """SQLite key value storage handler"""
+
+    def __init__(self, db_path=None, lock_timeout=None):
+        if db_path is None:
+            db_path = get_db_path()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db_path = db_path
+        self._lock_timeout = LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    @property
+    def connection(self):
+        """Return the database connection of the current thread and process"""
+        if getattr(_local, 'pid', None) != os.getpid():
+            # not inherited from the parent process
+            _local.connections = {}
+            _local.pid = os.getpid()
+        if self._db_path not in _local.connections:
+            connection = sqlite3.connect(self._db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('BEGIN IMMEDIATE')
+            if connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                connection.execute('DROP TABLE IF EXISTS locks')
+                connection.execute('DROP TABLE IF EXISTS lock_holders')
+                connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.execute('COMMIT')
+            _local.connections[self._db_path] = connection
+        return _local.connections[self._db_path]
+
+    @contextmanager
+    def transaction(self):
+        """Run the statements in a transaction holding the database write lock"""
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _try_lock(self, key, owner, mode, slots):
+        with self.transaction() as connection:
+            modes = []
+            for holder_owner, pid, holder_mode in connection.execute(
+                'SELECT owner, pid, mode FROM lock_holders WHERE name = ?', (key,)
+            ).fetchall():
+                if _is_process_alive(pid):
+                    modes.append(holder_mode)
+                else:
+                    connection.execute(
+                        'DELETE FROM lock_holders WHERE name = ? AND owner = ?', (key, holder_owner)
+                    )
+            if mode == SHARED:
+                blocked = any(holder_mode != SHARED for holder_mode in modes)
+            elif mode == SEMAPHORE:
+                blocked = any(holder_mode != SEMAPHORE for holder_mode in modes) or (
+                    len(modes) >= slots
+                )
+            else:
+                blocked = bool(modes)
+            if blocked:
+                return False
+            connection.execute(
+                'INSERT INTO lock_holders (name, owner, pid, mode, acquired) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, owner, os.getpid(), mode, time.time()),
+            )
+        return True
+
+    @contextmanager
+    def lock(self, key, timeout=None, mode=EXCLUSIVE, slots=1):
+        """Return the storage locker context manager
+
+        :param mode: exclusive, shared with the other shared holders, or
+            semaphore, held by up to slots semaphore holders at once.
+        :param slots: the number of holders of a semaphore lock at once.
+        :raises TimeoutError: if the lock is not acquired after timeout seconds
+        """
+        if mode not in (EXCLUSIVE, SHARED, SEMAPHORE):
+            raise ValueError(f'lock mode: "{mode}" not supported')
+        if timeout is None:
+            timeout = self._lock_timeout
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        poll_rate = LOCK_MIN_POLL_RATE
+        while not self._try_lock(key, owner, mode, slots):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'Could not acquire the lock {key} in {timeout} seconds')
+            time.sleep(poll_rate)
+            poll_rate = min(poll_rate * 2, LOCK_MAX_POLL_RATE)
+        try:
+            yield owner
+        finally:
+            with self.transaction() as connection:
+                connection.execute(
+                    'DELETE FROM lock_holders WHERE name = ? AND owner = ?', (key, owner)
+                )
+
+    def lock_pid(self, key):
+        """Return the id of a process holding the lock of key exclusively, None
+        if not locked
+        """
+        row = self.connection.execute(
+            'SELECT pid FROM lock_holders WHERE name = ? AND mode = ?', (key, EXCLUSIVE)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def when_lock_acquired(self, data):
+        # do nothing
+        pass
+
+    def get(self, key):
+        """Return the key value, None if missing or expired
+
+        :type key: str
+        """
+        row = self.connection.execute(
+            'SELECT value FROM entries WHERE key = ? AND (expiry IS NULL OR expiry > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return self.decode(row[0]) if row is not None else None
+
+    def set(self, key, value, timeout=None):
+        """Write the value of key, and remove the expired values
+
+        :type key: str
+        :type value: object
+        :param timeout: the time in seconds after which the value expire,
+            None for never
+        """
+        now = time.time()
+        with self.transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO entries (key, value, expiry) VALUES (?, ?, ?)',
+                (key, self.encode(value), now + timeout if timeout is not None else None),
+            )
+            connection.execute('DELETE FROM entries WHERE expiry <= ?', (now,))
@@ -0,0 +1,111 @@
+"""Host facts probed over ssh, shared by all the processes of a test run.
+
+The facts of a host are stored in one JSON file per hostname in the robottelo
+tmp dir, together with the boot ID of the host they were probed on. A host
+object reads the boot ID once, with a single ssh call, and then reuses the
+facts stored for that boot, whichever process or host object probed them.
+
+The boot ID is kept on the host object until :func:`forget_boot_id` is called,
+on ``connect()`` and ``clean_cached_properties()``. Anything that reboots a
+host or changes what it runs has to call :func:`invalidate` for that host.
+Only the facts which can not change without a reboot are stored, the OS
+release or the installed versions change on an upgrade of the running host.
+"""
+
+from contextlib import suppress
+from functools import cached_property
+import json
+import os
+from pathlib import Path
+import tempfile
+
+from broker.helpers import FileLock
+
+BOOT_ID_COMMAND = 'cat /proc/sys/kernel/random/boot_id'
+
+# the attribute of the host object holding its boot ID
+BOOT_ID_ATTR = '_host_facts_boot_id'
+
+
+def facts_dir():
+    """Return the directory holding the host facts files"""
+    from robottelo.config import settings
+
+    return Path(settings.robottelo.tmp_dir or tempfile.gettempdir(), 'host_facts')
+
+
+def _facts_file(hostname):
+    return facts_dir().joinpath(f'{hostname}.json')
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(path, data):
+    """Replace ``path`` atomically, readers never see a partial file"""
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps(data))
+    tmp_path.replace(path)
+
+
+def boot_id(host):
+    """Return the boot ID of ``host``, read once per host object, or None if it can not be read"""
+    if BOOT_ID_ATTR not in host.__dict__:
+        result = host.execute(BOOT_ID_COMMAND)
+        host.__dict__[BOOT_ID_ATTR] = result.stdout.strip() if result.status == 0 else None
+    return host.__dict__[BOOT_ID_ATTR]
+
+
+def forget_boot_id(host):
+    """Read the boot ID of ``host`` again on the next fact lookup"""
+    host.__dict__.pop(BOOT_ID_ATTR, None)
+
+
+def get(host, key, probe):
+    """Return the fact ``key`` of ``host``, calling ``probe`` when it is not stored yet
+
+    :param host: a host object with ``hostname`` and ``execute``.
+    :param str key: the name of the fact.
+    :param probe: a callable returning the JSON serializable value of the fact.
+    """
+    from robottelo.config import settings
+
+    if not settings.performance.host_facts.enabled or not (current_boot := boot_id(host)):
+        return probe()
+    path = _facts_file(host.hostname)
+    data = _read(path)
+    if data.get('boot_id') == current_boot and key in data['facts']:
+        return data['facts'][key]
+    value = probe()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(path):
+        data = _read(path)
+        if data.get('boot_id') != current_boot:
+            data = {'boot_id': current_boot, 'facts': {}}
+        data['facts'][key] = value
+        _write(path, data)
+    return value
+
+
+def invalidate(hostname):
+    """Forget the facts of ``hostname``, after a reboot or an upgrade"""
+    path = _facts_file(hostname)
+    with suppress(FileNotFoundError):
+        path.unlink()
+
+
+class cached_host_fact(cached_property):
+    """A ``cached_property`` of a host object, shared with the other processes by :func:`get`"""
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.attrname not in instance.__dict__:
+            instance.__dict__[self.attrname] = get(
+                instance, self.attrname, lambda: self.func(instance)
+            )
+        return instance.__dict__[self.attrname]
@@ -0,0 +1,158 @@
+"""Assign xdist workers to the least loaded Satellites.
+
+Used by the ``least-loaded`` ``server.xdist_behavior``. Every worker probes the
+load of the Satellites, running foreman tasks, requests queued for the foreman
+puma workers and load average, and picks the Satellite with the lowest score,
+counting the workers of the test run already assigned to it.
+
+The assignments of a test run are stored in the robottelo tmp dir, shared by all
+the workers.
+"""
+
+from contextlib import suppress
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from broker.helpers import FileLock
+import requests
+
+from robottelo.logging import logger
+
+LOAD_COMMAND = 'cat /proc/loadavg; nproc; ss -Hlx src /run/foreman.sock'
+# running foreman tasks, or queued requests, worth as much load as one busy CPU
+TASKS_PER_CPU = 20
+QUEUED_PER_CPU = 10
+# the assignments of the test runs which did not clear them are removed after
+STALE_ASSIGNMENTS_AGE = 86400
+
+
+def load_dir():
+    """Return the directory holding the assignments"""
+    from robottelo.config import settings
+
+    return Path(settings.robottelo.tmp_dir or tempfile.gettempdir(), 'satellite_load')
+
+
+def _read(path, default):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return default
+
+
+def _write(path, data):
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps(data, indent=2))
+    tmp_path.replace(path)
+
+
+def satellite_load(satellite):
+    """Return the load signals of ``satellite`` and their score, None if it can not be probed
+
+    :param satellite: a ``robottelo.hosts.Satellite``.
+    """
+    from robottelo.config import settings
+
+    try:
+        result = satellite.execute(LOAD_COMMAND, timeout=30)
+        loadavg, cpus, *sockets = result.stdout.splitlines()
+        # the Recv-Q of the listening socket is the number of queued connections
+        queued = sum(
+            int(fields[fields.index('LISTEN') + 1])
+            for fields in map(str.split, sockets)
+            if 'LISTEN' in fields
+        )
+        response = requests.get(
+            f'{satellite.url}/foreman_tasks/api/tasks',
+            params={'search': 'state = running', 'per_page': 1},
+            auth=(settings.server.admin_username, settings.server.admin_password),
+            verify=settings.server.verify_ca,
+            timeout=30,
+        )
+        response.raise_for_status()
+        load = {
+            'loadavg': float(loadavg.split()[0]),
+            'cpus': int(cpus),
+            'queued': queued,
+            'running_tasks': int(response.json()['subtotal']),
+        }
+    except Exception as err:
+        logger.warning(f'Could not probe the load of {satellite.hostname}: {err}')
+        return None
+    load['score'] = (
+        load['loadavg'] / load['cpus']
+        + load['queued'] / QUEUED_PER_CPU / load['cpus']
+        + load['running_tasks'] / TASKS_PER_CPU / load['cpus']
+    )
+    return load
+
+
+class AssignmentLedger:
+    """The Satellite assignments of a test run
+
+    :param run_id: the ID of the test run, shared by its xdist workers.
+    """
+
+    def __init__(self, run_id, directory=None):
+        self.directory = Path(directory or load_dir())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory.joinpath(f'assignments-{run_id}.json')
+
+    def assignments(self):
+        """Return the assignments of the test run, by worker"""
+        return _read(self.path, {})
+
+    def assign(self, worker, loads):
+        """Assign ``worker`` to the Satellite with the lowest score, and record it
+
+        :param dict loads: the load of every candidate Satellite by hostname, see
+            :func:`satellite_load`, None for the ones which could not be probed.
+        :return: the hostname assigned, None if no Satellite could be probed.
+        """
+        with FileLock(self.path):
+            assignments = self.assignments()
+            assigned = dict.fromkeys(loads, 0)
+            for other in assignments.values():
+                if other['hostname'] in assigned:
+                    assigned[other['hostname']] += 1
+            scores = {
+                hostname: load['score'] + assigned[hostname]
+                for hostname, load in loads.items()
+                if load is not None
+            }
+            if not scores:
+                return None
+            hostname = min(scores, key=scores.get)
+            assignments[worker] = {
+                'hostname': hostname,
+                'score': scores[hostname],
+                'load': loads[hostname],
+            }
+            _write(self.path, assignments)
+        logger.info(f'{worker=}: assigned to {hostname}, Satellite scores: {scores}')
+        return hostname
+
+    def report(self):
+        """Return the lines of the assignments report of the test run"""
+        lines = []
+        for worker, assignment in sorted(self.assignments().items()):
+            load = assignment['load']
+            lines.append(
+                f"{worker}: {assignment['hostname']} score={assignment['score']:.2f}"
+                f" loadavg={load['loadavg']} cpus={load['cpus']} queued={load['queued']}"
+                f" running_tasks={load['running_tasks']}"
+            )
+        return lines
+
+    def clear(self):
+        """Remove the assignments of the test run, and the stale ones of killed test runs,
+        with their lock files
+        """
+        stale = time.time() - STALE_ASSIGNMENTS_AGE
+        for path in self.directory.glob('assignments-*'):
+            with suppress(FileNotFoundError):
+                if path.name.startswith(self.path.name) or path.stat().st_mtime < stale:
+                    path.unlink()
@@ -14,6 +14,9 @@ recoverable, the main watcher will fail and release all other processes.
 It is recommended to use this class as a context manager, as it will automatically register and
 report when the process is done.
 
+On Linux, the waiting processes are notified of the changes of the file with inotify, and wake up as
+soon as the status they wait for is reached. Elsewhere, the file is polled.
+
 Example:
     >>> with SharedResource("target_sat.hostname", upgrade_action, **upgrade_kwargs) as resource:
     ...     # Do pre-upgrade setup steps
@@ -22,13 +25,94 @@ Example:
     ...     # Do post-upgrade cleanup steps if any
 """
 
+from contextlib import suppress
+import ctypes
+import ctypes.util
+import functools
 import json
+import os
 from pathlib import Path
+import select
+import sys
 import time
 from uuid import uuid4
 
 from broker.helpers import FileLock
 
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+# when notified of the changes, the file is still checked at this interval, in case it was replaced
+NOTIFIED_POLL_INTERVAL = 30
+
+
+@functools.cache
+def _libc():
+    """Return the libc providing inotify, None if not available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not (hasattr(libc, "inotify_init1") and hasattr(libc, "inotify_add_watch")):
+        return None
+    return libc
+
+
+class _FileWatcher:
+    """Wait for the changes of a file, notified by inotify when available, polling otherwise.
+
+    Attributes:
+        path (Path): The path of the watched file.
+        poll_interval (float): The time in seconds between two checks when polling.
+        notified (bool): Whether the changes are notified by inotify.
+    """
+
+    def __init__(self, path, poll_interval):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd = None
+        if (libc := _libc()) is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        mask = IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+        if libc.inotify_add_watch(fd, str(path).encode(), mask) < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    @property
+    def notified(self):
+        return self._fd is not None
+
+    def wait(self):
+        """Waits until the file is changed, or for the poll interval when not notified."""
+        if not self.notified:
+            time.sleep(self.poll_interval)
+            return
+        readable, _, _ = select.select([self._fd], [], [], NOTIFIED_POLL_INTERVAL)
+        if readable:
+            # drain the pending events
+            with suppress(BlockingIOError):
+                while os.read(self._fd, 4096):
+                    pass
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 class SharedResourceError(Exception):
     """An exception class for SharedResource errors."""
@@ -68,6 +152,11 @@ class SharedResource:
         self.action_kwargs = action_kwargs
         self.is_recovering = False
 
+    def _read_data(self):
+        """Returns the data of the shared resource."""
+        with self.lock_file:
+            return json.loads(self.resource_file.read_text())
+
     def _update_status(self, status):
         """Updates the status of the shared resource.
 
@@ -112,21 +201,23 @@ class SharedResource:
         Args:
             status (str): The status to wait for.
         """
-        while not self._check_all_status(status):
-            time.sleep(1)
+        with _FileWatcher(self.resource_file, poll_interval=1) as watcher:
+            while not self._check_all_status(status):
+                watcher.wait()
 
     def _wait_for_main_watcher(self):
         """Waits for the main watcher to finish."""
-        while True:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] != "done":
-                time.sleep(60)
-            elif curr_data["main_status"] == "action_error":
-                self._try_take_over()
-            elif curr_data["main_status"] == "error":
-                raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
-            else:
-                break
+        with _FileWatcher(self.resource_file, poll_interval=60) as watcher:
+            while True:
+                curr_data = self._read_data()
+                if curr_data["main_status"] == "action_error":
+                    self._try_take_over()
+                elif curr_data["main_status"] == "error":
+                    raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
+                elif curr_data["main_status"] != "done":
+                    watcher.wait()
+                else:
+                    break
 
     def _try_take_over(self):
         """Tries to take over as the main watcher."""
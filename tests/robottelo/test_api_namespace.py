@@ -0,0 +1,56 @@
+"""Tests for module ``robottelo.host_helpers.api_namespace``."""
+
+from unittest import mock
+
+import pytest
+import requests
+
+from robottelo.host_helpers import api_namespace
+
+
+@pytest.fixture
+def sessions():
+    api_namespace._sessions.clear()
+    yield
+    api_namespace._sessions.clear()
+
+
+@mock.patch('robottelo.config.settings')
+def test_get_session(settings, sessions):
+    """One session is kept per host, with a bounded connection pool"""
+    settings.performance.http_pool.maxsize = 2
+    session = api_namespace.get_session('https://sat.example.com/api/hosts')
+    assert api_namespace.get_session('https://sat.example.com/katello/api/repositories') is session
+    assert api_namespace.get_session('https://capsule.example.com/api/hosts') is not session
+    assert session.get_adapter('https://sat.example.com')._pool_maxsize == 2
+    assert not session.cookies.get_policy().set_ok(mock.Mock(), mock.Mock())
+
+
+@mock.patch('robottelo.host_helpers.api_namespace.get_session')
+def test_session_router(get_session):
+    """Requests go through the session of their host with the requests defaults"""
+    router = api_namespace.SessionRouter()
+    router.post('https://sat.example.com/api/hosts', json={'name': 'host'}, verify=False)
+    get_session.assert_called_once_with('https://sat.example.com/api/hosts')
+    get_session.return_value.request.assert_called_once_with(
+        'post', 'https://sat.example.com/api/hosts', data=None, json={'name': 'host'}, verify=False
+    )
+    router.head('https://sat.example.com/api/status')
+    assert get_session.return_value.request.call_args.kwargs == {'allow_redirects': False}
+    assert router.exceptions is requests.exceptions
+
+
+def test_api_namespace():
+    """Entity classes are created once, with the server config of the namespace"""
+    entities = pytest.importorskip('nailgun.entities')
+    from nailgun.config import ServerConfig
+
+    server_config = ServerConfig('https://sat.example.com')
+    api = api_namespace.APINamespace(server_config)
+    organization = api.Organization
+    assert api.Organization is organization
+    assert organization.__bases__ == (entities.Organization,)
+    assert organization()._server_config is server_config
+    assert 'Organization' in dir(api)
+    with pytest.raises(AttributeError):
+        api.ServerConfig  # noqa: B018
@@ -0,0 +1,54 @@
+"""Tests for the capsule sync waiters of ``robottelo.host_helpers.capsule_mixins``."""
+
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from robottelo.host_helpers.capsule_mixins import CapsuleInfo, wait_for_sync_many
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+class FakeCapsule(CapsuleInfo):
+    """A capsule whose sync finished at ``last_sync_time``, with no active task"""
+
+    def __init__(self, hostname, last_sync_time, failed_tasks=()):
+        self.hostname = hostname
+        self.satellite = mock.Mock()
+        status = {
+            'active_sync_tasks': [],
+            'last_failed_sync_tasks': list(failed_tasks),
+            'last_sync_time': last_sync_time,
+            'last_sync_task': {'ended_at': last_sync_time},
+        }
+        self.nailgun_capsule = mock.Mock(**{'content_get_sync.return_value': status})
+
+
+def test_wait_for_sync_many():
+    """All capsules are verified, with their sync timing"""
+    capsules = [
+        FakeCapsule('capsule1.example.com', '2024-01-01 12:00:30 UTC'),
+        FakeCapsule('capsule2.example.com', '2024-01-01 12:01:00 UTC'),
+    ]
+    results = wait_for_sync_many(capsules, start_time=START)
+    assert list(results) == ['capsule1.example.com', 'capsule2.example.com']
+    assert [result.duration for result in results.values()] == [31, 61]
+    record = results['capsule2.example.com'].as_record()
+    assert record['end_time'] == '2024-01-01 12:01:00 UTC'
+    assert record['failures'] == []
+
+
+def test_wait_for_sync_many_failures():
+    """Failures of any capsule are recorded, and asserted when they must succeed"""
+    capsules = [
+        FakeCapsule('capsule1.example.com', '2024-01-01 12:00:30 UTC'),
+        FakeCapsule('capsule2.example.com', '2024-01-01 11:00:00 UTC'),
+        FakeCapsule('capsule3.example.com', '2024-01-01 12:00:30 UTC', [{'id': 'task'}]),
+    ]
+    results = wait_for_sync_many(capsules, start_time=START, must_succeed=False)
+    assert [result.succeeded for result in results.values()] == [True, False, False]
+    with pytest.raises(AssertionError, match='capsule3.example.com has failed sync tasks'):
+        wait_for_sync_many(capsules, start_time=START)
+    with pytest.raises(AssertionError, match='No active or recent sync'):
+        capsules[1].wait_for_sync(start_time=START)
@@ -1,10 +1,16 @@
 from functools import partial
+import json
+from pathlib import Path
+import subprocess
+import threading
+import time
 import unittest
 from unittest import mock
 
 import pytest
 
-from robottelo.cli.base import Base
+from robottelo.cli import cache, hammer, registry, rest, telemetry
+from robottelo.cli.base import Base, HammerBatch
 from robottelo.exceptions import (
     CLIBaseError,
     CLIDataBaseError,
@@ -12,6 +18,11 @@ from robottelo.exceptions import (
     CLIReturnCodeError,
 )
 
+DATA_DIR = Path(__file__).parent.joinpath('data')
+HAMMER_INFO_DIR = DATA_DIR.joinpath('hammer_info')
+# the API results of the entities of the hammer info corpus, by the same file name
+REST_INFO_CORPUS = sorted(DATA_DIR.joinpath('rest_info').glob('*.json'))
+
 
 class CLIClass(Base):
     """Class used for the username and password lookup tests"""
@@ -252,11 +263,12 @@ class BaseCliTestCase(unittest.TestCase):
     def test_execute_with_raw_response(self, settings, command):
         """Check executed build ssh method and returns raw response"""
         settings.robottelo.locale = 'en_US'
-        settings.performance.time_hammer = False
+        settings.performance.hammer_shell.enabled = False
+        settings.performance.read_cache.enabled = False
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
         response = Base.execute('some_cmd', return_raw_response=True)
-        ssh_cmd = 'LANG=en_US  hammer -v -u admin -p password  some_cmd'
+        ssh_cmd = 'LANG=en_US hammer -v -u admin -p password  some_cmd'
         command.assert_called_once_with(
             ssh_cmd,
             hostname=mock.ANY,
@@ -268,22 +280,79 @@ class BaseCliTestCase(unittest.TestCase):
     @mock.patch('robottelo.cli.base.Base._handle_response')
     @mock.patch('robottelo.cli.base.ssh.command')
     @mock.patch('robottelo.cli.base.settings')
-    def test_execute_with_performance(self, settings, command, handle_resp):
-        """Check executed build ssh method and delegate response handling"""
+    def test_execute_with_telemetry(self, settings, command, handle_resp):
+        """Check executed build ssh method, delegate response handling and record the call"""
         settings.robottelo.locale = 'en_US'
-        settings.performance.timer_hammer = True
+        settings.performance.hammer_shell.enabled = False
+        settings.performance.read_cache.enabled = False
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
-        response = Base.execute('some_cmd', hostname=None, output_format='json')
-        ssh_cmd = 'LANG=en_US time -p hammer -v -u admin -p password --output=json some_cmd'
+        sink = mock.Mock()
+        telemetry.set_sink(sink)
+        try:
+            with mock.patch.multiple(Base, command_base='base', command_sub='list'):
+                response = Base.execute(
+                    'some_cmd', hostname='sat.example.com', output_format='json'
+                )
+        finally:
+            telemetry.set_sink(None)
+        ssh_cmd = 'LANG=en_US hammer -v -u admin -p password --output=json some_cmd'
         command.assert_called_once_with(
             ssh_cmd,
-            hostname=mock.ANY,
+            hostname='sat.example.com',
             output_format='json',
             timeout=None,
         )
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
+        (record,), _ = sink.emit.call_args
+        assert record.command == 'base list'
+        assert record.hostname == 'sat.example.com'
+        assert record.backend == 'ssh'
+        assert record.error is None
+
+    @mock.patch('robottelo.cli.base.hammer_shell.execute')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_ping_not_sent_to_hammer_shell(self, settings, command, shell_execute):
+        """ping reports its failures by its exit status, the hammer shell does not"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.hammer_shell.enabled = True
+        settings.performance.read_cache.enabled = False
+        command.return_value = mock.Mock(status=1, stderr='', stdout='foreman: FAIL\n')
+        with pytest.raises(CLIReturnCodeError):
+            Base.ping()
+        assert not shell_execute.called
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_info_parse_time_recorded(self, settings, command):
+        """The info output parsing is timed in the record of its hammer call"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.hammer_shell.enabled = False
+        settings.performance.read_cache.enabled = False
+        settings.performance.rest_bypass = False
+        command.return_value = mock.Mock(status=0, stderr='', stdout='ID: 1\n')
+        sink = mock.Mock()
+        telemetry.set_sink(sink)
+
+        def parse_info(output):
+            time.sleep(0.05)
+            return {'id': '1'}
+
+        try:
+            with (
+                mock.patch.multiple(Base, command_base='base', command_requires_org=False),
+                mock.patch('robottelo.cli.base.hammer.parse_info', side_effect=parse_info),
+            ):
+                assert Base.info({'id': 1}) == {'id': '1'}
+        finally:
+            telemetry.set_sink(None)
+        (record,), _ = sink.emit.call_args
+        assert sink.emit.call_count == 1
+        assert record.command == 'base info'
+        assert record.parse_time >= 0.05
+        assert telemetry.current() is None
 
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
@@ -387,6 +456,50 @@ class BaseCliTestCase(unittest.TestCase):
             options={'organization-id': 1},
         )
 
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_iter_list(self, construct, execute):
+        """Check iter_list requests the output format and parses rows lazily"""
+        construct.return_value = 'base list --per-page="10000"'
+        execute.return_value = 'ID,Name\n1,a\n2,b\n'
+        rows = Base.iter_list()
+        assert Base.command_sub == 'list'
+        construct.assert_called_once_with({'per-page': 10000})
+        execute.assert_called_once_with('--output=csv base list --per-page="10000"')
+        assert next(rows) == {'id': '1', 'name': 'a'}
+        assert list(rows) == [{'id': '2', 'name': 'b'}]
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_paginate(self, lst_method):
+        """Check paginate walks the pages until a partial page is returned"""
+        lst_method.side_effect = [[1, 2], [3, 4], [5]]
+        pages = Base.paginate({'organization-id': 1, 'per-page': 10000}, per_page=2)
+        assert next(pages) == [1, 2]
+        assert lst_method.call_count == 1
+        assert list(pages) == [[3, 4], [5]]
+        lst_method.assert_has_calls(
+            [
+                mock.call(
+                    {'organization-id': 1, 'page': page, 'per-page': 2},
+                    per_page=False,
+                    output_format='csv',
+                )
+                for page in (1, 2, 3)
+            ]
+        )
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_all_prefetch(self, lst_method):
+        """Check iter_all yields the rows of all pages with prefetching"""
+        lst_method.side_effect = [[1, 2], [3, 4], {}]
+        assert list(Base.iter_all(per_page=2, prefetch=True)) == [1, 2, 3, 4]
+        assert lst_method.call_count == 3
+
+    def test_iter_list_unsupported_format(self):
+        """Check iter_list only accepts streamable output formats"""
+        with pytest.raises(CLIError, match='Unsupported output format'):
+            Base.iter_list(output_format='yaml')
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_puppet_classes(self, construct, execute):
@@ -453,6 +566,279 @@ class BaseCliTestCase(unittest.TestCase):
         )
 
 
+class HammerBatchTestCase(unittest.TestCase):
+    """Tests for running hammer commands in a batch"""
+
+    @staticmethod
+    def run_script(cmd, **kwargs):
+        """Run the batch script locally instead of on the Satellite"""
+        process = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        return mock.Mock(stdout=process.stdout, stderr=process.stderr, status=process.returncode)
+
+    def test_script_round_trip(self):
+        """Each command gets its own stdout, stderr and status"""
+        batch = HammerBatch()
+        script = batch._script(['echo out; echo err >&2', 'printf "a\\nb"; exit 3', 'true'])
+        results = batch._parse(self.run_script(script).stdout)
+        assert results[0].stdout == 'out\n'
+        assert results[0].stderr == 'err\n'
+        assert results[0].status == 0
+        assert results[1].stdout == 'a\nb'
+        assert results[1].status == 3
+        assert results[2].stdout == ''
+        assert results[2].status == 0
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_batch(self, settings, command):
+        """Batched commands run in one ssh call and keep their own results"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.hammer_shell.enabled = False
+        settings.performance.read_cache.enabled = False
+        command.side_effect = self.run_script
+
+        class Echo(Base):
+            command_base = 'echo'
+
+        with mock.patch.object(Echo, '_get_username_password', return_value=(None, None)):
+            with Base.batch() as batch:
+                first = Echo.execute('; echo first')
+                with pytest.raises(CLIError, match='was not executed yet'):
+                    first.result  # noqa: B018
+                Echo.execute('; exit 70')
+                Echo.execute('; echo "ID,Name"; echo "1,x"', output_format='csv')
+        assert command.call_count == 1
+        assert batch.results[0] is first
+        failed, listed = batch.results[1:]
+        assert first.result.endswith('first\n')
+        with pytest.raises(CLIReturnCodeError):
+            failed.result  # noqa: B018
+        assert listed.result == [{'id': '1', 'name': 'x'}]
+
+
+class HammerExecutorTestCase(unittest.TestCase):
+    """Tests for running hammer commands concurrently"""
+
+    class Echo(Base):
+        command_base = 'echo'
+        command_requires_org = False
+
+        @classmethod
+        def execute(cls, command, **kwargs):
+            # wait for the other calls, so they all set command_sub before reading it
+            cls.barrier.wait(timeout=5)
+            if cls.command_sub == 'delete':
+                raise CLIReturnCodeError(70, 'error', 'delete failed')
+            return [{'sub': cls.command_sub}]
+
+    def setUp(self):
+        self.Echo.barrier = threading.Barrier(3)
+
+    def test_submit(self):
+        """Concurrent calls keep their own subcommand and exceptions"""
+        with Base.concurrent(max_workers=3) as executor:
+            listed = executor.submit(self.Echo.list, per_page=False)
+            info = executor.submit(self.Echo.info, {'id': 1}, output_format='json')
+            deleted = executor.submit(self.Echo.delete, {'id': 1})
+        assert listed.result() == [{'sub': 'list'}]
+        assert info.result() == [{'sub': 'info'}]
+        with pytest.raises(CLIReturnCodeError):
+            deleted.result()
+        assert 'command_sub' not in vars(self.Echo)
+
+    def test_map(self):
+        """map returns the results in the order of the arguments"""
+        with Base.concurrent(max_workers=3) as executor:
+            results = executor.map(self.Echo.list, [None] * 3)
+        assert results == [[{'sub': 'list'}]] * 3
+
+
+class ReadCacheTestCase(unittest.TestCase):
+    """Tests for caching the info and list outputs"""
+
+    class Repository(Base):
+        command_base = 'repository'
+        command_requires_org = False
+
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_info_cached_until_write(self, settings, command):
+        """info outputs are reused until a write subcommand runs for the same resource"""
+        settings.robottelo.locale = 'en_US'
+        settings.server.hostname = 'cached.example.com'
+        settings.performance.hammer_shell.enabled = False
+        settings.performance.rest_bypass = False
+        settings.performance.read_cache.enabled = True
+        settings.performance.read_cache.ttl = 60
+        settings.performance.read_cache.maxsize = 8
+        command.return_value = mock.Mock(status=0, stderr='', stdout='ID: 1\nName: repo\n')
+        with mock.patch('robottelo.config.settings', settings):
+            first = self.Repository.info({'id': 1})
+        first['name'] = 'changed'
+        assert self.Repository.info({'id': 1}) == {'id': '1', 'name': 'repo'}
+        assert command.call_count == 1
+        self.Repository.info({'id': 2})
+        assert command.call_count == 2
+        self.Repository.delete({'id': 2})
+        self.Repository.info({'id': 1})
+        assert command.call_count == 4
+        stats = cache.stats()['cached.example.com']
+        assert stats['hits'] == 1
+        assert stats['misses'] == 3
+        assert stats['invalidations'] == 1
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_batched_write_invalidates(self, settings, command):
+        """A write queued in a batch drops the cached outputs of its resource"""
+        settings.robottelo.locale = 'en_US'
+        settings.server.hostname = 'batched.example.com'
+        settings.performance.hammer_shell.enabled = False
+        settings.performance.rest_bypass = False
+        settings.performance.read_cache.enabled = True
+        settings.performance.read_cache.ttl = 60
+        settings.performance.read_cache.maxsize = 8
+        command.return_value = mock.Mock(status=0, stderr='', stdout='ID: 1\nName: repo\n')
+        with mock.patch('robottelo.config.settings', settings):
+            self.Repository.info({'id': 1})
+            with Base.batch():
+                self.Repository.delete({'id': 1})
+            assert command.call_count == 2
+            self.Repository.info({'id': 1})
+        assert command.call_count == 3
+        assert cache.stats()['batched.example.com']['hits'] == 0
+
+    def test_ttl_and_lru(self):
+        read_cache = cache.HammerReadCache(maxsize=2, ttl=60)
+        read_cache.put('repository', 'a', [1])
+        read_cache.put('content-view version', 'b', [2])
+        assert read_cache.get('repository', 'a') == [1]
+        read_cache.put('repository', 'c', [3])
+        assert read_cache.get('content-view version', 'b') is cache.MISSING
+        assert read_cache.stats['evictions'] == 1
+        read_cache.ttl = -1
+        read_cache.put('content-view', 'd', [4])
+        assert read_cache.get('content-view', 'd') is cache.MISSING
+        read_cache.invalidate('repository')
+        assert read_cache.stats['size'] == 0
+
+
+class RestBypassTestCase(unittest.TestCase):
+    """Tests for serving read-only helpers from the REST API"""
+
+    class Org(Base):
+        command_base = 'organization'
+        command_requires_org = False
+        rest_bypass = True
+
+    class Repository(Base):
+        command_base = 'repository'
+        command_requires_org = False
+        rest_bypass = True
+
+    @staticmethod
+    def mock_api(results):
+        api = mock.Mock(resources=['organizations', 'repositories'])
+        resource = api.resource.return_value
+        resource.actions = ['index', 'show']
+        params = []
+        for name in ('id', 'search', 'organization_id', 'per_page'):
+            params.append(mock.Mock())
+            params[-1].name = name
+        resource.action.return_value.params = params
+        resource.call.return_value = results
+        return api
+
+    def test_resource_name(self):
+        assert rest.resource_name(self.Repository) == 'repositories'
+        assert rest.resource_name(type('CV', (Base,), {'command_base': 'content-view'})) == (
+            'content_views'
+        )
+
+    @mock.patch('robottelo.cli.rest.get_api')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_list(self, execute, get_api):
+        """list results are served by the index action, with the hammer CSV fields"""
+        get_api.return_value = self.mock_api(
+            {
+                'results': [
+                    {
+                        'id': 1,
+                        'title': 'Default Organization',
+                        'name': 'Default Organization',
+                        'description': None,
+                        'label': 'Default_Organization',
+                        'created_at': '2024-03-01 09:40:02 UTC',
+                    }
+                ]
+            }
+        )
+        result = self.Org.list({'search': 'name=\\"Default Organization\\"'})
+        assert result == hammer.parse_csv(
+            'Id,Title,Name,Description,Label\n'
+            '1,Default Organization,Default Organization,,Default_Organization\n'
+        )
+        get_api.return_value.resource.return_value.call.assert_called_once_with(
+            'index', {'search': 'name="Default Organization"', 'per_page': 10000}
+        )
+        assert not execute.called
+
+    @mock.patch('robottelo.cli.rest.get_api')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_info_matches_hammer(self, execute, get_api):
+        """info results are served by the show action, as hammer info is parsed"""
+        for path in REST_INFO_CORPUS:
+            get_api.return_value = self.mock_api(json.loads(path.read_text()))
+            expected = json.loads(HAMMER_INFO_DIR.joinpath(path.name).read_text())
+            assert self.Org.info({'id': 1}) == expected
+        assert not execute.called
+
+    @mock.patch('robottelo.cli.rest.get_api')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_falls_back_to_hammer(self, execute, get_api):
+        """Options without an API counterpart, and resources without hammer fields,
+        are served by hammer
+        """
+        get_api.return_value = self.mock_api({})
+        with mock.patch('robottelo.cli.base.hammer.parse_info') as parse_info:
+            result = self.Org.info({'name': 'org', 'fields': 'Name'})
+        assert result is parse_info.return_value
+        assert execute.call_count == 1
+        assert not get_api.return_value.resource.return_value.call.called
+        assert self.Repository.list({'organization-id': 1}) is execute.return_value
+        assert get_api.call_count == 1
+
+
+class CLINamespaceTestCase(unittest.TestCase):
+    """Tests for binding the CLI classes to a host"""
+
+    def test_cli_classes(self):
+        """Classes are registered under the module defining them"""
+        classes = registry.cli_classes('repository')
+        assert classes['Repository'].__module__ == 'robottelo.cli.repository'
+        assert classes['RepositorySet'].__module__ == 'robottelo.cli.repository_set'
+        assert classes['Base'] is Base
+        assert registry.cli_classes('repository') is classes
+
+    def test_namespace(self):
+        """Host classes are created once, on first access"""
+        cli = registry.CLINamespace(prefix='repository', hostname='sat.example.com')
+        assert 'Repository' not in vars(cli)
+        repository = cli.Repository
+        assert repository is cli.Repository
+        assert repository.hostname == 'sat.example.com'
+        assert repository.__bases__ == (registry.cli_classes('repository')['Repository'],)
+        assert 'RepositorySet' in dir(cli)
+        with pytest.raises(AttributeError):
+            cli.ContentView  # noqa: B018
+        cli.set_attributes(omitting_credentials=True)
+        assert repository.omitting_credentials
+        assert cli.RepositorySet.omitting_credentials
+
+
 class CLIErrorTests(unittest.TestCase):
     """Tests for the CLIError cli class"""
 
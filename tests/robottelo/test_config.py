@@ -0,0 +1,33 @@
+"""Tests for the settings snapshot of module ``robottelo.config``."""
+
+from dynaconf.utils.parse_conf import Formatters, Lazy
+import pytest
+
+from robottelo import config
+
+
+def test_settings_snapshot_key(monkeypatch):
+    """The key changes with the environment variables read by dynaconf"""
+    key = config.settings_snapshot_key()
+    assert config.settings_snapshot_key() == key
+    monkeypatch.setenv('UNRELATED_VARIABLE', 'value')
+    assert config.settings_snapshot_key() == key
+    monkeypatch.setenv('ROBOTTELO_SERVER__HOSTNAME', 'sat.example.com')
+    assert config.settings_snapshot_key() != key
+
+
+def test_snapshot_value():
+    """Lazy values are stored in their dynaconf notation"""
+    lazy = Lazy('{this.robottelo_dir}/data', formatter=Formatters.python_formatter)
+    assert config._snapshot_value(lazy) == '@format {this.robottelo_dir}/data'
+    with pytest.raises(TypeError):
+        config._snapshot_value(object())
+
+
+def test_load_settings_snapshot(monkeypatch, tmp_path):
+    """A stored snapshot is loaded without reading the settings files"""
+    monkeypatch.setattr(config, 'SETTINGS_SNAPSHOT_DIR', tmp_path)
+    assert config.load_settings_snapshot('key') is None
+    tmp_path.joinpath('key.json').write_text('{"SERVER": {"HOSTNAME": "sat.example.com"}}')
+    settings = config.load_settings_snapshot('key')
+    assert settings.server.hostname == 'sat.example.com'
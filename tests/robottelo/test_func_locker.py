@@ -7,6 +7,7 @@ import time
 import pytest
 
 from robottelo.utils.decorators import func_locker
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
 
 _this_module_name_string = 'tests.robottelo.test_func_locker'
 
@@ -113,6 +114,40 @@ def simple_recursive_combined_function():
     return 'I should not be reached'
 
 
+@func_locker.lock_function(mode=func_locker.SHARED)
+def simple_shared_locked_function():
+    """Hold the shared lock for a while, and return when it was held"""
+    start = time.time()
+    time.sleep(0.3)
+    return start, time.time()
+
+
+@func_locker.lock_function(mode=func_locker.SEMAPHORE, slots=2)
+def simple_semaphore_locked_function(index=None):
+    """Hold a semaphore slot for a while, and return when it was held"""
+    start = time.time()
+    time.sleep(0.3)
+    return start, time.time()
+
+
+def hold_sqlite_lock(lock_file_path, seconds):
+    """Hold the sqlite storage lock of lock_file_path for a while"""
+    with SQLiteStorageHandler().lock(lock_file_path):
+        time.sleep(seconds)
+
+
+def simple_recursive_shared_function():
+    """Try to lock exclusively a function locked shared by the same process, an
+    exception should be expected
+    """
+    with (
+        func_locker.locking_function(simple_shared_locked_function, mode=func_locker.SHARED),
+        func_locker.locking_function(simple_shared_locked_function),
+    ):
+        pass
+    return 'I should not be reached'
+
+
 @func_locker.lock_function
 def simple_function_to_lock():
     """Read the lock file and return it"""
@@ -413,6 +448,112 @@ class TestFuncLocker:
         )
         assert os.path.exists(lock_file_path)
 
+    def test_shared_lock(self, count_and_pool):
+        """Ensure that the shared holders hold the lock together, once the
+        exclusive holder released it
+        """
+        with func_locker.locking_function(
+            simple_shared_locked_function, mode=func_locker.EXCLUSIVE
+        ):
+            results = [count_and_pool.apply_async(simple_shared_locked_function) for _ in range(4)]
+            time.sleep(0.5)
+            released = time.time()
+        spans = [result.get(timeout=10) for result in results]
+        assert min(start for start, _ in spans) >= released
+        assert max(start for start, _ in spans) < min(end for _, end in spans)
+
+    def test_semaphore_lock(self, count_and_pool):
+        """Ensure that no more than the semaphore slots hold the lock at once"""
+        spans = count_and_pool.map(simple_semaphore_locked_function, range(4))
+        for start, _ in spans:
+            assert sum(1 for other_start, end in spans if other_start <= start < end) <= 2
+        assert max(end for _, end in spans) - min(start for start, _ in spans) >= 0.6
+
+    def test_semaphore_and_shared_locks(self, count_and_pool):
+        """Ensure that the semaphore holders and the shared holders wait for
+        each other to release the lock
+        """
+        for function, mode in (
+            (simple_shared_locked_function, func_locker.SEMAPHORE),
+            (simple_semaphore_locked_function, func_locker.SHARED),
+        ):
+            with func_locker.locking_function(function, mode=mode, slots=2):
+                results = [count_and_pool.apply_async(function) for _ in range(2)]
+                time.sleep(0.5)
+                released = time.time()
+            spans = [result.get(timeout=10) for result in results]
+            assert min(start for start, _ in spans) >= released
+
+    def test_recursive_shared_lock(self):
+        """Ensure that locking exclusively a function locked shared by the same
+        process is detected, and that the wait times are recorded
+        """
+        with pytest.raises(func_locker.FunctionLockerError, match=r'.*recursion detected.*'):
+            simple_recursive_shared_function()
+        lock_file_path = _get_function_lock_path('simple_shared_locked_function')
+        metrics = func_locker.get_lock_wait_metrics()[(lock_file_path, func_locker.SHARED)]
+        assert metrics['count'] >= 1
+        assert metrics['max'] >= 0
+
+    def test_sqlite_lock_storage(self):
+        """Ensure that with the sqlite lock storage the process id of the lock
+        is stored in the database, and that the recursion is detected
+        """
+        func_locker.set_lock_storage('sqlite')
+        lock_file_path = _get_function_lock_path('simple_function_to_lock')
+        try:
+            with func_locker.locking_function(simple_function_to_lock) as handler:
+                assert handler is None
+                assert SQLiteStorageHandler().lock_pid(lock_file_path) == os.getpid()
+                with pytest.raises(
+                    func_locker.FunctionLockerError, match=r'.*recursion detected.*'
+                ):
+                    simple_function_to_lock()
+            assert SQLiteStorageHandler().lock_pid(lock_file_path) is None
+        finally:
+            func_locker.set_lock_storage(None)
+
+    def test_sqlite_semaphore_reentry(self):
+        """Ensure that with the sqlite lock storage a process holding a slot of
+        a semaphore takes the free ones, and that the recursion is detected once
+        it holds them all
+        """
+        func_locker.set_lock_storage('sqlite')
+        try:
+            with (
+                func_locker.locking_function(
+                    simple_semaphore_locked_function, mode=func_locker.SEMAPHORE, slots=2
+                ),
+                func_locker.locking_function(
+                    simple_semaphore_locked_function, mode=func_locker.SEMAPHORE, slots=2
+                ),
+            ):
+                with pytest.raises(
+                    func_locker.FunctionLockerError, match=r'.*recursion detected.*'
+                ):
+                    simple_semaphore_locked_function()
+        finally:
+            func_locker.set_lock_storage(None)
+
+    def test_sqlite_lock_timeout(self, count_and_pool):
+        """Ensure that with the sqlite lock storage a lock timeout raises the
+        function locker error
+        """
+        func_locker.set_lock_storage('sqlite')
+        lock_file_path = _get_function_lock_path('simple_function_to_lock')
+        try:
+            result = count_and_pool.apply_async(hold_sqlite_lock, (lock_file_path, 1))
+            while SQLiteStorageHandler().lock_pid(lock_file_path) is None:
+                time.sleep(0.01)
+            with (
+                pytest.raises(func_locker.FunctionLockerError, match=r'timeout.*'),
+                func_locker.locking_function(simple_function_to_lock, timeout=0.1),
+            ):
+                pass
+            result.get(timeout=10)
+        finally:
+            func_locker.set_lock_storage(None)
+
     def test_negative_with_locking_not_locked(self):
         with (
             pytest.raises(func_locker.FunctionLockerError, match=r'.*Cannot ensure locking.*'),
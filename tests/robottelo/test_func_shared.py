@@ -1,6 +1,7 @@
 import multiprocessing
 import os
 import time
+from unittest import mock
 
 from fauxfactory import gen_integer, gen_string
 import pytest
@@ -13,8 +14,11 @@ from robottelo.utils.decorators.func_shared.file_storage import (
 from robottelo.utils.decorators.func_shared.shared import (
     _NAMESPACE_SCOPE_KEY_TYPE,
     SharedFunctionException,
+    _satellite_scopes,
     _set_configured,
+    bump_satellite_generation,
     enable_shared_function,
+    satellite_scope,
     set_default_scope,
     shared,
 )
@@ -143,6 +147,12 @@ def basic_shared_counter_string(prefix='', suffix='', counter=0, increment_by=1)
     return f'{prefix}_{counter + increment_by}_{suffix}'
 
 
+@shared(timeout=None, validate=lambda result: result['valid'])
+def shared_counter_validated(index=0, valid=True):
+    """return a result that is reused only when valid"""
+    return {'index': index + 1, 'valid': valid}
+
+
 class NotRestorableException(Exception):
     """this exception is not restorable as need mote args"""
 
@@ -554,3 +564,42 @@ class TestFuncShared:
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             assert inc_string == inc_string_2
+
+    def test_validate(self):
+        """Test that a result not valid anymore is not reused"""
+        counter_value = gen_integer(min_value=2, max_value=10000)
+        result = shared_counter_validated(index=counter_value, valid=False)
+        assert result['index'] == counter_value + 1
+        # the stored result is not valid, the function is called again
+        result = shared_counter_validated(index=counter_value + 1)
+        assert result['index'] == counter_value + 2
+        # the stored result is valid and never expire
+        result = shared_counter_validated(index=counter_value + 10)
+        assert result['index'] == counter_value + 2
+
+
+def test_satellite_scope():
+    """Test that the satellite scope changes with the Satellite version and
+    generation, once the scope of the process expired
+    """
+    satellite = mock.Mock(hostname=f'{gen_string("alpha")}.example.com', version='6.16.0')
+    satellite.execute.return_value = mock.Mock(status=0, stdout='generation-1\n')
+    scope = satellite_scope(satellite)
+    assert scope.startswith(f'{satellite.hostname}.')
+    satellite.version = '6.17.0'
+    assert satellite_scope(satellite) == scope
+    assert satellite.execute.call_count == 1
+    # the scope of the process expired
+    _satellite_scopes.clear()
+    assert satellite_scope(satellite) != scope
+    satellite.version = '6.16.0'
+    # the generation is read again, a bump from an other process is seen
+    satellite.execute.return_value = mock.Mock(status=0, stdout='generation-2\n')
+    _satellite_scopes.clear()
+    assert satellite_scope(satellite) != scope
+    scope = satellite_scope(satellite)
+    bump_satellite_generation(satellite)
+    assert 'generation' in satellite.execute.call_args.args[0]
+    # a bump of the process is seen at once
+    satellite.execute.return_value = mock.Mock(status=0, stdout='generation-3\n')
+    assert satellite_scope(satellite) != scope
@@ -0,0 +1,146 @@
+import fcntl
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SQLiteStorageHandler
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileStorageHandler(root_dir=str(tmp_path), gc_interval=0, max_key_files=2)
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    return SQLiteStorageHandler(db_path=str(tmp_path / 'coordination.db'), lock_timeout=0.2)
+
+
+def test_set_is_atomic(storage, tmp_path):
+    """Test that the values are renamed in place, and their expiry journaled"""
+    storage.set('key', {'index': 1}, timeout=60)
+    assert storage.get('key') == {'index': 1}
+    assert sorted(os.listdir(tmp_path)) == ['.index.journal', 'key']
+    storage.collect_garbage()
+    assert sorted(os.listdir(tmp_path)) == ['.gc.lock', '.index.json', 'key']
+    assert storage._read_index()['key']['expiry'] > time.time()
+    # a value truncated before the writes were atomic is ignored
+    tmp_path.joinpath('truncated').write_text('{"index": ')
+    assert storage.get('truncated') is None
+    assert storage.get('missing') is None
+
+
+def test_collect_expired(storage, tmp_path):
+    """Test that the expired entries and their stale lock files are removed"""
+    storage.set('expired', 1, timeout=0)
+    storage.set('valid', 2)
+    with storage.lock('expired'):
+        pass
+    storage.collect_garbage()
+    # the lock file is used recently
+    assert storage.get('expired') is None
+    assert tmp_path.joinpath('expired.lock').exists()
+    stale = time.time() - 2 * storage._lock_timeout
+    os.utime(tmp_path.joinpath('expired.lock'), (stale, stale))
+    storage.collect_garbage()
+    assert not tmp_path.joinpath('expired.lock').exists()
+    assert storage.get('valid') == 2
+
+
+def test_lock_removed_lock_file(storage, tmp_path, monkeypatch):
+    """Test that a lock file removed once locked is locked again"""
+    lock_path = tmp_path.joinpath('key.lock')
+    flock = fcntl.flock
+    removed = []
+
+    def flock_and_remove(file_handler, operation):
+        flock(file_handler, operation)
+        if not removed:
+            removed.append(os.fstat(file_handler.fileno()).st_ino)
+            lock_path.unlink()
+
+    monkeypatch.setattr(fcntl, 'flock', flock_and_remove)
+    with storage.lock('key') as file_handler:
+        assert os.fstat(file_handler.fileno()).st_ino == lock_path.stat().st_ino
+        assert removed
+
+
+def test_compaction(storage, tmp_path):
+    """Test that above max_key_files the entries are moved to the log file"""
+    for index in range(3):
+        storage.set(f'key{index}', {'index': index})
+    storage.collect_garbage()
+    assert not any(tmp_path.joinpath(f'key{index}').exists() for index in range(3))
+    assert [storage.get(f'key{index}') for index in range(3)] == [{'index': i} for i in range(3)]
+    # a new value takes precedence over the compacted one
+    storage.set('key1', 'new')
+    assert storage.get('key1') == 'new'
+    for index in range(3, 6):
+        storage.set(f'key{index}', index)
+    storage.collect_garbage()
+    assert storage.get('key0') == {'index': 0}
+    assert storage.get('key1') == 'new'
+    assert storage.get('key5') == 5
+
+
+def test_sqlite_get_set(sqlite_storage):
+    """Test that the values are stored, and not returned once expired"""
+    sqlite_storage.set('key', {'index': 1})
+    sqlite_storage.set('expired', 1, timeout=0)
+    assert sqlite_storage.get('key') == {'index': 1}
+    assert sqlite_storage.get('expired') is None
+    assert sqlite_storage.get('missing') is None
+    assert sqlite_storage.connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+
+
+def test_sqlite_lock(sqlite_storage):
+    """Test that the lock is exclusive, and taken over from a dead process"""
+    errors = []
+
+    def lock():
+        try:
+            with sqlite_storage.lock('key'):
+                pass
+        except TimeoutError as err:
+            errors.append(err)
+
+    with sqlite_storage.lock('key'):
+        assert sqlite_storage.lock_pid('key') == os.getpid()
+        thread = threading.Thread(target=lock)
+        thread.start()
+        thread.join()
+    assert len(errors) == 1
+    assert sqlite_storage.lock_pid('key') is None
+    process = subprocess.Popen(['true'])
+    process.wait()
+    with sqlite_storage.transaction() as connection:
+        connection.execute(
+            'INSERT INTO lock_holders (name, owner, pid, mode, acquired) '
+            "VALUES ('key', 'dead', ?, 'exclusive', 0)",
+            (process.pid,),
+        )
+    with sqlite_storage.lock('key'):
+        assert sqlite_storage.lock_pid('key') == os.getpid()
+
+
+def test_sqlite_shared_and_semaphore_lock(sqlite_storage):
+    """Test that the shared holders exclude the exclusive ones, and that a
+    semaphore admits up to slots holders
+    """
+    with sqlite_storage.lock('key', mode='shared'), sqlite_storage.lock('key', mode='shared'):
+        assert sqlite_storage.lock_pid('key') is None
+        with pytest.raises(TimeoutError), sqlite_storage.lock('key'):
+            pass
+    with (
+        sqlite_storage.lock('key', mode='semaphore', slots=2),
+        sqlite_storage.lock('key', mode='semaphore', slots=2),
+    ):
+        assert sqlite_storage.lock_pid('key') is None
+        with pytest.raises(TimeoutError), sqlite_storage.lock('key', mode='semaphore', slots=2):
+            pass
+        with pytest.raises(TimeoutError), sqlite_storage.lock('key', mode='shared'):
+            pass
@@ -1,7 +1,14 @@
 """Tests for Robottelo's hammer helpers"""
 
+import json
+from pathlib import Path
+
+import pytest
+
 from robottelo.cli import hammer
 
+INFO_CORPUS = sorted(Path(__file__).parent.joinpath('data', 'hammer_info').glob('*.txt'))
+
 
 class TestParseCSV:
     """Tests for parsing CSV hammer output"""
@@ -23,6 +30,18 @@ class TestParseCSV:
             {'header': 'unicode', 'header-2': 'chårs'},
         ]
 
+    def test_iter_csv_chunks(self):
+        """Rows are yielded from output chunks as they arrive"""
+        output = 'ID,Name\n1,"multi word, with comma"\n2,other\n'
+        chunks = (output[i : i + 3] for i in range(0, len(output), 3))
+        rows = hammer.iter_csv(chunks)
+        assert next(rows) == {'id': '1', 'name': 'multi word, with comma'}
+        assert list(rows) == [{'id': '2', 'name': 'other'}]
+        assert hammer.parse_csv(output) == list(hammer.iter_csv(output))
+
+    def test_iter_csv_empty(self):
+        assert list(hammer.iter_csv('')) == []
+
 
 class TestParseJSON:
     """Tests for parsing JSON hammer output"""
@@ -109,6 +128,32 @@ class TestParseJSON:
 
         assert hammer.parse_json(json_output) == hammer.parse_csv(csv_ouput_lines)[0]
 
+    def test_iter_json(self):
+        """List items are yielded one by one, normalized like parse_json does"""
+        output = (
+            '[\n  {\n    "ID": 1,\n    "Full Name": "a"\n  },\n'
+            '  {\n    "ID": 23,\n    "Full Name": "b"\n  }\n]\n'
+        )
+        expected = [{'id': '1', 'full-name': 'a'}, {'id': '23', 'full-name': 'b'}]
+        assert list(hammer.iter_json(output)) == hammer.parse_json(output) == expected
+        chunks = (output[i : i + 2] for i in range(0, len(output), 2))
+        assert list(hammer.iter_json(chunks)) == expected
+
+    def test_iter_json_object(self):
+        """An object output yields a single item"""
+        assert list(hammer.iter_json('{"ID": 1}')) == [{'id': '1'}]
+
+    def test_iter_json_multiple_objects(self):
+        """Only the last object of a multiple objects output is yielded, like
+        parse_json does, wherever the chunks are split
+        """
+        output = '{\n  "Message": "Task started"\n}\n{\n  "ID": 7,\n  "Name": "cv"\n}\n'
+        expected = hammer.parse_json(output)
+        assert expected == {'id': '7', 'name': 'cv'}
+        for size in range(1, len(output) + 1):
+            chunks = (output[i : i + size] for i in range(0, len(output), size))
+            assert list(hammer.iter_json(chunks)) == [expected]
+
 
 class TestParseHelp:
     """Tests for parsing hammer help output"""
@@ -537,6 +582,12 @@ class TestParseInfo:
             'host-collections': {},
         }
 
+    @pytest.mark.parametrize('info_file', INFO_CORPUS, ids=lambda path: path.stem)
+    def test_parse_corpus(self, info_file):
+        """Parsing the corpus info outputs gives the results of the previous parser"""
+        expected = json.loads(info_file.with_suffix('.json').read_text())
+        assert hammer.parse_info(info_file.read_text()) == expected
+
     def test_parse_json_list(self):
         """Can parse a list in json"""
         assert hammer.parse_json('["item1", "item2"]') == ['item1', 'item2']
@@ -0,0 +1,36 @@
+"""Benchmarks for Robottelo's hammer output parsers
+
+Requires pytest-benchmark. The info outputs live in
+``tests/robottelo/data/hammer_info``, each next to its expected parsed result.
+They are synthetic outputs written in the layout of ``hammer ... info``, not
+captured from a Satellite, sized like the large hosts, content views and
+organizations, and the expected results are the ones the previous
+``parse_info`` implementation gave.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from robottelo.cli import hammer
+
+pytest.importorskip('pytest_benchmark')
+
+INFO_CORPUS = sorted(Path(__file__).parent.joinpath('data', 'hammer_info').glob('*.txt'))
+
+
+@pytest.mark.parametrize('info_file', INFO_CORPUS, ids=lambda path: path.stem)
+def test_parse_info_benchmark(benchmark, info_file):
+    output = info_file.read_text()
+    expected = json.loads(info_file.with_suffix('.json').read_text())
+    assert benchmark(hammer.parse_info, output) == expected
+
+
+def test_parse_csv_benchmark(benchmark):
+    rows = [
+        f'{i},package-{i},1.{i}-1.el8,x86_64,package-{i}-1.{i}-1.el8.x86_64.rpm'
+        for i in range(10000)
+    ]
+    output = '\n'.join(['ID,Name,Version,Arch,Filename', *rows])
+    assert len(benchmark(hammer.parse_csv, output)) == 10000
@@ -0,0 +1,109 @@
+"""Tests for module ``robottelo.cli.hammer_shell``."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import hammer_shell
+
+EAGAIN = (-37, b'')
+
+
+class MockChannel:
+    """A mock ssh2 channel replaying the chunks a ``hammer shell`` would print"""
+
+    def __init__(self, stdout, stderr=()):
+        self.stdout = list(stdout)
+        self.stderr = list(stderr)
+        self.written = []
+
+    def execute(self, cmd):
+        self.cmd = cmd
+
+    def read(self):
+        return (len(self.stdout[0]), self.stdout.pop(0)) if self.stdout else EAGAIN
+
+    def read_stderr(self):
+        return (len(self.stderr[0]), self.stderr.pop(0)) if self.stderr else EAGAIN
+
+    def eof(self):
+        return not self.stdout
+
+    def write(self, data):
+        self.written.append(data)
+
+
+def make_shell(stdout, stderr=()):
+    channel = MockChannel(stdout, stderr)
+    client = mock.Mock()
+    client.session.session.open_session.return_value = channel
+    return hammer_shell.HammerShell(client, '-u admin -p changeme', timeout=1), channel
+
+
+class TestHammerShell:
+    def test_run(self):
+        shell, channel = make_shell(
+            [b'Welcome\nhammer> ', b'ID,Name\n1,', b'Default\nham', b'mer> ']
+        )
+        assert channel.cmd == 'LANG=en_US.UTF-8 hammer -u admin -p changeme shell'
+        result = shell.run('--output=csv organization list')
+        assert channel.written == ['--output=csv organization list\n']
+        assert result.stdout == 'ID,Name\n1,Default\n'
+        assert result.stderr == ''
+        assert result.status == 0
+
+    def test_shell_exited(self):
+        shell, _ = make_shell([b'hammer> ', b'partial output'])
+        with pytest.raises(hammer_shell.HammerShellError, match='exited'):
+            shell.run('organization list')
+
+    @mock.patch('robottelo.cli.hammer_shell._get_shell')
+    def test_execute_fallback_on_stderr(self, get_shell):
+        get_shell.return_value.run.return_value = mock.Mock(stderr='Error: not found')
+        assert hammer_shell.execute('example.com', 'admin', 'changeme', 'org info') is None
+
+    @mock.patch('robottelo.cli.hammer_shell._get_shell')
+    def test_execute_timeout(self, get_shell):
+        """The timeout of the command is the one of the call"""
+        get_shell.return_value.run.return_value = mock.Mock(stderr='')
+        hammer_shell.execute('example.com', 'admin', 'changeme', 'org info', timeout=30)
+        get_shell.return_value.run.assert_called_once_with('org info', 30)
+
+    @mock.patch('robottelo.ssh.get_client')
+    @mock.patch('robottelo.cli.hammer_shell.HammerShell')
+    def test_slow_host_does_not_block_others(self, shell_class, get_client):
+        """A shell being opened does not block the shells of the other hosts"""
+        opening = threading.Event()
+        release = threading.Event()
+        released = []
+
+        def open_shell(client, *args, **kwargs):
+            if client == 'slow.example.com':
+                opening.set()
+                released.append(release.wait(timeout=5))
+            return mock.Mock(hostname=client)
+
+        get_client.side_effect = lambda hostname: hostname
+        shell_class.side_effect = open_shell
+        hammer_shell.close_all()
+        slow = threading.Thread(
+            target=hammer_shell._get_shell,
+            args=('slow.example.com', 'admin', 'changeme', 'en_US.UTF-8', 600),
+        )
+        slow.start()
+        assert opening.wait(timeout=5)
+        shell = hammer_shell._get_shell('fast.example.com', 'admin', 'changeme', 'en_US', 600)
+        assert shell.hostname == 'fast.example.com'
+        release.set()
+        slow.join()
+        # the slow shell was still being opened when the fast one was returned
+        assert released == [True]
+        hammer_shell.close_all()
+
+    @mock.patch('robottelo.cli.hammer_shell._get_shell')
+    def test_execute_fallback_on_failure(self, get_shell):
+        get_shell.return_value.run.side_effect = hammer_shell.HammerShellError('exited')
+        with mock.patch('robottelo.cli.hammer_shell._drop_shell') as drop_shell:
+            assert hammer_shell.execute('example.com', 'admin', 'changeme', 'org info') is None
+        drop_shell.assert_called_once_with('example.com', 'admin', 'changeme')
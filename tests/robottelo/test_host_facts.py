@@ -0,0 +1,69 @@
+"""Tests for module ``robottelo.utils.host_facts``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import host_facts
+
+
+class FakeHost:
+    """A host counting the commands run on it"""
+
+    def __init__(self, hostname='host.example.com', boot_id='boot-1'):
+        self.hostname = hostname
+        self.boot_id = boot_id
+        self.commands = []
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+        if cmd == host_facts.BOOT_ID_COMMAND:
+            return mock.Mock(status=0, stdout=f'{self.boot_id}\n')
+        return mock.Mock(status=0, stdout='x86_64\n')
+
+    @host_facts.cached_host_fact
+    def arch(self):
+        return self.execute('uname -m').stdout.strip()
+
+
+@pytest.fixture(autouse=True)
+def settings(tmp_path):
+    with mock.patch('robottelo.config.settings') as settings:
+        settings.robottelo.tmp_dir = str(tmp_path)
+        settings.performance.host_facts.enabled = True
+        yield settings
+
+
+def test_facts_shared_between_hosts():
+    """A fact is probed once per boot, whichever object reads it"""
+    first, second = FakeHost(), FakeHost()
+    assert first.arch == 'x86_64'
+    assert first.arch == 'x86_64'
+    assert second.arch == 'x86_64'
+    assert first.commands == [host_facts.BOOT_ID_COMMAND, 'uname -m']
+    # another object reads the boot ID once, but not the facts
+    assert second.commands == [host_facts.BOOT_ID_COMMAND]
+
+
+def test_reboot_and_invalidate():
+    """Facts probed on another boot, or invalidated, are probed again"""
+    host = FakeHost()
+    assert host.arch == 'x86_64'
+    # the same object reads the boot ID again once told the host may have rebooted
+    host.boot_id = 'boot-2'
+    del host.arch
+    host_facts.forget_boot_id(host)
+    assert host.arch == 'x86_64'
+    assert host.commands == [host_facts.BOOT_ID_COMMAND, 'uname -m'] * 2
+    host_facts.invalidate(host.hostname)
+    other = FakeHost(boot_id='boot-2')
+    assert other.arch == 'x86_64'
+    assert other.commands == [host_facts.BOOT_ID_COMMAND, 'uname -m']
+
+
+def test_disabled(settings):
+    settings.performance.host_facts.enabled = False
+    host = FakeHost()
+    assert host.arch == 'x86_64'
+    assert host.commands == ['uname -m']
+    assert not host_facts.facts_dir().exists()
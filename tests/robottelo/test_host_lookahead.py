@@ -0,0 +1,65 @@
+"""Tests for module ``robottelo.host_lookahead``."""
+
+import itertools
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.host_lookahead import LookaheadProvisioner, SharedBudget
+
+
+@pytest.fixture
+def broker():
+    with mock.patch('robottelo.host_lookahead.Broker') as broker:
+        yield broker
+
+
+def test_hosts_checked_out_ahead(broker):
+    """Up to max_ahead hosts are checked out ahead, no more than expected"""
+    names = itertools.count()
+    checkout = mock.Mock(side_effect=lambda: f'sat{next(names)}')
+    lookahead = LookaheadProvisioner({'satellite': 3}, max_ahead=2)
+    lookahead.register('satellite', checkout)
+    assert [lookahead.take('satellite') for _ in range(4)] == ['sat0', 'sat1', 'sat2', None]
+    assert checkout.call_count == 3
+    assert lookahead.take('capsule') is None
+    lookahead.close()
+    broker.assert_not_called()
+
+
+def test_failed_and_unused_checkouts(broker):
+    """A failed checkout is left to the caller, unused hosts are checked in"""
+    calls = itertools.count()
+    second_checkout = threading.Event()
+
+    def checkout():
+        if next(calls) == 0:
+            raise TimeoutError('no satellite')
+        second_checkout.set()
+        return 'sat'
+
+    lookahead = LookaheadProvisioner({'satellite': 2})
+    lookahead.register('satellite', checkout)
+    assert lookahead.take('satellite') is None
+    assert second_checkout.wait(timeout=5)
+    lookahead.close()
+    broker.assert_called_once_with(hosts=['sat'])
+
+
+def test_shared_budget(broker, tmp_path):
+    """The processes of a test run check out no more hosts than the run needs"""
+    names = itertools.count()
+    checkout = mock.Mock(side_effect=lambda: f'sat{next(names)}')
+    path = tmp_path / 'budget.json'
+    budget = SharedBudget(path, {'satellite': 3})
+    workers = [LookaheadProvisioner({'satellite': 3}, max_ahead=2, budget=budget) for _ in range(4)]
+    for lookahead in workers:
+        lookahead.register('satellite', checkout)
+    assert [workers[0].take('satellite'), workers[3].take('satellite')] == ['sat0', None]
+    assert checkout.call_count == 3
+    for lookahead in workers:
+        lookahead.close()
+    assert broker.call_args_list == [mock.call(hosts=['sat1']), mock.call(hosts=['sat2'])]
+    SharedBudget(path, {}).clear()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,128 @@
+"""Tests for module ``robottelo.host_pool``."""
+
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.host_pool import ContentHostPool, signature
+
+CONF = {'workflow': 'deploy-base-rhel', 'deploy_rhel_version': '9'}
+
+
+class FakeHost:
+    """A host recording the commands run on it"""
+
+    names = itertools.count()
+
+    def __init__(self, **kwargs):
+        self.hostname = f'host{next(self.names)}.example.com'
+        self.commands = []
+        self.repos = 'redhat.repo'
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+        if cmd.startswith('ls '):
+            return mock.Mock(status=0, stdout=self.repos)
+        return mock.Mock(status=0, stdout='')
+
+    setup = teardown = reset_rhsm = clean_cached_properties = mock.Mock()
+
+
+def settle(pool, broker):
+    """Wait for the background checkouts of ``pool``, return the number of checkouts"""
+    pool._executor.shutdown(wait=True)
+    pool._executor = ThreadPoolExecutor()
+    return broker.return_value.checkout.call_count
+
+
+@pytest.fixture
+def broker():
+    with mock.patch('robottelo.host_pool.Broker') as broker:
+        broker.return_value.checkout.side_effect = lambda: FakeHost()
+        yield broker
+
+
+@pytest.fixture
+def pool(broker):
+    pool = ContentHostPool(size=2, max_reuse=2, host_class=FakeHost)
+    yield pool
+    pool.close()
+
+
+def test_hosts_reused_and_checked_in(pool, broker):
+    """A host is handed to max_reuse tests, then checked in"""
+    with pool.host(CONF) as host:
+        # the test adds a repository, removed when the host is released
+        host.repos = 'redhat.repo satellite.repo'
+        settle(pool, broker)
+    assert 'cd /etc/yum.repos.d && rm -f satellite.repo' in host.commands
+    host.repos = 'redhat.repo'
+    with pool.host(CONF) as second:
+        pass
+    with pool.host(CONF) as third:
+        pass
+    assert second is host
+    assert third is not host
+    broker.assert_any_call(hosts=[host])
+    assert mock.call(hosts=[third]) not in broker.call_args_list
+
+
+def test_hosts_checked_out_ahead(pool, broker):
+    """Hosts are checked out ahead of need, per configuration"""
+
+    with pool.host(CONF):
+        pass
+    # one for the test, two ahead
+    assert settle(pool, broker) == 3
+    with pool.host(CONF):
+        pass
+    assert settle(pool, broker) == 3
+    with pool.host({**CONF, 'deploy_rhel_version': '8'}):
+        pass
+    assert settle(pool, broker) == 6
+
+
+def test_kept_host_not_reused(pool, broker):
+    """A host kept by the test is neither reused nor checked in"""
+    with pool.host(CONF) as host:
+        host._skip_context_checkin = True
+    assert mock.call(hosts=[host]) not in broker.call_args_list
+    with pool.host(CONF) as other:
+        assert other is not host
+
+
+
+def test_done_checkout_made_idle(pool, broker):
+    """A checkout done before its callback ran is made idle, not dropped"""
+    key = signature(CONF)
+    future = pool._executor.submit(FakeHost)
+    future.result()
+    pool._pending[key] = [future]
+    pool._replenish(CONF)
+    pool._checked_out(key, future)
+    assert pool._idle[key] == [future.result()]
+
+
+def test_failed_takeover_checks_out(pool, broker):
+    """A failed checkout taken over by acquire is replaced by a new checkout"""
+    calls = itertools.count()
+    started = threading.Event()
+    failing = threading.Event()
+
+    def checkout():
+        if next(calls) == 0:
+            started.set()
+            failing.wait(timeout=5)
+            raise TimeoutError('no host')
+        return FakeHost()
+
+    broker.return_value.checkout.side_effect = checkout
+    pool.size = 1
+    pool._replenish(CONF)
+    assert started.wait(timeout=5)
+    threading.Timer(0.1, failing.set).start()
+    with pool.host(CONF) as host:
+        assert isinstance(host, FakeHost)
@@ -0,0 +1,63 @@
+"""Tests for module ``robottelo.utils.satellite_load``."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.satellite_load import AssignmentLedger, satellite_load
+
+SS_OUTPUT = 'u_str LISTEN 12 1024 /run/foreman.sock 31337 * 0'
+
+
+def load(score):
+    return {'score': score, 'loadavg': score, 'cpus': 1, 'queued': 0, 'running_tasks': 0}
+
+
+@mock.patch('robottelo.utils.satellite_load.requests')
+@mock.patch('robottelo.config.settings')
+def test_satellite_load(settings, requests):
+    """The load average, queued requests and running tasks are scored per CPU"""
+    satellite = mock.Mock(url='https://sat.example.com')
+    satellite.execute.return_value.stdout = f'3.00 2.50 2.00 3/500 1234\n4\n{SS_OUTPUT}\n'
+    requests.get.return_value.json.return_value = {'subtotal': 40}
+    assert satellite_load(satellite) == {
+        'loadavg': 3.0,
+        'cpus': 4,
+        'queued': 12,
+        'running_tasks': 40,
+        'score': pytest.approx(3 / 4 + 1.2 / 4 + 2 / 4),
+    }
+    satellite.execute.side_effect = TimeoutError
+    assert satellite_load(satellite) is None
+
+
+def test_assign(tmp_path):
+    """Workers are spread by load, and by the workers already assigned"""
+    ledger = AssignmentLedger('run', directory=tmp_path)
+    loads = {'sat1.example.com': load(0.5), 'sat2.example.com': load(1.0)}
+    assert ledger.assign('gw0', loads) == 'sat1.example.com'
+    # gw0 counts as one more busy CPU on sat1
+    assert ledger.assign('gw1', loads) == 'sat2.example.com'
+    assert ledger.assign('gw2', {**loads, 'sat2.example.com': None}) == 'sat1.example.com'
+    assert ledger.assign('gw3', dict.fromkeys(loads)) is None
+    assert [line.split()[1] for line in ledger.report()] == [
+        'sat1.example.com',
+        'sat2.example.com',
+        'sat1.example.com',
+    ]
+
+
+def test_clear(tmp_path):
+    """The assignments of the run, and the stale ones of other runs, are removed"""
+    ledger = AssignmentLedger('run', directory=tmp_path)
+    ledger.assign('gw0', {'sat1.example.com': load(0.5)})
+    other = AssignmentLedger('other', directory=tmp_path)
+    other.assign('gw0', {'sat1.example.com': load(0.5)})
+    stale = AssignmentLedger('stale', directory=tmp_path)
+    stale.assign('gw0', {'sat1.example.com': load(0.5)})
+    os.utime(stale.path, (0, 0))
+    ledger.clear()
+    assert sorted(path.name for path in tmp_path.glob('assignments-*.json')) == [
+        'assignments-other.json'
+    ]
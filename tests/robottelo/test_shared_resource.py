@@ -3,7 +3,9 @@ from pathlib import Path
 import random
 from threading import Thread
 import time
+from unittest import mock
 
+from robottelo.utils import shared_resource
 from robottelo.utils.shared_resource import SharedResource
 
 
@@ -67,3 +69,29 @@ def test_shared_resource_multithreading():
     t2.join()
 
     assert not Path("/tmp/test_resource_th.shared").exists()
+
+
+def test_file_watcher(tmp_path):
+    """Test that the waiters are notified soon after the shared resource file is written."""
+    resource_file = tmp_path / "test_resource.shared"
+    resource_file.write_text("{}")
+    with shared_resource._FileWatcher(resource_file, poll_interval=60) as watcher:
+        assert watcher.notified
+        Thread(target=lambda: time.sleep(0.2) or resource_file.write_text("{}")).start()
+        start = time.monotonic()
+        watcher.wait()
+        assert time.monotonic() - start < 5
+
+
+def test_file_watcher_polling(tmp_path):
+    """Test that the shared resource file is polled when inotify is not available."""
+    resource_file = tmp_path / "test_resource.shared"
+    resource_file.write_text("{}")
+    with (
+        mock.patch.object(shared_resource, "_libc", return_value=None),
+        shared_resource._FileWatcher(resource_file, poll_interval=0.1) as watcher,
+    ):
+        assert not watcher.notified
+        start = time.monotonic()
+        watcher.wait()
+        assert 0.1 <= time.monotonic() - start < 5
@@ -2,6 +2,8 @@
 
 from unittest import mock
 
+import pytest
+
 from robottelo import ssh
 
 
@@ -48,6 +50,12 @@ class MockSSHClient:
         self.password = None
         self.ret_code = 0
 
+    @property
+    def session(self):
+        """broker connects on the first access to the session"""
+        self.connect_ += 1
+        return self
+
     def set_missing_host_key_policy(self, policy):
         """A no-op stub method."""
         self.set_missing_host_key_policy_ += 1
@@ -99,6 +107,125 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.server.ssh_client.command_timeout = 300000
         settings.server.ssh_client.connection_timeout = 10000
+        settings.performance.ssh_pool.enabled = False
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+
+    @mock.patch('robottelo.config.settings')
+    def test_pooled_command_credentials(self, settings):
+        """Test that the commands run with other credentials get other pooled sessions"""
+        settings.server.hostname = 'example.com'
+        settings.server.ssh_username = 'nobody'
+        settings.server.is_ipv6 = False
+        settings.performance.ssh_pool.enabled = True
+        with mock.patch.object(ssh, 'get_pool') as get_pool:
+            ssh.command('ls')
+            ssh.command('ls', password='other_password')
+        keys = [call.args[0] for call in get_pool.return_value.execute.call_args_list]
+        assert keys == [
+            ('example.com', 'nobody', None, 22, False),
+            ('example.com', 'nobody', 'other_password', 22, False),
+        ]
+
+
+class MockPooledClient:
+    """A mock ``ContentHost`` counting its handshakes and executions"""
+
+    def __init__(self, fail_with=None):
+        self.handshakes = 0
+        self.executed = []
+        self.closed = False
+        self.fail_with = fail_with
+
+    @property
+    def session(self):
+        self.handshakes += 1
+        return self
+
+    def execute(self, cmd, timeout=None):
+        if self.fail_with:
+            raise self.fail_with
+        self.executed.append(cmd)
+        return cmd
+
+    def close(self):
+        self.closed = True
+
+
+class TestSSHConnectionPool:
+    """Tests for ``robottelo.ssh.SSHConnectionPool``"""
+
+    key = ('example.com', 'root', None, 22, False)
+
+    def test_reuse_session(self):
+        clients = []
+
+        def factory():
+            clients.append(MockPooledClient())
+            return clients[-1]
+
+        pool = ssh.SSHConnectionPool()
+        assert pool.execute(self.key, factory, 'ls') == 'ls'
+        assert pool.execute(self.key, factory, 'pwd') == 'pwd'
+        assert len(clients) == 1
+        assert clients[0].executed == ['ls', 'pwd']
+        assert clients[0].handshakes == 1
+        stats = pool.stats
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['reconnects'] == 0
+
+    def test_sessions_are_keyed(self):
+        clients = []
+
+        def factory():
+            clients.append(MockPooledClient())
+            return clients[-1]
+
+        pool = ssh.SSHConnectionPool()
+        pool.execute(self.key, factory, 'ls')
+        pool.execute(('other.example.com', 'root', None, 22, False), factory, 'ls')
+        assert len(clients) == 2
+        assert pool.stats['misses'] == 2
+
+    def test_reconnect_stale_session(self):
+        stale = MockPooledClient()
+        fresh = MockPooledClient()
+        clients = iter([stale, fresh])
+        pool = ssh.SSHConnectionPool()
+        pool.execute(self.key, lambda: next(clients), 'ls')
+        stale.fail_with = EOFError()
+        assert pool.execute(self.key, lambda: next(clients), 'pwd') == 'pwd'
+        assert stale.closed
+        assert fresh.executed == ['pwd']
+        assert pool.stats['reconnects'] == 1
+
+    def test_fresh_session_error_is_raised(self):
+        client = MockPooledClient(fail_with=EOFError())
+        pool = ssh.SSHConnectionPool()
+        with pytest.raises(EOFError):
+            pool.execute(self.key, lambda: client, 'ls')
+        assert client.closed
+        assert pool.stats['reconnects'] == 0
+
+    def test_idle_timeout(self):
+        clients = []
+
+        def factory():
+            clients.append(MockPooledClient())
+            return clients[-1]
+
+        pool = ssh.SSHConnectionPool(idle_timeout=-1)
+        pool.execute(self.key, factory, 'ls')
+        pool.execute(self.key, factory, 'ls')
+        assert len(clients) == 2
+        assert clients[0].closed
+        assert pool.stats['hits'] == 0
+
+    def test_clear(self):
+        client = MockPooledClient()
+        pool = ssh.SSHConnectionPool()
+        pool.execute(self.key, lambda: client, 'ls')
+        pool.clear()
+        assert client.closed
@@ -0,0 +1,80 @@
+"""Tests for module ``robottelo.host_helpers.task_waiter``."""
+
+from unittest import mock
+
+from nailgun.entity_mixins import TaskFailedError, TaskTimedOutError
+import pytest
+
+from robottelo.host_helpers import task_waiter
+from robottelo.host_helpers.task_waiter import TaskWaiter
+
+
+class FakeSatellite:
+    """A satellite whose tasks move through the given states, one per search"""
+
+    def __init__(self, **states):
+        self.states = states
+        self.queries = []
+        self.api = mock.Mock()
+        self.api.ForemanTask.return_value.search.side_effect = self.search
+
+    def search(self, query):
+        self.queries.append(query)
+        tasks = []
+        for task_id, states in self.states.items():
+            if task_id in query['search']:
+                state, result = states.pop(0) if len(states) > 1 else states[0]
+                tasks.append(mock.Mock(id=task_id, state=state, result=result))
+        return tasks
+
+
+@pytest.fixture(autouse=True)
+def sleep():
+    with mock.patch.object(task_waiter.time, 'sleep') as sleep:
+        yield sleep
+
+
+def test_wait_single_search_per_poll(sleep):
+    """All pending tasks are refreshed by one search, finished ones are left out"""
+    running, success = ('running', 'pending'), ('stopped', 'success')
+    satellite = FakeSatellite(a=[running, success], b=[running, running, success])
+    outcomes = TaskWaiter(satellite, ['a', 'b']).wait()
+    assert [query['search'] for query in satellite.queries] == [
+        'id ^ (a, b)',
+        'id ^ (a, b)',
+        'id ^ (b)',
+    ]
+    assert all(outcome.succeeded for outcome in outcomes.values())
+    assert [outcome.polls for outcome in outcomes.values()] == [2, 3]
+    # the delay is reset when a task finishes
+    assert [call.args[0] for call in sleep.call_args_list] == [1, 1]
+
+
+def test_wait_backoff(sleep):
+    """The delay grows while no task finishes, up to the maximum"""
+    satellite = FakeSatellite(a=[('running', 'pending')] * 5 + [('stopped', 'success')])
+    TaskWaiter(satellite, ['a'], poll_rate=2, max_poll_rate=5).wait()
+    assert [call.args[0] for call in sleep.call_args_list] == [2, 3, 4.5, 5, 5]
+
+
+def test_finished_entities_not_searched():
+    """Tasks added as finished entities need no search at all"""
+    satellite = FakeSatellite()
+    task = mock.Mock(id='a', state='stopped', result='success')
+    waiter = TaskWaiter(satellite, [task])
+    assert waiter.wait()['a'].task is task
+    assert satellite.queries == []
+
+
+def test_wait_failure_and_timeout():
+    satellite = FakeSatellite(a=[('stopped', 'warning')], b=[('stopped', 'success')])
+    with pytest.raises(TaskFailedError):
+        TaskWaiter(satellite, ['a', 'b']).wait()
+    outcomes = TaskWaiter(satellite, ['a', 'b']).wait(must_succeed=False)
+    assert [outcome.succeeded for outcome in outcomes.values()] == [False, True]
+    satellite = FakeSatellite(a=[('running', 'pending')])
+    with (
+        mock.patch.object(task_waiter.time, 'monotonic', side_effect=range(0, 1000, 10)),
+        pytest.raises(TaskTimedOutError),
+    ):
+        TaskWaiter(satellite, ['a'], timeout=30).wait()
@@ -0,0 +1,71 @@
+"""Tests for module ``robottelo.cli.telemetry``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo import ssh
+from robottelo.cli import telemetry
+
+
+@pytest.fixture
+def sink():
+    sink = mock.Mock()
+    telemetry.set_sink(sink)
+    yield sink
+    telemetry.set_sink(None)
+
+
+class TestHammerCall:
+    """Tests for recording a hammer call"""
+
+    def test_no_sink(self):
+        """Without a sink nothing is recorded"""
+        with telemetry.hammer_call('host', 'list', 'sat.example.com') as record:
+            with telemetry.phase('runtime'):
+                assert telemetry.current() is None
+        assert record is None
+
+    def test_phases(self, sink):
+        """The phases and the parsed result are stored in the emitted record"""
+        result = mock.Mock(status=0, stdout='ID,Name\n1,é\n')
+        with telemetry.hammer_call('host', 'list', 'sat.example.com') as record:
+            with telemetry.phase('runtime'):
+                pass
+            ssh.parse_output(result, 'csv')
+        assert telemetry.current() is None
+        sink.emit.assert_called_once_with(record)
+        assert record.runtime > 0
+        assert record.parse_time > 0
+        assert record.stdout_bytes == 13
+        assert record.status == 0
+        assert result.stdout == [{'id': '1', 'name': 'é'}]
+
+    def test_error(self, sink):
+        """Calls raising an error are recorded with the error name"""
+        with pytest.raises(OSError):
+            with telemetry.hammer_call('host', 'list', 'sat.example.com'):
+                raise OSError('connection reset')
+        (record,), _ = sink.emit.call_args
+        assert record.error == 'OSError'
+        assert record.status is None
+
+
+def test_jsonl_summary(tmp_path):
+    """Records of all the workers are loaded back and summarized"""
+    for worker, runtimes in (('gw0', (3.0, 1.0)), ('gw1', (2.0,))):
+        sink = telemetry.JSONLSink(tmp_path / f'{worker}.jsonl')
+        for runtime in runtimes:
+            sink.emit(
+                telemetry.HammerCallRecord(
+                    'host', 'info' if runtime > 2 else 'list', 'sat', runtime=runtime, status=0
+                )
+            )
+        sink.close()
+    records = telemetry.load(tmp_path)
+    assert len(records) == 3
+    lines = telemetry.summarize(records, top=1)
+    assert lines[0].startswith('3 hammer calls, 6.0s in total')
+    assert 'host info' in lines[2]
+    assert lines[4].split()[0] == '2'
+    assert lines[4].endswith('host list')